@@ -0,0 +1,34 @@
+from .agenda import (
+    DIAS_SEMANA, CalendarioHorarios, IndiceDisponibilidade, VisaoDesatualizada, horario_para_minutos, minutos_para_horario,
+)
+from .agendamentos import RepositorioAgendamentos
+from .barbearia import Barbearia
+from .cadastro import Cadastrar, Login
+from .cpf import cpf_valido, formatar_cpf, normalizar_cpf, validar_cpf
+from .espera import ListaEspera
+from .faturamento import CalcularSalarioBarbeiro, RegistroFaturamento
+from .modelos import Agendamento, Autenticavel, Barbeiro, Cliente, Pessoa, Visitante
+from .permissoes import LIVRE, AcessoAutorizado, Permissao, PermissaoNegada, autorizado, exigir, requer
+from .rede import RedeBarbearias
+from .servicos import CatalogoServicos, Servico, catalogo_padrao
+
+# Peças da CLI e da persistência são importadas só quando usadas.
+_PREGUICOSOS = {
+    "main": ".cli",
+    "Menu": ".menu",
+    "ArmazenamentoSQLite": ".armazenamento",
+    "RegistroEventos": ".eventos",
+    "HistoricoAgendamentos": ".relatorios",
+    "PrevisaoOcupacao": ".previsao",
+    "ModeloDisponibilidade": ".recorrencia",
+    "AgendaDatada": ".recorrencia",
+    "Sessoes": ".sessoes",
+    "Solicitacao": ".otimizador",
+    "otimizar": ".otimizador",
+}
+
+def __getattr__(nome):
+    if nome in _PREGUICOSOS:
+        import importlib
+        return getattr(importlib.import_module(_PREGUICOSOS[nome], __name__), nome)
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
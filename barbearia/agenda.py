@@ -0,0 +1,520 @@
+import heapq
+import threading
+from collections import deque
+from collections.abc import Mapping, Sequence
+from itertools import islice
+
+DIAS_SEMANA = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado"]
+MINUTOS_DIA = 24 * 60
+
+class VisaoDesatualizada(ValueError):
+    def __init__(self, mensagem="Dados alterados desde a consulta."):
+        super().__init__(mensagem)
+
+def horario_para_minutos(horario):
+    # "9h" -> 540, "9h30" -> 570
+    hora, separador, minuto = horario.partition("h")
+    if not separador:
+        raise ValueError("Horário inválido.")
+    return int(hora) * 60 + int(minuto or 0)
+
+def minutos_para_horario(minutos):
+    hora, minuto = divmod(minutos, 60)
+    return f"{hora}h{minuto:02d}" if minuto else f"{hora}h"
+
+def sequencias_ligadas(mascara):
+    # Cada trecho contínuo de bits ligados como (primeiro, ultimo + 1).
+    while mascara:
+        inicio = (mascara & -mascara).bit_length() - 1
+        deslocada = mascara >> inicio
+        tamanho = ((deslocada ^ (deslocada + 1)) >> 1).bit_length()
+        yield inicio, inicio + tamanho
+        mascara &= ~(((1 << tamanho) - 1) << inicio)
+
+def inicios_de_bloco(mascara, slots):
+    # Bits i em que começam 'slots' bits ligados seguidos (i .. i + slots - 1):
+    # cada passo dobra o comprimento verificado, então são O(log slots) operações.
+    alcance = 1
+    while alcance < slots:
+        passo = min(alcance, slots - alcance)
+        mascara &= mascara >> passo
+        alcance += passo
+    return mascara
+
+def bits_ligados(mascara):
+    while mascara:
+        bit = mascara & -mascara
+        yield bit.bit_length() - 1
+        mascara ^= bit
+
+class CalendarioHorarios:
+    # Cada dia é um bitset (int) em que o bit i indica o slot i livre.
+    def __init__(self, dias=DIAS_SEMANA, duracao_slot=60):
+        if duracao_slot <= 0 or MINUTOS_DIA % duracao_slot:
+            raise ValueError("Duração de slot inválida.")
+        self._duracao_slot = duracao_slot
+        self._livres = {dia: 0 for dia in dias}
+        # Uma trava por dia: leitura e escrita da máscara acontecem juntas.
+        self._travas = {dia: threading.Lock() for dia in dias}
+        # Tabela de encaixes: dia -> {slots: bitset dos inícios com 'slots' livres seguidos}.
+        self._encaixes = {dia: {} for dia in dias}
+        # Versão de cada dia, avançada a cada alteração: as visões comparam com a delas.
+        self._versoes = {dia: 0 for dia in dias}
+        self._observadores = []
+        # Alterações ainda não entregues aos observadores, por dia, na ordem em
+        # que aconteceram, e a trava de quem as entrega.
+        self._pendentes = {dia: deque() for dia in dias}
+        self._entregas = {dia: threading.Lock() for dia in dias}
+
+    def observar(self, observador):
+        # observador(dia, mascara_antiga, mascara_nova) é chamado a cada alteração,
+        # já sem a trava do dia (pode gravar em disco sem segurar a agenda), mas
+        # sempre na ordem das alterações.
+        self._observadores.append(observador)
+
+    def _entregar(self, dia, pendentes):
+        # Quem pega a trava de entrega esvazia a fila do dia, inclusive o que
+        # outras threads enfileiraram; ao sair, a própria alteração já foi entregue.
+        with self._entregas[dia]:
+            while pendentes:
+                antiga, nova = pendentes.popleft()
+                for observador in self._observadores:
+                    observador(dia, antiga, nova)
+
+    def _alterar(self, dia, calcular):
+        try:
+            trava = self._travas[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+        pendentes = self._pendentes[dia]
+        with trava:
+            antiga = self._livres[dia]
+            nova = calcular(antiga)
+            if nova != antiga:
+                self._livres[dia] = nova
+                self._versoes[dia] += 1
+                # Só as durações já consultadas, e só no dia alterado.
+                encaixes = self._encaixes[dia]
+                for slots in encaixes:
+                    encaixes[slots] = inicios_de_bloco(nova, slots)
+                if self._observadores:
+                    pendentes.append((antiga, nova))
+        if pendentes:
+            self._entregar(dia, pendentes)
+        return antiga
+
+    @property
+    def duracao_slot(self):
+        return self._duracao_slot
+
+    @property
+    def passo(self):
+        # Minutos por bit da máscara.
+        return self._duracao_slot
+
+    @property
+    def dias(self):
+        return list(self._livres)
+
+    def versao(self, dia):
+        try:
+            return self._versoes[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+
+    def instantaneo(self, dia):
+        # (máscara, versão) lidas juntas: o int é imutável, então guardá-lo já é um retrato do dia.
+        try:
+            trava = self._travas[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+        with trava:
+            return self._livres[dia], self._versoes[dia]
+
+    def _mascara(self, dia):
+        try:
+            return self._livres[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+
+    def _indice(self, horario, fim=False):
+        minutos = horario_para_minutos(horario)
+        indice, resto = divmod(minutos, self._duracao_slot)
+        limite = MINUTOS_DIA if fim else MINUTOS_DIA - 1
+        if resto or not 0 <= minutos <= limite:
+            raise ValueError("Horário inválido.")
+        return indice
+
+    def _horario(self, indice):
+        return minutos_para_horario(indice * self._duracao_slot)
+
+    def _bloco(self, horario, slots):
+        indice = self._indice(horario)
+        if slots < 1 or indice + slots > MINUTOS_DIA // self._duracao_slot:
+            raise ValueError("Horário inválido.")
+        return ((1 << slots) - 1) << indice
+
+    def bloco(self, horario, slots=1):
+        # Máscara dos 'slots' seguidos a partir do horário.
+        return self._bloco(horario, slots)
+
+    def esta_livre(self, dia, horario):
+        mascara = self._mascara(dia)
+        try:
+            indice = self._indice(horario)
+        except ValueError:
+            return False
+        return bool(mascara >> indice & 1)
+
+    def liberar(self, dia, horario, slots=1):
+        bits = self._bloco(horario, slots)
+        self._alterar(dia, lambda mascara: mascara | bits)
+
+    def liberar_intervalo(self, dia, inicio, fim):
+        primeiro = self._indice(inicio)
+        ultimo = self._indice(fim, fim=True)
+        if ultimo <= primeiro:
+            raise ValueError("Intervalo inválido.")
+        bits = ((1 << (ultimo - primeiro)) - 1) << primeiro
+        self._alterar(dia, lambda mascara: mascara | bits)
+
+    def reservar_se_livre(self, dia, horario, slots=1):
+        # Testa e ocupa os 'slots' seguidos numa única operação atômica: ou todos, ou nenhum.
+        try:
+            bits = self._bloco(horario, slots)
+        except ValueError:
+            self._mascara(dia)
+            return False
+        antiga = self._alterar(dia, lambda mascara: mascara & ~bits if mascara & bits == bits else mascara)
+        return antiga & bits == bits
+
+    def redimensionar(self, dia, horario, ocupados, slots):
+        # Um bloco reservado de 'ocupados' slots passa a ter 'slots', se o que falta estiver livre.
+        antigos = self._bloco(horario, ocupados)
+        novos = self._bloco(horario, slots)
+
+        def calcular(mascara):
+            livres = mascara | antigos
+            return livres & ~novos if livres & novos == novos else mascara
+
+        return (self._alterar(dia, calcular) | antigos) & novos == novos
+
+    def reservar(self, dia, horario):
+        if not self.reservar_se_livre(dia, horario):
+            raise ValueError("Horário não encontrado para o dia especificado.")
+
+    def proximo_livre(self, dia, a_partir_de=None):
+        mascara = self._mascara(dia)
+        inicio = 0
+        if a_partir_de is not None:
+            minutos = horario_para_minutos(a_partir_de)
+            inicio = -(-minutos // self._duracao_slot)
+        restante = mascara >> inicio
+        if not restante:
+            return None
+        return self._horario(inicio + (restante & -restante).bit_length() - 1)
+
+    def mascara(self, dia):
+        return self._mascara(dia)
+
+    def encaixes(self, dia, slots):
+        # Bitset dos slots onde começam 'slots' livres seguidos. Cada duração é
+        # calculada na primeira consulta e depois refeita em _alterar, só para o dia alterado.
+        if slots <= 1:
+            return self._mascara(dia)
+        try:
+            tabela = self._encaixes[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+        inicios = tabela.get(slots)
+        if inicios is None:
+            with self._travas[dia]:
+                inicios = tabela.get(slots)
+                if inicios is None:
+                    inicios = tabela[slots] = inicios_de_bloco(self._livres[dia], slots)
+        return inicios
+
+    def cabe(self, dia, horario, slots=1):
+        inicios = self.encaixes(dia, slots)
+        try:
+            indice = self._indice(horario)
+        except ValueError:
+            return False
+        return bool(inicios >> indice & 1)
+
+    def inicios(self, dia, slots):
+        for indice in bits_ligados(self.encaixes(dia, slots)):
+            yield self._horario(indice)
+
+    def definir_mascara(self, dia, mascara):
+        self._alterar(dia, lambda antiga: mascara)
+
+    def quantidade_livres(self, dia):
+        return self._mascara(dia).bit_count()
+
+    def horarios(self, dia):
+        for indice in bits_ligados(self._mascara(dia)):
+            yield self._horario(indice)
+
+    def intervalos(self, dia):
+        for inicio, fim in sequencias_ligadas(self._mascara(dia)):
+            yield self._horario(inicio), self._horario(fim)
+
+class IndiceDisponibilidade:
+    # União dos horários livres de vários barbeiros. Cada dia é um bitset por
+    # minuto de início, e (dia, minuto) aponta para os CPFs livres naquele instante.
+
+    # Minutos por bit da máscara.
+    passo = 1
+
+    def __init__(self, dias=DIAS_SEMANA):
+        self._livres = {dia: 0 for dia in dias}
+        self._travas = {dia: threading.Lock() for dia in dias}
+        self._versoes = {dia: 0 for dia in dias}
+        self._barbeiros = {}
+
+    @property
+    def dias(self):
+        return list(self._livres)
+
+    def versao(self, dia):
+        try:
+            return self._versoes[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+
+    def instantaneo(self, dia):
+        try:
+            trava = self._travas[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+        with trava:
+            return self._livres[dia], self._versoes[dia]
+
+    def _mascara(self, dia):
+        try:
+            return self._livres[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+
+    def acompanhar(self, barbeiro):
+        calendario = barbeiro.calendario
+        cpf = barbeiro.cpf
+        duracao = calendario.duracao_slot
+
+        travas = self._travas
+
+        def aplicar(dia, antiga, nova):
+            with travas[dia]:
+                self._aplicar_travado(cpf, duracao, dia, antiga, nova)
+
+        for dia in calendario.dias:
+            aplicar(dia, 0, calendario.mascara(dia))
+        calendario.observar(aplicar)
+
+    def _aplicar_travado(self, cpf, duracao, dia, antiga, nova):
+        mascara = self._mascara(dia)
+        for indice in bits_ligados(nova & ~antiga):
+            minuto = indice * duracao
+            self._barbeiros.setdefault((dia, minuto), set()).add(cpf)
+            mascara |= 1 << minuto
+        for indice in bits_ligados(antiga & ~nova):
+            minuto = indice * duracao
+            livres = self._barbeiros.get((dia, minuto))
+            if livres is not None:
+                livres.discard(cpf)
+                if not livres:
+                    del self._barbeiros[(dia, minuto)]
+                    mascara &= ~(1 << minuto)
+        self._livres[dia] = mascara
+        self._versoes[dia] += 1
+
+    def barbeiros_livres(self, dia, horario):
+        self._mascara(dia)
+        try:
+            minuto = horario_para_minutos(horario)
+        except ValueError:
+            return frozenset()
+        with self._travas[dia]:
+            return frozenset(self._barbeiros.get((dia, minuto), ()))
+
+    def livres_em(self, dia, horario):
+        # O próprio conjunto de CPFs livres no instante, sem cópia nem trava: só para
+        # testes de pertinência na hora; quem guarda o resultado usa barbeiros_livres.
+        self._mascara(dia)
+        try:
+            minuto = horario_para_minutos(horario)
+        except ValueError:
+            return frozenset()
+        return self._barbeiros.get((dia, minuto), frozenset())
+
+    def esta_livre(self, dia, horario):
+        return bool(self.barbeiros_livres(dia, horario))
+
+    def quantidade_livres(self, dia):
+        return self._mascara(dia).bit_count()
+
+    def horarios(self, dia):
+        for minuto in bits_ligados(self._mascara(dia)):
+            yield minutos_para_horario(minuto)
+
+    def primeiro_livre(self, dia, a_partir_de=None, aceita=None):
+        # Primeiro horário do dia com algum barbeiro livre; aceita(cpf, dia, minuto) filtra os CPFs.
+        mascara = self._mascara(dia)
+        if a_partir_de is not None:
+            inicio = horario_para_minutos(a_partir_de)
+            mascara = mascara >> inicio << inicio
+        for minuto in bits_ligados(mascara):
+            with self._travas[dia]:
+                livres = frozenset(self._barbeiros.get((dia, minuto), ()))
+            if aceita is not None:
+                livres = {cpf for cpf in livres if aceita(cpf, dia, minuto)}
+            if livres:
+                return minutos_para_horario(minuto), frozenset(livres)
+        return None
+
+    def _livres_aceitos(self, dia, minuto, aceita):
+        with self._travas[dia]:
+            livres = frozenset(self._barbeiros.get((dia, minuto), ()))
+        if aceita is not None:
+            livres = frozenset(cpf for cpf in livres if aceita(cpf, dia, minuto))
+        return livres
+
+    def mais_proximos(self, dia, horario, quantidade, aceita=None):
+        # Os 'quantidade' horários livres mais próximos de (dia, horario) na semana
+        # toda, como (dia, horario, cpfs), do mais próximo ao mais distante.
+        dias = self.dias
+        if dia not in self._livres:
+            raise ValueError("Dia inválido.")
+        if quantidade < 1:
+            raise ValueError("Quantidade inválida.")
+        posicao = dias.index(dia)
+        alvo = horario_para_minutos(horario)
+        por_dia = [
+            _por_distancia(self._livres[outro], alvo - (indice - posicao) * MINUTOS_DIA, indice)
+            for indice, outro in enumerate(dias)
+        ]
+        encontrados = []
+        for _, indice, minuto in heapq.merge(*por_dia):
+            if len(encontrados) == quantidade:
+                break
+            livres = self._livres_aceitos(dias[indice], minuto, aceita)
+            if livres:
+                encontrados.append((dias[indice], minutos_para_horario(minuto), livres))
+        return encontrados
+
+def _por_distancia(mascara, alvo, indice):
+    # Bits ligados da máscara em ordem de distância até 'alvo' (que pode cair
+    # fora do dia), como (distância, indice, bit): os de cima pelo bit mais baixo,
+    # os de baixo pelo mais alto.
+    corte = min(max(alvo, 0), mascara.bit_length())
+    acima = mascara >> corte << corte
+    abaixo = mascara & ((1 << corte) - 1)
+    while acima or abaixo:
+        bit_acima = (acima & -acima).bit_length() - 1
+        bit_abaixo = abaixo.bit_length() - 1
+        if not acima or (abaixo and alvo - bit_abaixo <= bit_acima - alvo):
+            yield alvo - bit_abaixo, indice, bit_abaixo
+            abaixo ^= 1 << bit_abaixo
+        else:
+            yield bit_acima - alvo, indice, bit_acima
+            acima ^= 1 << bit_acima
+
+class HorariosDia(Sequence):
+    # Retrato somente leitura dos horários livres de um dia, em ordem crescente.
+    # Guarda só a máscara (um int) e a versão do dia no momento da consulta: nada
+    # é copiado, e 'atual' diz se a fonte mudou desde então.
+    def __init__(self, fonte, dia, instantaneo=None):
+        self._fonte = fonte
+        self._dia = dia
+        self._mascara, self._versao = fonte.instantaneo(dia) if instantaneo is None else instantaneo
+
+    @property
+    def dia(self):
+        return self._dia
+
+    @property
+    def versao(self):
+        return self._versao
+
+    @property
+    def atual(self):
+        return self._fonte.versao(self._dia) == self._versao
+
+    def conferir(self):
+        if not self.atual:
+            raise VisaoDesatualizada()
+
+    def atualizada(self):
+        return HorariosDia(self._fonte, self._dia)
+
+    def __contains__(self, horario):
+        if not isinstance(horario, str):
+            return False
+        try:
+            minutos = horario_para_minutos(horario)
+        except ValueError:
+            return False
+        indice, resto = divmod(minutos, self._fonte.passo)
+        return not resto and 0 <= minutos < MINUTOS_DIA and bool(self._mascara >> indice & 1)
+
+    def __len__(self):
+        return self._mascara.bit_count()
+
+    def __eq__(self, outro):
+        # Igual a qualquer sequência (lista, tupla, outra visão) com os mesmos horários na mesma ordem.
+        if isinstance(outro, HorariosDia) and outro._fonte.passo == self._fonte.passo:
+            return outro._mascara == self._mascara
+        if isinstance(outro, Sequence) and not isinstance(outro, str):
+            return len(outro) == len(self) and all(a == b for a, b in zip(self, outro))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __iter__(self):
+        passo = self._fonte.passo
+        for indice in bits_ligados(self._mascara):
+            yield minutos_para_horario(indice * passo)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fim, salto = indice.indices(len(self))
+            if salto > 0:
+                return list(islice(self, inicio, fim, salto))
+            return list(self)[indice]
+        if indice < 0:
+            indice += len(self)
+        if indice >= 0:
+            for horario in islice(self, indice, None):
+                return horario
+        raise IndexError("Índice fora do intervalo.")
+
+    def pagina(self, inicio, quantidade):
+        return list(islice(self, inicio, inicio + quantidade))
+
+    def paginas(self, tamanho):
+        # Listas de até 'tamanho' horários, geradas uma de cada vez.
+        iterador = iter(self)
+        while True:
+            pagina = list(islice(iterador, tamanho))
+            if not pagina:
+                return
+            yield pagina
+
+    def __repr__(self):
+        return repr(list(self))
+
+class HorariosLivres(Mapping):
+    def __init__(self, calendario):
+        self._calendario = calendario
+
+    def __getitem__(self, dia):
+        if dia not in self._calendario.dias:
+            raise KeyError(dia)
+        return HorariosDia(self._calendario, dia)
+
+    def __iter__(self):
+        return iter(self._calendario.dias)
+
+    def __len__(self):
+        return len(self._calendario.dias)
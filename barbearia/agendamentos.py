@@ -0,0 +1,291 @@
+from bisect import bisect_left, insort
+from collections.abc import Sequence
+from itertools import islice
+
+from .agenda import VisaoDesatualizada
+from .cpf import texto_cpf
+
+class CargaBarbeiros:
+    # Barbeiros agrupados pela quantidade de agendamentos, cada grupo em ordem de CPF.
+    # Percorrer em ordem de (carga, cpf) deixa quem procura o menos ocupado que
+    # atende a uma condição parar no primeiro, sem olhar os demais.
+    def __init__(self):
+        self._cargas = {}
+        self._grupos = {}
+        # Cargas com algum barbeiro, em ordem crescente.
+        self._ordem = []
+
+    def incluir(self, cpf):
+        if cpf not in self._cargas:
+            self._cargas[cpf] = 0
+            self._entrar(cpf, 0)
+
+    def alterar(self, cpf, diferenca):
+        carga = self._cargas.get(cpf)
+        if carga is None:
+            carga = 0
+        else:
+            self._sair(cpf, carga)
+        carga += diferenca
+        self._cargas[cpf] = carga
+        self._entrar(cpf, carga)
+
+    def _entrar(self, cpf, carga):
+        grupo = self._grupos.get(carga)
+        if grupo is None:
+            self._grupos[carga] = [cpf]
+            insort(self._ordem, carga)
+        else:
+            insort(grupo, cpf)
+
+    def _sair(self, cpf, carga):
+        grupo = self._grupos[carga]
+        del grupo[bisect_left(grupo, cpf)]
+        if not grupo:
+            del self._grupos[carga]
+            del self._ordem[bisect_left(self._ordem, carga)]
+
+    def __iter__(self):
+        # Sem cópia: uma alteração no meio do caminho pode pular ou repetir um CPF,
+        # então quem não encontra ninguém confere do jeito completo.
+        for carga in self._ordem:
+            yield from self._grupos.get(carga, ())
+
+class RepositorioAgendamentos:
+    # Agendamentos por id (em ordem de inserção) com índices por CPF, dia, (dia, horário), corte e barbeiro.
+    CAMPOS_EDITAVEIS = ("nome", "corte_desejado", "valor", "dia", "horario_desejado", "cpf_barbeiro")
+    # Editar só estes não muda nenhuma chave de índice.
+    CAMPOS_FORA_DOS_INDICES = frozenset(("nome", "valor"))
+
+    def __init__(self):
+        self._proximo_id = 1
+        self._agendamentos = {}
+        self._por_cpf = {}
+        self._por_dia = {}
+        self._por_horario = {}
+        self._por_corte = {}
+        self._por_barbeiro = {}
+        self._carga = CargaBarbeiros()
+        # Avança a cada inclusão, edição ou remoção; as visões comparam com a delas.
+        self._versao = 0
+        self._observadores = []
+        self._observadores_remocao = []
+        self._observadores_edicao = []
+
+    def __len__(self):
+        return len(self._agendamentos)
+
+    def __iter__(self):
+        return iter(self._agendamentos.values())
+
+    def __contains__(self, id_agendamento):
+        return id_agendamento in self._agendamentos
+
+    def _indices(self, cliente):
+        dia = cliente.dia
+        return (
+            (self._por_cpf, texto_cpf(cliente.cpf)),
+            (self._por_dia, dia),
+            (self._por_horario, (dia, cliente.horario_desejado)),
+            (self._por_corte, cliente.corte_desejado),
+            (self._por_barbeiro, cliente.cpf_barbeiro),
+        )
+
+    def _indexar(self, id_agendamento, cliente):
+        for indice, chave in self._indices(cliente):
+            indice.setdefault(chave, {})[id_agendamento] = None
+        if cliente.cpf_barbeiro is not None:
+            self._carga.alterar(cliente.cpf_barbeiro, 1)
+
+    def _desindexar(self, id_agendamento, cliente):
+        for indice, chave in self._indices(cliente):
+            ids = indice[chave]
+            del ids[id_agendamento]
+            if not ids:
+                del indice[chave]
+        if cliente.cpf_barbeiro is not None:
+            self._carga.alterar(cliente.cpf_barbeiro, -1)
+
+    @property
+    def versao(self):
+        return self._versao
+
+    def observar(self, observador):
+        # observador(agendamento) é chamado a cada inclusão, depois de indexada.
+        self._observadores.append(observador)
+
+    def observar_remocao(self, observador):
+        # observador(agendamento) é chamado a cada remoção, já fora dos índices.
+        self._observadores_remocao.append(observador)
+
+    def observar_edicao(self, observador):
+        # observador(agendamento, antes) é chamado a cada edição, depois de reindexada;
+        # antes traz o valor anterior de cada campo editado.
+        self._observadores_edicao.append(observador)
+
+    def visao(self, dia=None, trava=None):
+        return VisaoAgendamentos(self, dia, trava)
+
+    @property
+    def proximo_id(self):
+        return self._proximo_id
+
+    def avancar_id(self, proximo_id):
+        # Garante que ids já usados (mesmo de agendamentos removidos) não voltem a ser dados.
+        self._proximo_id = max(self._proximo_id, proximo_id)
+
+    def adicionar(self, cliente, id_agendamento=None):
+        if id_agendamento is None:
+            id_agendamento = self._proximo_id
+        self._proximo_id = max(self._proximo_id, id_agendamento + 1)
+        cliente.id_agendamento = id_agendamento
+        self._versao += 1
+        self._agendamentos[id_agendamento] = cliente
+        self._indexar(id_agendamento, cliente)
+        for observador in self._observadores:
+            observador(cliente)
+        return id_agendamento
+
+    def obter(self, id_agendamento):
+        try:
+            return self._agendamentos[id_agendamento]
+        except KeyError:
+            raise ValueError("Agendamento não encontrado.") from None
+
+    def atualizar(self, id_agendamento, **kwargs):
+        cliente = self.obter(id_agendamento)
+        antes = None
+        if self._observadores_edicao:
+            antes = {campo: getattr(cliente, campo) for campo in self.CAMPOS_EDITAVEIS if campo in kwargs}
+        self._versao += 1
+        reindexar = not self.CAMPOS_FORA_DOS_INDICES.issuperset(kwargs)
+        if reindexar:
+            self._desindexar(id_agendamento, cliente)
+        for campo in self.CAMPOS_EDITAVEIS:
+            if campo in kwargs:
+                setattr(cliente, campo, kwargs[campo])
+        if reindexar:
+            self._indexar(id_agendamento, cliente)
+        if antes is not None:
+            for observador in self._observadores_edicao:
+                observador(cliente, antes)
+        return cliente
+
+    def remover(self, id_agendamento):
+        cliente = self.obter(id_agendamento)
+        self._versao += 1
+        self._desindexar(id_agendamento, cliente)
+        del self._agendamentos[id_agendamento]
+        for observador in self._observadores_remocao:
+            observador(cliente)
+        return cliente
+
+    def primeiro_por_cpf(self, cpf):
+        ids = self._por_cpf.get(texto_cpf(cpf))
+        if not ids:
+            return None
+        return self._agendamentos[next(iter(ids))]
+
+    def buscar_por_cpf(self, cpf):
+        return [self._agendamentos[id_agendamento] for id_agendamento in self._por_cpf.get(texto_cpf(cpf), ())]
+
+    def buscar_por_dia(self, dia):
+        return [self._agendamentos[id_agendamento] for id_agendamento in self._por_dia.get(dia, ())]
+
+    def buscar_por_horario(self, dia, horario):
+        return [self._agendamentos[id_agendamento] for id_agendamento in self._por_horario.get((dia, horario), ())]
+
+    def buscar_por_corte(self, corte):
+        return [self._agendamentos[id_agendamento] for id_agendamento in self._por_corte.get(corte, ())]
+
+    def buscar_por_barbeiro(self, cpf_barbeiro):
+        return [self._agendamentos[id_agendamento] for id_agendamento in self._por_barbeiro.get(cpf_barbeiro, ())]
+
+    def quantidade_por_barbeiro(self, cpf_barbeiro):
+        return len(self._por_barbeiro.get(cpf_barbeiro, ()))
+
+    def incluir_barbeiro(self, cpf_barbeiro):
+        # Barbeiro ainda sem agendamentos: entra na ordem por carga com zero.
+        self._carga.incluir(cpf_barbeiro)
+
+    def barbeiros_por_carga(self):
+        # CPFs dos barbeiros em ordem de (quantidade de agendamentos, cpf).
+        return iter(self._carga)
+
+class VisaoAgendamentos(Sequence):
+    # Visão somente leitura dos agendamentos (todos ou os de um dia), direto dos
+    # dicionários do repositório. Guarda a versão da criação: se o repositório
+    # mudar, a iteração para com VisaoDesatualizada em vez de seguir com dados
+    # misturados. len() e bool() não conferem: dão o tamanho atual.
+    def __init__(self, repositorio, dia=None, trava=None):
+        self._repositorio = repositorio
+        self._dia = dia
+        self._trava = trava
+        self._versao = repositorio.versao
+
+    @property
+    def versao(self):
+        return self._versao
+
+    @property
+    def atual(self):
+        return self._repositorio.versao == self._versao
+
+    def conferir(self):
+        if not self.atual:
+            raise VisaoDesatualizada()
+
+    def atualizada(self):
+        return VisaoAgendamentos(self._repositorio, self._dia, self._trava)
+
+    def _ids(self):
+        if self._dia is None:
+            return self._repositorio._agendamentos
+        return self._repositorio._por_dia.get(self._dia, {})
+
+    def __len__(self):
+        return len(self._ids())
+
+    def __iter__(self):
+        self.conferir()
+        agendamentos = self._repositorio._agendamentos
+        ids = iter(self._ids())
+        while True:
+            try:
+                id_agendamento = next(ids)
+            except StopIteration:
+                return
+            except RuntimeError:
+                # Dicionário alterado por outra thread entre dois passos.
+                raise VisaoDesatualizada() from None
+            self.conferir()
+            yield agendamentos[id_agendamento]
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return list(self)[indice]
+        if indice < 0:
+            indice += len(self)
+        if indice >= 0:
+            for agendamento in islice(self, indice, None):
+                return agendamento
+        raise IndexError("Índice fora do intervalo.")
+
+    def pagina(self, inicio, quantidade):
+        if self._trava is None:
+            return list(islice(self, inicio, inicio + quantidade))
+        with self._trava:
+            return list(islice(self, inicio, inicio + quantidade))
+
+    def paginas(self, tamanho):
+        # Listas de até 'tamanho' agendamentos; a trava (se houver) só é segura durante cada página.
+        iterador = iter(self)
+        while True:
+            if self._trava is None:
+                pagina = list(islice(iterador, tamanho))
+            else:
+                with self._trava:
+                    pagina = list(islice(iterador, tamanho))
+            if not pagina:
+                return
+            yield pagina
@@ -0,0 +1,311 @@
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+
+from .cpf import texto_cpf
+from .modelos import Agendamento, Barbeiro, Cliente, Visitante
+
+class ArmazenamentoSQLite:
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS usuarios (
+            cpf TEXT PRIMARY KEY,
+            tipo TEXT NOT NULL,
+            nome TEXT NOT NULL,
+            salario NUMERIC,
+            duracao_slot INTEGER,
+            corte_desejado TEXT,
+            valor NUMERIC,
+            dia TEXT,
+            horario_desejado TEXT,
+            cortes TEXT
+        );
+        CREATE INDEX IF NOT EXISTS usuarios_tipo ON usuarios (tipo);
+        CREATE TABLE IF NOT EXISTS horarios_livres (
+            cpf_barbeiro TEXT NOT NULL,
+            dia TEXT NOT NULL,
+            mascara TEXT NOT NULL,
+            PRIMARY KEY (cpf_barbeiro, dia)
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS agendamentos (
+            id INTEGER PRIMARY KEY,
+            cpf TEXT NOT NULL,
+            nome TEXT NOT NULL,
+            corte_desejado TEXT NOT NULL,
+            valor NUMERIC NOT NULL,
+            dia TEXT NOT NULL,
+            horario_desejado TEXT NOT NULL,
+            cpf_barbeiro TEXT
+        );
+    """
+    # Colunas acrescentadas depois da primeira versão do esquema.
+    MIGRACOES = (
+        ("usuarios", "cortes", "TEXT"),
+        ("agendamentos", "cpf_barbeiro", "TEXT"),
+    )
+    # Versão dos dados (PRAGMA user_version). 1: CPFs gravados só com dígitos.
+    VERSAO_DADOS = 1
+    COLUNAS_CPF = (("usuarios", "cpf"), ("horarios_livres", "cpf_barbeiro"), ("agendamentos", "cpf"), ("agendamentos", "cpf_barbeiro"))
+    LIMITE_PARAMETROS = 900
+    # Textos SQL fixos: o sqlite3 reaproveita o statement preparado de cada um.
+    SALVAR_USUARIO = "INSERT OR REPLACE INTO usuarios VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+    OBTER_USUARIO = "SELECT * FROM usuarios WHERE cpf = ?"
+    EXISTE_USUARIO = "SELECT 1 FROM usuarios WHERE cpf = ?"
+    REMOVER_USUARIO = "DELETE FROM usuarios WHERE cpf = ?"
+    LISTAR_CPFS = "SELECT cpf FROM usuarios"
+    CONTAR_USUARIOS = "SELECT COUNT(*) FROM usuarios"
+    TIPO_USUARIO = "SELECT tipo FROM usuarios WHERE cpf = ?"
+    CONTAR_POR_TIPO = "SELECT tipo, COUNT(*) FROM usuarios GROUP BY tipo"
+    LISTAR_CPFS_TIPO = "SELECT cpf FROM usuarios WHERE tipo = ? ORDER BY rowid"
+    LISTAR_BARBEIROS = "SELECT cpf FROM usuarios WHERE tipo = 'barbeiro' ORDER BY rowid"
+    OBTER_HORARIOS = "SELECT dia, mascara FROM horarios_livres WHERE cpf_barbeiro = ?"
+    SALVAR_HORARIOS = "INSERT OR REPLACE INTO horarios_livres VALUES (?, ?, ?)"
+    SALVAR_AGENDAMENTO = "INSERT OR REPLACE INTO agendamentos VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+    REMOVER_AGENDAMENTO = "DELETE FROM agendamentos WHERE id = ?"
+    LISTAR_AGENDAMENTOS = "SELECT * FROM agendamentos ORDER BY id"
+
+    def __init__(self, caminho):
+        # Uma conexão compartilhada entre threads, serializada pela trava.
+        self._conexao = sqlite3.connect(caminho, isolation_level=None, cached_statements=64, check_same_thread=False)
+        self._trava = threading.RLock()
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.executescript(self.ESQUEMA)
+        self._migrar()
+        # cpf -> (barbeiro, máscaras já gravadas), para gravar só os dias alterados.
+        self._barbeiros = {}
+
+    def _migrar(self):
+        for tabela, coluna, tipo in self.MIGRACOES:
+            colunas = {linha[1] for linha in self._conexao.execute(f"PRAGMA table_info({tabela})")}
+            if coluna not in colunas:
+                self._conexao.execute(f"ALTER TABLE {tabela} ADD COLUMN {coluna} {tipo}")
+        (versao,) = self._conexao.execute("PRAGMA user_version").fetchone()
+        if versao < 1:
+            with self._conexao:
+                self._conexao.execute("BEGIN")
+                self._normalizar_cpfs()
+                self._conexao.execute(f"PRAGMA user_version = {self.VERSAO_DADOS}")
+
+    def _normalizar_cpfs(self):
+        # Bancos de antes da normalização guardavam o CPF como digitado ("123.456.789-09").
+        # Se o mesmo CPF já tem uma linha canônica, ela prevalece e a antiga é descartada.
+        for tabela, coluna in self.COLUNAS_CPF:
+            for (cpf,) in self._conexao.execute(f"SELECT DISTINCT {coluna} FROM {tabela} WHERE {coluna} IS NOT NULL").fetchall():
+                canonico = texto_cpf(cpf)
+                if canonico != cpf:
+                    self._conexao.execute(f"UPDATE OR IGNORE {tabela} SET {coluna} = ? WHERE {coluna} = ?", (canonico, cpf))
+                    self._conexao.execute(f"DELETE FROM {tabela} WHERE {coluna} = ?", (cpf,))
+
+    def _escrever(self, sql, parametros):
+        with self._trava:
+            if not self._conexao.in_transaction:
+                self._conexao.execute("BEGIN")
+            self._conexao.execute(sql, parametros)
+
+    def _ler(self, sql, parametros=()):
+        with self._trava:
+            return self._conexao.execute(sql, parametros).fetchall()
+
+    def confirmar(self):
+        with self._trava:
+            for cpf, (barbeiro, gravadas) in list(self._barbeiros.items()):
+                for dia in barbeiro.calendario.dias:
+                    mascara = barbeiro.calendario.mascara(dia)
+                    if gravadas.get(dia) != mascara:
+                        self._escrever(self.SALVAR_HORARIOS, (cpf, dia, format(mascara, "x")))
+                        gravadas[dia] = mascara
+            if self._conexao.in_transaction:
+                self._conexao.execute("COMMIT")
+
+    def fechar(self):
+        with self._trava:
+            self.confirmar()
+            self._conexao.close()
+
+    def _acompanhar(self, barbeiro, gravadas):
+        self._barbeiros[barbeiro.cpf] = (barbeiro, gravadas)
+
+    def salvar_usuario(self, usuario):
+        tipo = usuario.PAPEL
+        if tipo == Barbeiro.PAPEL:
+            cortes = None if usuario.cortes is None else ",".join(sorted(usuario.cortes))
+            linha = (usuario.cpf, tipo, usuario.nome, usuario.salario, usuario.duracao_slot, None, None, None, None, cortes)
+            self._acompanhar(usuario, {})
+        elif tipo == Cliente.PAPEL:
+            linha = (usuario.cpf, tipo, usuario.nome, None, None, usuario.corte_desejado, usuario.valor, usuario.dia, usuario.horario_desejado, None)
+        else:
+            linha = (usuario.cpf, Visitante.PAPEL, usuario.nome, None, None, None, None, None, None, None)
+        self._escrever(self.SALVAR_USUARIO, linha)
+
+    def obter_usuario(self, cpf):
+        linhas = self._ler(self.OBTER_USUARIO, (cpf,))
+        if not linhas:
+            return None
+        linha = linhas[0]
+        cpf, tipo, nome, salario, duracao_slot, corte_desejado, valor, dia, horario_desejado, cortes = linha
+        if tipo == "barbeiro":
+            barbeiro = Barbeiro(nome, cpf, salario, duracao_slot, None if cortes is None else cortes.split(","))
+            gravadas = {}
+            for dia, mascara in self._ler(self.OBTER_HORARIOS, (cpf,)):
+                gravadas[dia] = int(mascara, 16)
+                barbeiro.calendario.definir_mascara(dia, gravadas[dia])
+            self._acompanhar(barbeiro, gravadas)
+            return barbeiro
+        if tipo == "cliente":
+            return Cliente(nome, cpf, corte_desejado, valor, dia, horario_desejado)
+        return Visitante(nome, cpf)
+
+    def existe_usuario(self, cpf):
+        return bool(self._ler(self.EXISTE_USUARIO, (cpf,)))
+
+    def cpfs_existentes(self, cpfs):
+        # Consulta em blocos para respeitar o limite de parâmetros do SQLite.
+        cpfs = list(cpfs)
+        existentes = set()
+        for inicio in range(0, len(cpfs), self.LIMITE_PARAMETROS):
+            bloco = cpfs[inicio:inicio + self.LIMITE_PARAMETROS]
+            marcadores = ", ".join("?" * len(bloco))
+            existentes.update(cpf for (cpf,) in self._ler(f"SELECT cpf FROM usuarios WHERE cpf IN ({marcadores})", bloco))
+        return existentes
+
+    def remover_usuario(self, cpf):
+        self._escrever(self.REMOVER_USUARIO, (cpf,))
+        self._barbeiros.pop(cpf, None)
+
+    def cpfs_usuarios(self):
+        for (cpf,) in self._ler(self.LISTAR_CPFS):
+            yield cpf
+
+    def quantidade_usuarios(self):
+        return self._ler(self.CONTAR_USUARIOS)[0][0]
+
+    def tipo_usuario(self, cpf):
+        linhas = self._ler(self.TIPO_USUARIO, (cpf,))
+        return linhas[0][0] if linhas else None
+
+    def quantidades_por_tipo(self):
+        return dict(self._ler(self.CONTAR_POR_TIPO))
+
+    def cpfs_do_tipo(self, tipo):
+        return [cpf for (cpf,) in self._ler(self.LISTAR_CPFS_TIPO, (tipo,))]
+
+    def cpfs_barbeiros(self):
+        return [cpf for (cpf,) in self._ler(self.LISTAR_BARBEIROS)]
+
+    def salvar_agendamento(self, agendamento):
+        self._escrever(self.SALVAR_AGENDAMENTO, (
+            agendamento.id_agendamento, agendamento.cpf, agendamento.nome, agendamento.corte_desejado,
+            agendamento.valor, agendamento.dia, agendamento.horario_desejado, agendamento.cpf_barbeiro,
+        ))
+
+    def remover_agendamento(self, id_agendamento):
+        self._escrever(self.REMOVER_AGENDAMENTO, (id_agendamento,))
+
+    def carregar_agendamentos(self):
+        clientes = {}
+        cursor = self._conexao.cursor()
+        with self._trava:
+            cursor.execute(self.LISTAR_AGENDAMENTOS)
+        while True:
+            with self._trava:
+                linhas = cursor.fetchmany(1000)
+            if not linhas:
+                break
+            for id_agendamento, cpf, nome, corte_desejado, valor, dia, horario_desejado, cpf_barbeiro in linhas:
+                # Agendamentos do mesmo CPF compartilham um único Cliente.
+                cliente = clientes.get(cpf)
+                if cliente is None:
+                    cliente = clientes[cpf] = Cliente(nome, cpf, corte_desejado, valor, dia, horario_desejado)
+                agendamento = Agendamento(cliente, corte_desejado, valor, dia, horario_desejado, cpf_barbeiro)
+                agendamento.id_agendamento = id_agendamento
+                yield agendamento
+
+class UsuariosPersistentes(MutableMapping):
+    # Dicionário de usuários que lê do armazenamento sob demanda e guarda os já lidos.
+    # No banco e entre os já lidos, a chave é o texto canônico do CPF.
+    def __init__(self, armazenamento):
+        self._armazenamento = armazenamento
+        self._carregados = {}
+        # Quantidade por papel: lida do banco uma vez e depois mantida a cada inserção e remoção.
+        self._quantidades = None
+        self._observadores = []
+
+    def observar(self, observador):
+        # observador(cpf) é chamado quando o usuário do CPF é removido ou substituído.
+        self._observadores.append(observador)
+
+    def _avisar(self, texto):
+        for observador in self._observadores:
+            observador(texto)
+
+    def __getitem__(self, cpf):
+        texto = texto_cpf(cpf)
+        usuario = self._carregados.get(texto)
+        if usuario is not None:
+            return usuario
+        usuario = self._armazenamento.obter_usuario(texto)
+        if usuario is None:
+            raise KeyError(cpf)
+        self._carregados[texto] = usuario
+        return usuario
+
+    def __contains__(self, cpf):
+        texto = texto_cpf(cpf)
+        return texto in self._carregados or self._armazenamento.existe_usuario(texto)
+
+    def _papel_gravado(self, texto):
+        if texto in self._carregados:
+            return self._carregados[texto].PAPEL
+        return self._armazenamento.tipo_usuario(texto)
+
+    def _contar(self, papel, diferenca):
+        if papel is not None:
+            self._quantidades[papel] = self._quantidades.get(papel, 0) + diferenca
+
+    def __setitem__(self, cpf, usuario):
+        texto = texto_cpf(cpf)
+        if self._quantidades is not None:
+            self._contar(self._papel_gravado(texto), -1)
+            self._contar(usuario.PAPEL, 1)
+        self._armazenamento.salvar_usuario(usuario)
+        # Só um usuário já lido pode estar em uso (numa sessão, por exemplo).
+        anterior = self._carregados.get(texto)
+        self._carregados[texto] = usuario
+        if anterior is not None and anterior is not usuario:
+            self._avisar(texto)
+
+    def __delitem__(self, cpf):
+        texto = texto_cpf(cpf)
+        papel = self._papel_gravado(texto)
+        if papel is None:
+            raise KeyError(cpf)
+        self._armazenamento.remover_usuario(texto)
+        self._carregados.pop(texto, None)
+        if self._quantidades is not None:
+            self._contar(papel, -1)
+        self._avisar(texto)
+
+    def papel(self, cpf):
+        return self._papel_gravado(texto_cpf(cpf))
+
+    def quantidade(self, papel):
+        if self._quantidades is None:
+            self._quantidades = self._armazenamento.quantidades_por_tipo()
+        return self._quantidades.get(papel, 0)
+
+    def do_papel(self, papel):
+        return [self[cpf] for cpf in self._armazenamento.cpfs_do_tipo(papel)]
+
+    def existentes(self, cpfs):
+        # Devolve os CPFs como foram passados, mas consulta pelo texto canônico.
+        textos = {}
+        for cpf in cpfs:
+            textos.setdefault(texto_cpf(cpf), []).append(cpf)
+        existentes = self._armazenamento.cpfs_existentes(textos)
+        return {cpf for texto in existentes for cpf in textos[texto]}
+
+    def __iter__(self):
+        return self._armazenamento.cpfs_usuarios()
+
+    def __len__(self):
+        return self._armazenamento.quantidade_usuarios()
@@ -0,0 +1,529 @@
+import threading
+
+from .agenda import HorariosDia, IndiceDisponibilidade, bits_ligados, horario_para_minutos, minutos_para_horario
+from .agendamentos import RepositorioAgendamentos
+from .espera import ListaEspera
+from .faturamento import RegistroFaturamento
+from .metricas import instrumentar
+from .modelos import Agendamento
+from .permissoes import LIVRE, AcessoAutorizado, Permissao, requer
+from .servicos import catalogo_padrao
+
+class Barbearia:
+    def __init__(self, barbeiro, armazenamento=None, cadastrar=None, nome=None, catalogo=None):
+        self._nome = nome
+        # Preço e duração de cada corte; a duração decide quantos slots seguidos a reserva ocupa.
+        self._catalogo = catalogo_padrao() if catalogo is None else catalogo
+        self._barbeiros = {}
+        self._disponibilidade = IndiceDisponibilidade()
+        self._armazenamento = armazenamento
+        self._cadastrar = cadastrar
+        # Com armazenamento, os agendamentos só são lidos no primeiro acesso.
+        self._clientes = RepositorioAgendamentos() if armazenamento is None else None
+        self._faturamento = RegistroFaturamento()
+        # Protege agendamentos, faturamento e armazenamento; os slots têm travas próprias por dia.
+        self._trava = threading.RLock()
+        self._eventos = None
+        self._espera = ListaEspera()
+        self._previsao = None
+        self.adicionar_barbeiro(barbeiro)
+
+    @property
+    @requer(LIVRE)
+    def nome(self):
+        return self._nome
+
+    @property
+    def barbeiro(self):
+        return next(iter(self._barbeiros.values()))
+
+    @property
+    def barbeiros(self):
+        return list(self._barbeiros.values())
+
+    @property
+    def disponibilidade(self):
+        return self._disponibilidade
+
+    @property
+    def lista_espera(self):
+        return self._espera
+
+    @property
+    def catalogo(self):
+        return self._catalogo
+
+    def _duracao(self, corte):
+        return self._catalogo.duracao(corte)
+
+    def adicionar_barbeiro(self, barbeiro):
+        if barbeiro.cpf in self._barbeiros:
+            raise ValueError("Barbeiro já faz parte da barbearia.")
+        self._barbeiros[barbeiro.cpf] = barbeiro
+        self._disponibilidade.acompanhar(barbeiro)
+        with self._trava:
+            if self._clientes is not None:
+                self._clientes.incluir_barbeiro(barbeiro.cpf)
+        if self._eventos is not None:
+            self._gravar_mascaras(barbeiro)
+            with self._trava:
+                self._eventos.barbeiro_adicionado(barbeiro)
+                self._snapshot_periodico()
+
+    def definir_modelo(self, cpf_barbeiro, modelo):
+        # Aplica a semana-padrão do modelo sem liberar os blocos dos agendamentos já feitos.
+        barbeiro = self.obter_barbeiro(cpf_barbeiro)
+        with self._trava:
+            ocupados = {}
+            for agendamento in self.agendamentos.buscar_por_barbeiro(barbeiro.cpf):
+                slots = barbeiro.slots_para(self._duracao(agendamento.corte_desejado))
+                ocupados[agendamento.dia] = ocupados.get(agendamento.dia, 0) | barbeiro.calendario.bloco(agendamento.horario_desejado, slots)
+            barbeiro.definir_modelo(modelo, ocupados)
+
+    def _gravar_mascaras(self, barbeiro):
+        # Só com log de eventos: sem ele, a agenda não paga um observador a cada alteração.
+        cpf = barbeiro.cpf
+
+        def mascara_alterada(dia, antiga, nova):
+            self._eventos.mascara_alterada(cpf, dia, nova)
+
+        barbeiro.calendario.observar(mascara_alterada)
+
+    def registrar_eventos(self, registro):
+        # A partir daqui toda mutação vai para o log; um log novo começa com um snapshot.
+        with self._trava:
+            if self._eventos is None:
+                for barbeiro in self._barbeiros.values():
+                    self._gravar_mascaras(barbeiro)
+            self._eventos = registro
+            if registro.vazio():
+                self.salvar_snapshot()
+
+    def salvar_snapshot(self):
+        with self._trava:
+            self._eventos.salvar_snapshot(self.barbeiros, self.agendamentos)
+
+    def _snapshot_periodico(self):
+        # Chamado com self._trava logo após gravar um evento.
+        if self._eventos.precisa_snapshot(len(self.agendamentos)):
+            self.salvar_snapshot()
+
+    def como(self, usuario):
+        # A mesma barbearia, mas cada método marcado com @requer confere a permissão do usuário.
+        return AcessoAutorizado(self, usuario)
+
+    def obter_barbeiro(self, cpf):
+        try:
+            return self._barbeiros[cpf]
+        except KeyError:
+            raise ValueError("Barbeiro não encontrado.") from None
+
+    @property
+    @requer(Permissao.LISTAR_CLIENTES)
+    @instrumentar
+    def clientes(self):
+        return self.listar_clientes()
+
+    @property
+    def agendamentos(self):
+        if self._clientes is None:
+            with self._trava:
+                if self._clientes is None:
+                    clientes = RepositorioAgendamentos()
+                    for agendamento in self._armazenamento.carregar_agendamentos():
+                        if agendamento.cpf_barbeiro is None:
+                            agendamento.cpf_barbeiro = self.barbeiro.cpf
+                        clientes.adicionar(agendamento, agendamento.id_agendamento)
+                        self._faturamento.registrar(agendamento)
+                    self._usar_agendamentos(clientes)
+        return self._clientes
+
+    def _usar_agendamentos(self, clientes):
+        # Os barbeiros ainda sem agendamento também entram na ordem por carga do repositório.
+        for cpf in self._barbeiros:
+            clientes.incluir_barbeiro(cpf)
+        self._clientes = clientes
+
+    @property
+    @requer(Permissao.CALCULAR_LUCRO)
+    @instrumentar
+    def faturamento(self):
+        self.agendamentos
+        return self._faturamento
+
+    @property
+    @requer(Permissao.CALCULAR_LUCRO)
+    def previsao(self):
+        # Previsão de ocupação e faltas, montada no primeiro acesso e atualizada a cada agendamento criado, editado ou removido.
+        if self._previsao is None:
+            from .previsao import PrevisaoOcupacao
+
+            with self._trava:
+                if self._previsao is None:
+                    self._previsao = PrevisaoOcupacao.da_barbearia(self)
+        return self._previsao
+
+    @requer(Permissao.LISTAR_HORARIOS)
+    @instrumentar
+    def listar_horarios_disponiveis(self, dia):
+        # Retrato somente leitura do dia, sem cópia; 'atual' diz se ele ainda vale.
+        if dia in self._disponibilidade.dias:
+            return HorariosDia(self._disponibilidade, dia)
+        else:
+            raise ValueError("Dia inválido.")
+
+    @requer(Permissao.LISTAR_HORARIOS)
+    def horarios_por_data(self, cpf_barbeiro, inicio, fim):
+        # (data, horários livres) do barbeiro entre as datas, pelas regras do modelo
+        # dele; as semanas só são calculadas à medida que o gerador é consumido.
+        agenda = self.obter_barbeiro(cpf_barbeiro).agenda
+        if agenda is None:
+            raise ValueError("Barbeiro sem modelo de disponibilidade.")
+        return agenda.livres(inicio, fim)
+
+    def _aceita_corte(self, corte):
+        # Filtro para o índice: o barbeiro faz o corte e o serviço inteiro cabe a partir do minuto.
+        if corte is None:
+            return None
+        duracao = self._duracao(corte)
+
+        def aceita(cpf, dia, minuto):
+            barbeiro = self._barbeiros[cpf]
+            if not barbeiro.faz_corte(corte):
+                return False
+            return barbeiro.slots_para(duracao) == 1 or barbeiro.cabe(dia, minutos_para_horario(minuto), duracao)
+
+        return aceita
+
+    def _menos_ocupado(self, cpfs, aceita=None, dia=None, minuto=None):
+        # Distribui a carga: entre os livres que o filtro aceita, o barbeiro com menos
+        # agendamentos (no empate, o menor CPF); None se nenhum serve. Com muitos livres,
+        # percorre os barbeiros já em ordem de carga e para no primeiro livre aceito:
+        # se uma fração f deles está livre, são ~1/f passos em vez de um por livre.
+        agendamentos = self.agendamentos
+        if len(cpfs) * len(cpfs) > len(self._barbeiros):
+            for cpf in agendamentos.barbeiros_por_carga():
+                if cpf in cpfs and (aceita is None or aceita(cpf, dia, minuto)):
+                    return self._barbeiros[cpf]
+        livres = [cpf for cpf in tuple(cpfs) if aceita is None or aceita(cpf, dia, minuto)]
+        if not livres:
+            return None
+        return self._barbeiros[min(livres, key=lambda cpf: (agendamentos.quantidade_por_barbeiro(cpf), cpf))]
+
+    @requer(Permissao.LISTAR_HORARIOS)
+    @instrumentar
+    def barbeiro_livre(self, dia, horario, corte=None):
+        livres = self._disponibilidade.livres_em(dia, horario)
+        if not livres:
+            return None
+        aceita = self._aceita_corte(corte)
+        return self._menos_ocupado(livres, aceita, dia, None if aceita is None else horario_para_minutos(horario))
+
+    @requer(Permissao.LISTAR_HORARIOS)
+    @instrumentar
+    def horarios_para_corte(self, dia, corte):
+        # Inícios do dia em que algum barbeiro que faz o corte tem a duração inteira livre:
+        # uma consulta à tabela de encaixes de cada barbeiro, sem varrer os horários livres.
+        # A versão do índice é lida antes: qualquer mudança no dia durante o cálculo deixa o retrato desatualizado.
+        versao = self._disponibilidade.versao(dia)
+        duracao = self._duracao(corte)
+        por_slot = {}
+        for barbeiro in self._barbeiros.values():
+            if barbeiro.faz_corte(corte):
+                duracao_slot = barbeiro.duracao_slot
+                por_slot[duracao_slot] = por_slot.get(duracao_slot, 0) | barbeiro.encaixes(dia, duracao)
+        minutos = 0
+        for duracao_slot, inicios in por_slot.items():
+            for indice in bits_ligados(inicios):
+                minutos |= 1 << indice * duracao_slot
+        return HorariosDia(self._disponibilidade, dia, (minutos, versao))
+
+    @requer(Permissao.LISTAR_HORARIOS)
+    @instrumentar
+    def primeiro_horario_livre(self, dia, corte=None, a_partir_de=None):
+        encontrado = self._disponibilidade.primeiro_livre(dia, a_partir_de, self._aceita_corte(corte))
+        if encontrado is None:
+            return None
+        horario, cpfs = encontrado
+        return horario, self._menos_ocupado(cpfs)
+
+    @requer(Permissao.LISTAR_HORARIOS)
+    @instrumentar
+    def horarios_mais_proximos(self, dia, horario, quantidade=5, corte=None):
+        # Sugestões quando o horário pedido está ocupado: (dia, horario, barbeiro), do mais próximo ao mais distante.
+        encontrados = self._disponibilidade.mais_proximos(dia, horario, quantidade, self._aceita_corte(corte))
+        return [(outro_dia, outro_horario, self._menos_ocupado(cpfs)) for outro_dia, outro_horario, cpfs in encontrados]
+
+    def _barbeiro_para(self, agendamento):
+        if agendamento.dia not in self._disponibilidade.dias:
+            return None
+        if agendamento.cpf_barbeiro is None:
+            return self.barbeiro_livre(agendamento.dia, agendamento.horario_desejado, agendamento.corte_desejado)
+        return self._barbeiros.get(agendamento.cpf_barbeiro)
+
+    def _ocupar(self, dia, horario, escolher, duracao=None):
+        # Outro terminal pode ocupar o slot entre a escolha e a reserva;
+        # nesse caso escolhe de novo até conseguir ou não restar barbeiro livre.
+        while True:
+            barbeiro = escolher()
+            if barbeiro is None:
+                return None
+            if barbeiro.ocupar_horario_livre(dia, horario, duracao):
+                return barbeiro
+
+    @requer(Permissao.RESERVAR_HORARIO)
+    @instrumentar
+    def agendar(self, cliente, cpf_barbeiro=None):
+        # Aceita um Cliente (usa o corte, dia e horário dele) ou um Agendamento pronto.
+        if isinstance(cliente, Agendamento):
+            agendamento = cliente
+        else:
+            agendamento = Agendamento.do_cliente(cliente, cpf_barbeiro)
+        duracao = self._duracao(agendamento.corte_desejado)
+        if agendamento.cpf_barbeiro is None:
+            barbeiro = self._ocupar(agendamento.dia, agendamento.horario_desejado, lambda: self._barbeiro_para(agendamento), duracao)
+        else:
+            barbeiro = self._barbeiro_para(agendamento)
+            if barbeiro is not None and not barbeiro.ocupar_horario_livre(agendamento.dia, agendamento.horario_desejado, duracao):
+                barbeiro = None
+        if barbeiro is None:
+            return None
+        with self._trava:
+            agendamento.cpf_barbeiro = barbeiro.cpf
+            self.agendamentos.adicionar(agendamento)
+            self._faturamento.registrar(agendamento)
+            if self._armazenamento is not None:
+                self._armazenamento.salvar_agendamento(agendamento)
+            if self._eventos is not None:
+                self._eventos.agendamento_criado(agendamento)
+                self._snapshot_periodico()
+        return agendamento
+
+    @requer(Permissao.RESERVAR_HORARIO)
+    @instrumentar
+    def reservar_horario(self, cliente):
+        return self.agendar(cliente) is not None
+
+    @requer(Permissao.RESERVAR_HORARIO)
+    @instrumentar
+    def agendar_lote(self, solicitacoes, processos=None, tentativas=None):
+        # Distribui um lote de Solicitacao pelos horários livres maximizando a receita;
+        # devolve (agendamentos feitos, solicitações que ficaram de fora).
+        from .otimizador import Solicitacao, otimizar
+
+        # A reserva ocupa a duração do catálogo, então é ela que o otimizador precisa usar.
+        originais = {}
+        for solicitacao in solicitacoes:
+            duracao = self._duracao(solicitacao.cliente.corte_desejado)
+            if solicitacao.duracao is not None and solicitacao.duracao != duracao:
+                raise ValueError("Duração diferente da do catálogo.")
+            originais[Solicitacao(solicitacao.cliente, solicitacao.opcoes, duracao)] = solicitacao
+        plano = otimizar(originais, self.barbeiros, processos, tentativas)
+        agendamentos = []
+        pendentes = [originais[solicitacao] for solicitacao in plano.pendentes]
+        for solicitacao, barbeiro, dia, horario in plano.alocacoes:
+            solicitacao = originais[solicitacao]
+            cliente = solicitacao.cliente
+            agendamento = self.agendar(Agendamento(cliente, cliente.corte_desejado, cliente.valor, dia, horario, barbeiro.cpf))
+            # None: outro terminal ocupou o slot depois do cálculo do plano.
+            if agendamento is None:
+                pendentes.append(solicitacao)
+            else:
+                agendamentos.append(agendamento)
+        return agendamentos, pendentes
+
+    @requer(Permissao.RESERVAR_HORARIO)
+    @instrumentar
+    def entrar_na_espera(self, cliente):
+        # Espera pelo dia e horário pedidos; se o slot já estiver livre, o pedido é atendido na hora.
+        agendamento = cliente if isinstance(cliente, Agendamento) else Agendamento.do_cliente(cliente)
+        if agendamento.dia not in self._disponibilidade.dias:
+            raise ValueError("Dia inválido.")
+        pedido = self._espera.adicionar(agendamento)
+        barbeiro = self.barbeiro_livre(agendamento.dia, agendamento.horario_desejado, agendamento.corte_desejado)
+        if barbeiro is not None:
+            self._atender_espera(barbeiro, agendamento.dia, agendamento.horario_desejado)
+        return pedido
+
+    @requer(Permissao.RESERVAR_HORARIO)
+    @instrumentar
+    def sair_da_espera(self, id_pedido):
+        self._espera.remover(id_pedido)
+
+    def _devolver(self, barbeiro, dia, horario, corte):
+        # Devolve o bloco inteiro do serviço; retorna quantos slots foram liberados.
+        slots = barbeiro.slots_para(self._duracao(corte))
+        barbeiro.calendario.liberar(dia, horario, slots)
+        return slots
+
+    def _liberar(self, barbeiro, dia, horario, corte):
+        # Cada slot liberado pode atender a lista de espera.
+        self._atender_liberados(barbeiro, dia, horario, self._devolver(barbeiro, dia, horario, corte))
+
+    def _atender_liberados(self, barbeiro, dia, horario, slots):
+        if not self._espera:
+            return
+        inicio = horario_para_minutos(horario)
+        for indice in range(slots):
+            self._atender_espera(barbeiro, dia, minutos_para_horario(inicio + indice * barbeiro.duracao_slot))
+
+    def _atender_espera(self, barbeiro, dia, horario):
+        # O slot liberado vai para o pedido mais antigo que o barbeiro consegue atender.
+        pedido = self._espera.retirar(dia, horario, barbeiro.faz_corte)
+        if pedido is None:
+            return None
+        agendamento = pedido.agendamento
+        agendamento.cpf_barbeiro = barbeiro.cpf
+        if self.agendar(agendamento) is not None:
+            return agendamento
+        # Outro terminal ocupou o slot antes: o pedido volta para a fila na mesma posição.
+        agendamento.cpf_barbeiro = None
+        self._espera.devolver(pedido)
+        return None
+
+    @requer(Permissao.LISTAR_CLIENTES)
+    @instrumentar
+    def listar_clientes(self, dia=None):
+        # Visão somente leitura, sem cópia, de todos os agendamentos ou só dos de um dia.
+        return self.agendamentos.visao(dia, self._trava)
+
+    @requer(Permissao.LISTAR_CLIENTES)
+    @instrumentar
+    def buscar_clientes(self, cpf):
+        with self._trava:
+            return self.agendamentos.buscar_por_cpf(cpf)
+
+    @requer(Permissao.EDITAR_CLIENTE)
+    @instrumentar
+    def editar_agendamento(self, id_agendamento, **kwargs):
+        with self._trava:
+            cliente = self.agendamentos.obter(id_agendamento)
+            liberados = self._trocar_corte(cliente, kwargs["corte_desejado"]) if "corte_desejado" in kwargs else None
+            self._faturamento.estornar(cliente)
+            self.agendamentos.atualizar(id_agendamento, **kwargs)
+            self._faturamento.registrar(cliente)
+            if self._armazenamento is not None:
+                self._armazenamento.salvar_agendamento(cliente)
+            if self._eventos is not None:
+                campos = {campo: getattr(cliente, campo) for campo in self.agendamentos.CAMPOS_EDITAVEIS if campo in kwargs}
+                self._eventos.agendamento_editado(id_agendamento, campos)
+                self._snapshot_periodico()
+        if liberados:
+            self._atender_liberados(*liberados)
+        return cliente
+
+    def _trocar_corte(self, cliente, corte):
+        # Um corte de outra duração aumenta ou diminui o bloco reservado no mesmo início;
+        # devolve (barbeiro, dia, horario, slots) do que sobrou no fim do bloco, se encolheu.
+        barbeiro = self._barbeiros.get(cliente.cpf_barbeiro)
+        if barbeiro is None:
+            return None
+        ocupados = barbeiro.slots_para(self._duracao(cliente.corte_desejado))
+        slots = barbeiro.slots_para(self._duracao(corte))
+        if slots == ocupados:
+            return None
+        if not barbeiro.calendario.redimensionar(cliente.dia, cliente.horario_desejado, ocupados, slots):
+            raise ValueError("Horário indisponível para o novo corte.")
+        if slots > ocupados:
+            return None
+        inicio = horario_para_minutos(cliente.horario_desejado) + slots * barbeiro.duracao_slot
+        return barbeiro, cliente.dia, minutos_para_horario(inicio), ocupados - slots
+
+    @requer(Permissao.EDITAR_CLIENTE)
+    @instrumentar
+    def remarcar_agendamento(self, id_agendamento, dia, horario):
+        corte = self.agendamentos.obter(id_agendamento).corte_desejado
+        duracao = self._duracao(corte)
+        barbeiro = self._ocupar(dia, horario, lambda: self.barbeiro_livre(dia, horario, corte), duracao)
+        if barbeiro is None:
+            return False
+        with self._trava:
+            if id_agendamento not in self.agendamentos:
+                # Excluído por outro terminal enquanto o novo slot era ocupado.
+                barbeiro.adicionar_horario_livre(dia, horario, duracao)
+                raise ValueError("Agendamento não encontrado.")
+            cliente = self.agendamentos.obter(id_agendamento)
+            antigo = (self._barbeiros[cliente.cpf_barbeiro], cliente.dia, cliente.horario_desejado, cliente.corte_desejado)
+            self.editar_agendamento(id_agendamento, dia=dia, horario_desejado=horario, cpf_barbeiro=barbeiro.cpf)
+        self._liberar(*antigo)
+        return True
+
+    @requer(Permissao.EDITAR_CLIENTE)
+    @instrumentar
+    def editar_cliente(self, cpf, **kwargs):
+        with self._trava:
+            cliente = self.agendamentos.primeiro_por_cpf(cpf)
+            if cliente is None:
+                raise ValueError("Cliente não encontrado.")
+            self.editar_agendamento(cliente.id_agendamento, **kwargs)
+
+    @requer(Permissao.EXCLUIR_CLIENTE)
+    @instrumentar
+    def excluir_cliente(self, cpf):
+        with self._trava:
+            agendamentos = self.agendamentos
+            cliente = agendamentos.primeiro_por_cpf(cpf)
+            if cliente is None:
+                raise ValueError("Cliente não encontrado.")
+            id_agendamento = cliente.id_agendamento
+            agendamentos.remover(id_agendamento)
+            self._faturamento.estornar(cliente)
+            # O bloco volta a ficar livre junto com a remoção, antes de qualquer coisa que possa falhar.
+            barbeiro = self._barbeiros[cliente.cpf_barbeiro]
+            dia, horario = cliente.dia, cliente.horario_desejado
+            slots = self._devolver(barbeiro, dia, horario, cliente.corte_desejado)
+            if self._armazenamento is not None:
+                self._armazenamento.remover_agendamento(id_agendamento)
+            if self._eventos is not None:
+                self._eventos.agendamento_removido(id_agendamento)
+                self._snapshot_periodico()
+            # O usuário só sai do cadastro com o último agendamento dele.
+            if self._cadastrar is not None and agendamentos.primeiro_por_cpf(cliente.cpf) is None:
+                try:
+                    self._cadastrar.remover_usuario(cpf)
+                except ValueError:  # Já tinha saído do cadastro.
+                    pass
+        self._atender_liberados(barbeiro, dia, horario, slots)
+
+def carregar_barbearia(armazenamento, cadastrar):
+    # Monta a barbearia com todos os barbeiros gravados; None se ainda não há nenhum.
+    barbearia = None
+    for cpf_barbeiro in armazenamento.cpfs_barbeiros():
+        barbeiro = cadastrar.usuarios[cpf_barbeiro]
+        if barbearia is None:
+            barbearia = Barbearia(barbeiro, armazenamento, cadastrar)
+        else:
+            barbearia.adicionar_barbeiro(barbeiro)
+    return barbearia
+
+def carregar_eventos(registro, cadastrar=None):
+    # Reconstrói a barbearia pelo último snapshot mais os eventos seguintes e
+    # continua gravando no mesmo log; None se o log ainda está vazio.
+    from .eventos import Reconstrucao
+
+    snapshot, eventos = registro.ler()
+    reconstrucao = Reconstrucao()
+    if snapshot is not None:
+        reconstrucao.carregar_snapshot(snapshot)
+    for evento in eventos:
+        reconstrucao.aplicar(evento)
+    reconstrucao.concluir()
+    if not reconstrucao.barbeiros:
+        return None
+    barbearia = None
+    for barbeiro in reconstrucao.barbeiros.values():
+        if barbearia is None:
+            barbearia = Barbearia(barbeiro, cadastrar=cadastrar)
+        else:
+            barbearia.adicionar_barbeiro(barbeiro)
+    barbearia._usar_agendamentos(reconstrucao.agendamentos)
+    usuarios = dict(reconstrucao.barbeiros)
+    for agendamento in reconstrucao.agendamentos:
+        barbearia._faturamento.registrar(agendamento)
+        usuarios.setdefault(agendamento.cpf, agendamento.cliente)
+    if cadastrar is not None:
+        for cpf, usuario in usuarios.items():
+            if cpf not in cadastrar.usuarios:
+                cadastrar.usuarios[cpf] = usuario
+    barbearia.registrar_eventos(registro)
+    return barbearia
@@ -0,0 +1,161 @@
+from collections import defaultdict
+from collections.abc import MutableMapping
+
+from .cpf import CPF, texto_cpf, validar_cpf
+from .metricas import instrumentar
+from .modelos import Barbeiro, Cliente, Visitante
+
+class UsuariosCadastrados(MutableMapping):
+    # Dicionário cpf -> usuário com um índice por papel, mantido a cada
+    # inserção e remoção: contar ou listar um papel não passa pelos outros.
+    # As chaves internas são texto_cpf(cpf), então CPF com ou sem pontuação é o mesmo.
+    def __init__(self):
+        self._usuarios = {}
+        self._por_papel = defaultdict(dict)
+        self._observadores = []
+
+    def observar(self, observador):
+        # observador(cpf) é chamado quando o usuário do CPF é removido ou substituído.
+        self._observadores.append(observador)
+
+    def _avisar(self, chave):
+        for observador in self._observadores:
+            observador(chave)
+
+    def __getitem__(self, cpf):
+        try:
+            return self._usuarios[texto_cpf(cpf)]
+        except KeyError:
+            raise KeyError(cpf) from None
+
+    def __contains__(self, cpf):
+        return texto_cpf(cpf) in self._usuarios
+
+    def get(self, cpf, padrao=None):
+        return self._usuarios.get(texto_cpf(cpf), padrao)
+
+    def __setitem__(self, cpf, usuario):
+        chave = texto_cpf(cpf)
+        anterior = self._usuarios.get(chave)
+        if anterior is not None:
+            del self._por_papel[anterior.PAPEL][chave]
+        self._usuarios[chave] = usuario
+        self._por_papel[usuario.PAPEL][chave] = usuario
+        if anterior is not None:
+            self._avisar(chave)
+
+    def setdefault(self, cpf, usuario):
+        # Inclui só se o CPF ainda não existe, com uma consulta; um CPF já validado é a própria chave.
+        chave = cpf if cpf.__class__ is CPF else texto_cpf(cpf)
+        anterior = self._usuarios.setdefault(chave, usuario)
+        if anterior is usuario:
+            self._por_papel[usuario.PAPEL][chave] = usuario
+        return anterior
+
+    def __delitem__(self, cpf):
+        chave = texto_cpf(cpf)
+        try:
+            usuario = self._usuarios.pop(chave)
+        except KeyError:
+            raise KeyError(cpf) from None
+        del self._por_papel[usuario.PAPEL][chave]
+        self._avisar(chave)
+
+    def __iter__(self):
+        return (usuario.cpf for usuario in self._usuarios.values())
+
+    def existentes(self, cpfs):
+        return {cpf for cpf in cpfs if texto_cpf(cpf) in self._usuarios}
+
+    def __len__(self):
+        return len(self._usuarios)
+
+    def papel(self, cpf):
+        usuario = self._usuarios.get(texto_cpf(cpf))
+        return None if usuario is None else usuario.PAPEL
+
+    def quantidade(self, papel):
+        return len(self._por_papel.get(papel, ()))
+
+    def do_papel(self, papel):
+        return list(self._por_papel.get(papel, {}).values())
+
+class Login:
+    def __init__(self, usuarios):
+        self._usuarios = usuarios
+
+    @instrumentar
+    def autenticar(self, cpf):
+        return self._usuarios.get(cpf)
+
+class Cadastrar:
+    def __init__(self, armazenamento=None):
+        self._armazenamento = armazenamento
+        if armazenamento is None:
+            self._usuarios = UsuariosCadastrados()
+        else:
+            # Importado aqui para que o uso em memória não carregue o sqlite3.
+            from .armazenamento import UsuariosPersistentes
+            self._usuarios = UsuariosPersistentes(armazenamento)
+
+    @property
+    def usuarios(self):
+        return self._usuarios
+
+    @instrumentar
+    def cadastrar_barbeiro(self, nome, cpf, salario):
+        cpf = validar_cpf(cpf)
+        barbeiro = Barbeiro(nome, cpf, salario)
+        if self._usuarios.setdefault(cpf, barbeiro) is not barbeiro:
+            raise ValueError("CPF já cadastrado.")
+
+    @instrumentar
+    def cadastrar_cliente(self, nome, cpf, corte_desejado, valor, dia, horario_desejado):
+        cpf = validar_cpf(cpf)
+        cliente = Cliente(nome, cpf, corte_desejado, valor, dia, horario_desejado)
+        if self._usuarios.setdefault(cpf, cliente) is not cliente:
+            raise ValueError("CPF já cadastrado.")
+
+    @instrumentar
+    def cadastrar_visitante(self, nome, cpf):
+        cpf = validar_cpf(cpf)
+        visitante = Visitante(nome, cpf)
+        if self._usuarios.setdefault(cpf, visitante) is not visitante:
+            raise ValueError("CPF já cadastrado.")
+
+    def observar_remocao(self, observador):
+        # observador(cpf) é chamado sempre que um usuário é removido ou substituído,
+        # por aqui ou direto em usuarios (ex.: para derrubar sessões).
+        self._usuarios.observar(observador)
+
+    @instrumentar
+    def remover_usuario(self, cpf):
+        try:
+            del self._usuarios[cpf]
+        except KeyError:
+            raise ValueError("Usuário não encontrado.") from None
+
+    @instrumentar
+    def cpfs_cadastrados(self, cpfs):
+        # Verificação em lote: uma consulta por bloco quando há armazenamento.
+        return self._usuarios.existentes(cpfs)
+
+    @instrumentar
+    def existe_barbeiro_cadastrado(self):
+        return self._usuarios.quantidade(Barbeiro.PAPEL) > 0
+
+    def papel(self, cpf):
+        # "barbeiro", "cliente", "visitante" ou None se o CPF não está cadastrado.
+        return self._usuarios.papel(cpf)
+
+    def quantidade(self, papel):
+        return self._usuarios.quantidade(papel)
+
+    def barbeiros(self):
+        return self._usuarios.do_papel(Barbeiro.PAPEL)
+
+    def clientes(self):
+        return self._usuarios.do_papel(Cliente.PAPEL)
+
+    def visitantes(self):
+        return self._usuarios.do_papel(Visitante.PAPEL)
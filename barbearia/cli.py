@@ -0,0 +1,419 @@
+import os
+
+from . import metricas
+from .armazenamento import ArmazenamentoSQLite
+from .barbearia import Barbearia, carregar_barbearia
+from .cadastro import Cadastrar
+from .faturamento import CalcularSalarioBarbeiro
+from .menu import Menu, clear_screen, pause
+from .modelos import Agendamento, Barbeiro, Cliente
+from .permissoes import Permissao, autorizado
+from .sessoes import Sessoes
+
+# Desenvolvido por Daniel Rodrigues de Sousa
+
+def diagnostico(captura):
+    arquivo_metricas = os.environ.get("BARBEARIA_METRICAS_ARQUIVO", "metricas.prom")
+    while True:
+        clear_screen()
+        print("\n===== 🩺 DIAGNÓSTICO 🩺 =====\n")
+        print(f"Métricas: {'ligadas' if metricas.ativas() else 'desligadas'}")
+        print(f"Captura de perfil: {'em andamento' if captura.ativa else 'parada'}\n")
+        print("1️⃣  - Ligar/Desligar Métricas")
+        print("2️⃣  - Ver Operações Medidas")
+        print(f"3️⃣  - Gravar Métricas em {arquivo_metricas}")
+        print("4️⃣  - Iniciar/Parar Captura de Perfil (cProfile + tracemalloc)")
+        print("5️⃣  - Voltar")
+        opcao = input("\nEscolha uma opção: ")
+
+        if opcao == '1':
+            if metricas.ativas():
+                metricas.desativar()
+            else:
+                metricas.ativar()
+        elif opcao == '2':
+            linhas = metricas.resumo()
+            if not linhas:
+                print("Nenhuma operação medida ainda.")
+            for nome, chamadas, erros, p50, p99, media in linhas:
+                print(f"{nome}: {chamadas} chamadas, {erros} erros, média {media * 1e6:.0f} µs, p50 ≤ {p50 * 1e6:g} µs, p99 ≤ {p99 * 1e6:g} µs")
+            pause()
+        elif opcao == '3':
+            metricas.gravar_prometheus(arquivo_metricas)
+            print(f"Métricas gravadas em {arquivo_metricas}.")
+            pause()
+        elif opcao == '4':
+            if captura.ativa:
+                print(captura.parar("perfil.prof"))
+                print("Perfil gravado em perfil.prof.")
+            else:
+                captura.iniciar()
+                print("Captura iniciada: use o sistema e volte aqui para pará-la.")
+            pause()
+        elif opcao == '5':
+            break
+        else:
+            print("Opção inválida.")
+            pause()
+
+def main():
+    armazenamento = ArmazenamentoSQLite(os.environ.get("BARBEARIA_DB", "barbearia.db"))
+    menu = Menu()
+    cadastrar = Cadastrar(armazenamento)
+    sessoes = Sessoes(cadastrar)
+    barbearia = carregar_barbearia(armazenamento, cadastrar)
+    captura = metricas.Captura()
+
+    while True:
+        armazenamento.confirmar()  # Grava em uma única transação tudo o que a ação anterior alterou
+        clear_screen()
+        print("=" * 45)
+        print("          💈 MENU PRINCIPAL 💈          ")
+        print("=" * 45)
+        print("\n1️⃣  - Cadastrar Barbeiro ✂️")
+        print("2️⃣  - Cadastrar Cliente 👤")
+        print("3️⃣  - Fazer Login 🔑")
+        print("4️⃣  - Sair 🚪")
+        print("=" * 45)
+        opcao = input("\nEscolha uma opção: ")
+
+        if opcao == '1':
+            clear_screen()
+            print("\n===== ✂️ CADASTRAR BARBEIRO ✂️ =====\n")
+            nome = input("Nome: ")
+            cpf = input("CPF: ")
+            try:
+                salario = float(input("Salário: "))
+            except ValueError:
+                print("Entrada inválida para salário. Por favor, insira um número.")
+                pause()
+                continue
+            try:
+                cadastrar.cadastrar_barbeiro(nome, cpf, salario)
+            except ValueError as e:
+                print(e)
+                pause()
+                continue
+            barbeiro = cadastrar.usuarios[cpf]  # Captura a referência do barbeiro
+            if barbearia is None:
+                barbearia = Barbearia(barbeiro, armazenamento, cadastrar)
+            else:
+                barbearia.adicionar_barbeiro(barbeiro)
+            menu.adicionar_horarios_barbeiro(barbeiro, barbearia)
+            print(f"Barbeiro {nome} cadastrado com sucesso!")
+            pause()
+
+        elif opcao == '2':
+            clear_screen()
+            print("\n===== 👤 CADASTRAR CLIENTE 👤 =====\n")
+            if not cadastrar.existe_barbeiro_cadastrado():
+                print("Por favor, cadastre um barbeiro antes de cadastrar um cliente.")
+                pause()
+                continue
+            nome = input("Nome: ")
+            cpf = input("CPF: ")
+            corte_desejado, valor = menu.menu_corte(barbearia.catalogo)
+            if valor == 0:
+                print("Opção inválida de corte.")
+                pause()
+                continue
+            dia = menu.menu_dia()
+            if dia == "Opção inválida":
+                print("Opção inválida de dia.")
+                pause()
+                continue
+            horarios_disponiveis = barbearia.horarios_para_corte(dia, corte_desejado)
+            if not horarios_disponiveis:
+                print("Não há horários disponíveis para o dia escolhido.")
+                pause()
+                continue
+            horario_desejado = menu.menu_horario(horarios_disponiveis)
+            if horario_desejado == "Opção inválida":
+                print("Opção inválida de horário.")
+                pause()
+                continue
+            try:
+                cadastrar.cadastrar_cliente(nome, cpf, corte_desejado, valor, dia, horario_desejado)
+                cliente = cadastrar.usuarios[cpf]
+                if barbearia.reservar_horario(cliente):
+                    print(f"Cliente {nome} cadastrado e horário reservado com sucesso!")
+                else:
+                    print(f"Falha ao reservar o horário para o cliente {nome}.")
+                pause()
+            except ValueError as e:
+                print(e)
+                pause()
+
+        elif opcao == '3':
+            clear_screen()
+            print("\n===== 🔑 LOGIN 🔑 =====\n")
+            cpf = input("CPF: ")
+            token = sessoes.entrar(cpf)
+            usuario = sessoes.usuario(token) if token else None
+            if not usuario:
+                print("CPF não encontrado.")
+                pause()
+                continue
+        
+            if not usuario.autenticavel:
+                print("Usuário não tem permissão.")
+                sessoes.sair(token)
+                pause()
+                continue
+        
+            # Daqui em diante a barbearia é acessada em nome do usuário logado.
+            sessao = barbearia.como(usuario)
+            papel = usuario.PAPEL
+            if papel == Barbeiro.PAPEL:
+                if usuario.autenticavel:
+                    while True:
+                        armazenamento.confirmar()
+                        if sessoes.usuario(token) is None:
+                            print("Sessão encerrada.")
+                            pause()
+                            break
+                        clear_screen()
+                        print(f"\nBem-vindo, Barbeiro {usuario.nome}! ✂️\n")
+                        print("1️⃣  - Listar Horários Disponíveis")
+                        print("2️⃣  - Reservar Horário")
+                        print("3️⃣  - Listar Clientes")
+                        print("4️⃣  - Editar Cliente")
+                        print("5️⃣  - Excluir Cliente")
+                        print("6️⃣  - Calcular Lucro")
+                        print("7️⃣  - Sair")
+                        print("8️⃣  - Diagnóstico")
+                        opcao_barbeiro = input("\nEscolha uma opção: ")
+
+                        if opcao_barbeiro == '1' and autorizado(usuario, Permissao.LISTAR_HORARIOS):
+                            dia = menu.menu_dia()
+                            if dia == "Opção inválida":
+                                print("Opção inválida de dia.")
+                                pause()
+                                continue
+                            horarios_disponiveis = sessao.listar_horarios_disponiveis(dia)
+                            if horarios_disponiveis:
+                                # Uma linha por página, sem montar a lista inteira numa string só.
+                                print(f"Horários disponíveis para {dia}:")
+                                for pagina in horarios_disponiveis.paginas(12):
+                                    print(", ".join(pagina))
+                            else:
+                                print("Não há horários disponíveis para o dia escolhido.")
+                            pause()
+
+                        elif opcao_barbeiro == '2' and autorizado(usuario, Permissao.RESERVAR_HORARIO):
+                            print("Esta funcionalidade está disponível apenas para clientes.")
+                            pause()
+
+                        elif opcao_barbeiro == '3' and autorizado(usuario, Permissao.LISTAR_CLIENTES):
+                            clientes = sessao.listar_clientes()
+                            if clientes:
+                                for cliente in clientes:
+                                    print(f"Nome: {cliente.nome}, CPF: {cliente.cpf}, Corte: {cliente.corte_desejado}, Dia: {cliente.dia}, Horário: {cliente.horario_desejado}, Valor: {cliente.valor}")
+                            else:
+                                print("Nenhum cliente cadastrado.")
+                            pause()
+
+                        elif opcao_barbeiro == '4' and autorizado(usuario, Permissao.EDITAR_CLIENTE):
+                            cpf_cliente = input("CPF do cliente a ser editado: ")
+                            clientes = sessao.buscar_clientes(cpf_cliente)
+
+                            if not clientes:
+                                print("Cliente não encontrado.")
+                                pause()
+                                continue
+
+                            if len(clientes) > 1:
+                                print("Cliente possui mais de um agendamento:")
+                                for idx, cliente in enumerate(clientes, 1):
+                                    print(f"{idx} - Corte: {cliente.corte_desejado}, Dia: {cliente.dia}, Horário: {cliente.horario_desejado}")
+                                try:
+                                    opcao_cliente = int(input("Escolha o número do agendamento a ser editado: "))
+                                    if 1 <= opcao_cliente <= len(clientes):
+                                        cliente_a_editar = clientes[opcao_cliente - 1]
+                                    else:
+                                        print("Opção inválida.")
+                                        pause()
+                                        continue
+                                except ValueError:
+                                    print("Entrada inválida.")
+                                    pause()
+                                    continue
+                            else:
+                                cliente_a_editar = clientes[0]
+
+                            while True:
+                                clear_screen()
+                                print("===== ✂️ EDITAR CLIENTE ✂️ =====")
+                                print("1️⃣  - Nome")
+                                print("2️⃣  - Corte Desejado")
+                                print("3️⃣  - Dia e Horário")
+                                print("4️⃣  - Cancelar")
+                                opcao_edicao = input("Escolha o que deseja editar: ")
+
+                                if opcao_edicao == '1':
+                                    novo_nome = input("Novo nome (deixe em branco para não alterar): ")
+                                    sessao.editar_agendamento(cliente_a_editar.id_agendamento, nome=novo_nome or cliente_a_editar.nome)
+                                    print("Nome atualizado com sucesso.")
+                                    pause()
+                                    break
+
+                                elif opcao_edicao == '2':
+                                    novo_corte, novo_valor = menu.menu_corte(barbearia.catalogo)
+                                    if novo_valor == 0:
+                                        print("Opção inválida de corte.")
+                                        pause()
+                                        continue
+                                    try:
+                                        sessao.editar_agendamento(cliente_a_editar.id_agendamento, corte_desejado=novo_corte, valor=novo_valor)
+                                    except ValueError as e:
+                                        print(e)
+                                        pause()
+                                        continue
+                                    print("Corte atualizado com sucesso.")
+                                    pause()
+                                    break
+
+                                elif opcao_edicao == '3':
+                                    novo_dia = menu.menu_dia()
+                                    if novo_dia == "Opção inválida":
+                                        print("Opção inválida de dia.")
+                                        pause()
+                                        continue
+                                    horarios_disponiveis = sessao.horarios_para_corte(novo_dia, cliente_a_editar.corte_desejado)
+                                    if not horarios_disponiveis:
+                                        print("Não há horários disponíveis para o dia escolhido.")
+                                        pause()
+                                        continue
+                                    novo_horario = menu.menu_horario(horarios_disponiveis)
+                                    if novo_horario == "Opção inválida":
+                                        print("Opção inválida de horário.")
+                                        pause()
+                                        continue
+                                    # Libera o horário antigo e ocupa o novo (de qualquer barbeiro livre) de uma vez
+                                    if not sessao.remarcar_agendamento(cliente_a_editar.id_agendamento, novo_dia, novo_horario):
+                                        print("Falha ao remarcar o horário.")
+                                        pause()
+                                        continue
+                                    print("Dia e horário atualizados com sucesso.")
+                                    pause()
+                                    break
+
+                                elif opcao_edicao == '4':
+                                    print("Edição cancelada.")
+                                    pause()
+                                    break
+
+                                else:
+                                    print("Opção inválida.")
+                                    pause()
+                    
+                        elif opcao_barbeiro == '5' and autorizado(usuario, Permissao.EXCLUIR_CLIENTE):
+                            cpf_cliente = input("CPF do cliente a ser excluído: ")
+                            try:
+                                sessao.excluir_cliente(cpf_cliente)
+                                print("Cliente excluído com sucesso.")
+                            except ValueError as e:
+                                print(e)
+                            pause()
+                        
+                        elif opcao_barbeiro == '6' and autorizado(usuario, Permissao.CALCULAR_LUCRO):
+                            lucro = CalcularSalarioBarbeiro(usuario, sessao.faturamento)
+                            print(f"Lucro total: {lucro.calcular_lucro()} reais")
+                            if lucro.verificar_lucro():
+                                print("Parabéns! Você atingiu o salário desejado.")
+                            else:
+                                print("Você ainda não atingiu o salário desejado.")
+                            pause()
+                        
+                        elif opcao_barbeiro == '7':
+                            sessoes.sair(token)
+                            break
+
+                        elif opcao_barbeiro == '8':
+                            diagnostico(captura)
+                else: 
+                    print("Usuário não tem permissão.")
+                    pause()
+
+
+            elif papel == Cliente.PAPEL:
+                if usuario.autenticavel:
+                    while True:
+                        armazenamento.confirmar()
+                        if sessoes.usuario(token) is None:
+                            print("Sessão encerrada.")
+                            pause()
+                            break
+                        clear_screen()
+                        print("1️⃣  - Listar Horários Disponíveis")
+                        print("2️⃣  - Reservar Horário")
+                        print("3️⃣  - Sair")
+                        opcao_cliente = input("\nEscolha uma opção: ")
+
+                        if opcao_cliente == '1' and autorizado(usuario, Permissao.LISTAR_HORARIOS):
+                            dia = menu.menu_dia()
+                            if dia == "Opção inválida":
+                                print("Opção inválida de dia.")
+                                pause()
+                                continue
+                            horarios_disponiveis = sessao.horarios_para_corte(dia, usuario.corte_desejado)
+                            if horarios_disponiveis:
+                                # Uma linha por página, sem montar a lista inteira numa string só.
+                                print(f"Horários disponíveis para {dia}:")
+                                for pagina in horarios_disponiveis.paginas(12):
+                                    print(", ".join(pagina))
+                            else:
+                                print("Não há horários disponíveis para o dia escolhido.")
+                            pause()
+
+                        elif opcao_cliente == '2' and autorizado(usuario, Permissao.RESERVAR_HORARIO):
+                            dia = menu.menu_dia()
+                            if dia == "Opção inválida":
+                                print("Opção inválida de dia.")
+                                pause()
+                                continue
+                            horarios_disponiveis = sessao.horarios_para_corte(dia, usuario.corte_desejado)
+                            if not horarios_disponiveis:
+                                print("Não há horários disponíveis para o dia escolhido.")
+                                pause()
+                                continue
+                            horario_desejado = menu.menu_horario(horarios_disponiveis)
+                            if horario_desejado == "Opção inválida":
+                                print("Opção inválida de horário.")
+                                pause()
+                                continue
+                            agendamento = Agendamento(usuario, usuario.corte_desejado, usuario.valor, dia, horario_desejado)
+                            if sessao.reservar_horario(agendamento):
+                                print("Horário reservado com sucesso.")
+                            else:
+                                print("Falha ao reservar o horário.")
+                                sugestoes = sessao.horarios_mais_proximos(dia, horario_desejado, corte=usuario.corte_desejado)
+                                if sugestoes:
+                                    print("Horários livres mais próximos: " + ", ".join(f"{outro_dia} {outro_horario}" for outro_dia, outro_horario, _ in sugestoes))
+                                if input("Entrar na lista de espera deste horário? (s/n): ").strip().lower() == "s":
+                                    pedido = sessao.entrar_na_espera(agendamento)
+                                    if pedido.ativo:
+                                        print(f"Você está na lista de espera (pedido {pedido.id_pedido}).")
+                                    else:
+                                        print("Horário reservado com sucesso.")
+                            pause()
+
+                        elif opcao_cliente == '3':
+                            sessoes.sair(token)
+                            break
+
+                        else:
+                            print("Opção inválida.")
+                            pause()
+                else:
+                    print("Usuário não tem permissão.")
+
+        elif opcao == '4':
+            print("Saindo... Até a próxima! 👋")
+            armazenamento.fechar()
+
+            break
+
+        else:
+            print("Opção inválida.")
+            pause()
@@ -0,0 +1,130 @@
+from operator import mul
+
+# Normalização e validação de CPF, e a chave usada nos índices.
+# "123.456.789-09", " 12345678909 " e 12345678909 são o mesmo CPF: o texto
+# canônico "12345678909" é o que vai no banco, nos usuários e como chave dos
+# índices. A normalização acontece uma vez, na entrada; o mesmo objeto str segue
+# daí em diante (com o hash já em cache), e texto_cpf devolve o texto canônico
+# como está, sem refazer nada. Identificadores que não têm forma de CPF (ids
+# sintéticos, dados antigos) passam como estão, para não quebrar quem já os usa;
+# quem exige CPF de verdade chama validar_cpf.
+
+_PONTUACAO = str.maketrans("", "", ".- ")
+_PESOS_PRIMEIRO = tuple(range(10, 1, -1))
+_PESOS_SEGUNDO = tuple(range(11, 1, -1))
+_SOMA_PRIMEIRO = sum(_PESOS_PRIMEIRO)
+_SOMA_SEGUNDO = sum(_PESOS_SEGUNDO)
+# Abaixo disso o custo de montar os arrays não compensa o NumPy.
+LIMIAR_VETORIZADO = 2048
+
+class CPF(str):
+    # Texto canônico de um CPF cujos dígitos verificadores já foram conferidos
+    # (por validar_cpf ou completar_cpf): quem o recebe não precisa conferir de novo.
+    __slots__ = ()
+
+def _canonico(cpf):
+    return cpf.__class__ is CPF or (isinstance(cpf, str) and len(cpf) == 11 and cpf.isascii() and cpf.isdigit())
+
+def _digitos(cpf):
+    # Os 11 dígitos como str, ou None se não tem forma de CPF.
+    if isinstance(cpf, int):
+        return f"{cpf:011d}" if 0 <= cpf < 10 ** 11 else None
+    if not isinstance(cpf, str) or len(cpf) < 11:
+        return None
+    if _canonico(cpf):
+        return cpf
+    digitos = cpf.translate(_PONTUACAO)
+    if len(digitos) == 11 and digitos.isascii() and digitos.isdigit():
+        return digitos
+    return None
+
+def _verificador(digitos, pesos):
+    # Soma ponderada direto sobre os códigos ASCII (cada dígito vale o código - 48).
+    codigos = digitos.encode("ascii")
+    soma = sum(map(mul, codigos, pesos)) - 48 * sum(pesos[:len(codigos)])
+    return soma * 10 % 11 % 10
+
+def _confere(digitos):
+    if digitos == digitos[0] * 11:
+        return False
+    codigos = digitos.encode("ascii")
+    primeiro = (sum(map(mul, codigos, _PESOS_PRIMEIRO)) - 48 * _SOMA_PRIMEIRO) * 10 % 11 % 10
+    segundo = (sum(map(mul, codigos, _PESOS_SEGUNDO)) - 48 * _SOMA_SEGUNDO) * 10 % 11 % 10
+    return primeiro == codigos[9] - 48 and segundo == codigos[10] - 48
+
+def normalizar_cpf(cpf):
+    digitos = _digitos(cpf)
+    if digitos is None:
+        raise ValueError("CPF inválido.")
+    return digitos
+
+def cpf_valido(cpf):
+    digitos = _digitos(cpf)
+    return digitos is not None and _confere(digitos)
+
+def validar_cpf(cpf):
+    # Texto canônico de um CPF com dígitos verificadores corretos.
+    if cpf.__class__ is CPF:
+        return cpf
+    digitos = _digitos(cpf)
+    if digitos is None or not _confere(digitos):
+        raise ValueError("CPF inválido.")
+    return CPF(digitos)
+
+def texto_cpf(cpf):
+    # Forma gravada no banco, guardada nos usuários e usada como chave dos índices.
+    # Texto canônico e ids curtos demais para serem CPF voltam como estão, sem cópia.
+    if cpf.__class__ is CPF:
+        return cpf
+    if cpf.__class__ is str and (len(cpf) < 11 or len(cpf) == 11 and cpf.isascii() and cpf.isdigit()):
+        return cpf
+    digitos = _digitos(cpf)
+    return cpf if digitos is None else digitos
+
+def completar_cpf(base):
+    # Os 9 primeiros dígitos mais os dois verificadores: CPFs válidos para demonstrações e benchmarks.
+    if len(base) != 9 or not (base.isascii() and base.isdigit()):
+        raise ValueError("CPF inválido.")
+    primeiro = _verificador(base, _PESOS_PRIMEIRO)
+    return CPF(f"{base}{primeiro}{_verificador(f'{base}{primeiro}', _PESOS_SEGUNDO)}")
+
+def formatar_cpf(cpf):
+    digitos = normalizar_cpf(cpf)
+    return f"{digitos[:3]}.{digitos[3:6]}.{digitos[6:9]}-{digitos[9:]}"
+
+def validar_lote(cpfs):
+    # Chave de cada CPF válido, ou None para os inválidos, na ordem recebida. Com
+    # NumPy instalado e lotes grandes, os dígitos verificadores de todos são
+    # conferidos de uma vez sobre uma matriz N x 11.
+    cpfs = list(cpfs)
+    if len(cpfs) >= LIMIAR_VETORIZADO:
+        numpy = _numpy()
+        if numpy is not None:
+            return _validar_lote_numpy(numpy, cpfs)
+    chaves = []
+    for cpf in cpfs:
+        digitos = _digitos(cpf)
+        chaves.append(int(digitos) if digitos is not None and _confere(digitos) else None)
+    return chaves
+
+def _numpy():
+    # Importado só no primeiro lote grande: no topo do módulo pesaria em todo "import barbearia".
+    try:
+        import numpy
+    except ImportError:  # O NumPy é opcional: sem ele o lote é conferido em Python puro.
+        return None
+    return numpy
+
+def _validar_lote_numpy(numpy, cpfs):
+    textos = [_digitos(cpf) for cpf in cpfs]
+    bloco = "".join(digitos or "00000000000" for digitos in textos).encode("ascii")
+    matriz = numpy.frombuffer(bloco, dtype=numpy.uint8).reshape(-1, 11).astype(numpy.int64) - 48
+    primeiro = matriz[:, :9] @ numpy.arange(10, 1, -1) * 10 % 11 % 10
+    segundo = matriz[:, :10] @ numpy.arange(11, 1, -1) * 10 % 11 % 10
+    validos = (
+        numpy.array([digitos is not None for digitos in textos])
+        & (primeiro == matriz[:, 9]) & (segundo == matriz[:, 10])
+        & ~(matriz == matriz[:, :1]).all(axis=1)
+    )
+    chaves = matriz @ 10 ** numpy.arange(10, -1, -1, dtype=numpy.int64)
+    return [chave if valido else None for chave, valido in zip(chaves.tolist(), validos.tolist())]
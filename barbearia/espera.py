@@ -0,0 +1,105 @@
+import heapq
+import itertools
+import threading
+
+from .agenda import horario_para_minutos
+
+# Lista de espera por horário. Os pedidos ficam num heap por (dia, minuto,
+# corte), em ordem de chegada; quando um slot é liberado, o melhor pedido é o
+# mais antigo entre os heaps daquele slot cujo corte o barbeiro faz, então
+# atender custa O(log n) e não uma varredura de todos os pedidos.
+
+class PedidoEspera:
+    __slots__ = ("_id_pedido", "_agendamento", "_ativo")
+
+    def __init__(self, id_pedido, agendamento):
+        self._id_pedido = id_pedido
+        self._agendamento = agendamento
+        self._ativo = True
+
+    @property
+    def id_pedido(self):
+        return self._id_pedido
+
+    @property
+    def agendamento(self):
+        return self._agendamento
+
+    @property
+    def ativo(self):
+        return self._ativo
+
+class ListaEspera:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        # (dia, minuto) -> {corte: heap de (id, pedido)}
+        self._por_slot = {}
+        self._pedidos = {}
+        self._trava = threading.Lock()
+
+    def __len__(self):
+        return len(self._pedidos)
+
+    def __iter__(self):
+        with self._trava:
+            return iter(list(self._pedidos.values()))
+
+    def adicionar(self, agendamento):
+        chave = (agendamento.dia, horario_para_minutos(agendamento.horario_desejado))
+        with self._trava:
+            pedido = PedidoEspera(next(self._ids), agendamento)
+            heap = self._por_slot.setdefault(chave, {}).setdefault(agendamento.corte_desejado, [])
+            heapq.heappush(heap, (pedido.id_pedido, pedido))
+            self._pedidos[pedido.id_pedido] = pedido
+        return pedido
+
+    def obter(self, id_pedido):
+        # O pedido ainda na fila com esse id, ou None.
+        with self._trava:
+            return self._pedidos.get(id_pedido)
+
+    def remover(self, id_pedido):
+        # O pedido sai do índice por id na hora; do heap, só quando chegar ao topo.
+        with self._trava:
+            pedido = self._pedidos.pop(id_pedido, None)
+            if pedido is None:
+                raise ValueError("Pedido não encontrado.")
+            pedido._ativo = False
+
+    def _topo(self, heap):
+        while heap and not heap[0][1].ativo:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def retirar(self, dia, horario, faz_corte=None):
+        # O pedido mais antigo para o slot cujo corte é aceito por faz_corte(corte), ou None.
+        chave = (dia, horario_para_minutos(horario))
+        with self._trava:
+            por_corte = self._por_slot.get(chave)
+            if not por_corte:
+                return None
+            melhor = None
+            for corte, heap in list(por_corte.items()):
+                topo = self._topo(heap)
+                if topo is None:
+                    del por_corte[corte]
+                elif (faz_corte is None or faz_corte(corte)) and (melhor is None or topo < melhor[1]):
+                    melhor = (heap, topo)
+            if not por_corte:
+                del self._por_slot[chave]
+            if melhor is None:
+                return None
+            heap, (_, pedido) = melhor
+            heapq.heappop(heap)
+            pedido._ativo = False
+            del self._pedidos[pedido.id_pedido]
+            return pedido
+
+    def devolver(self, pedido):
+        # Recoloca um pedido retirado que não pôde ser atendido, mantendo a posição original.
+        chave = (pedido.agendamento.dia, horario_para_minutos(pedido.agendamento.horario_desejado))
+        with self._trava:
+            pedido._ativo = True
+            heap = self._por_slot.setdefault(chave, {}).setdefault(pedido.agendamento.corte_desejado, [])
+            heapq.heappush(heap, (pedido.id_pedido, pedido))
+            self._pedidos[pedido.id_pedido] = pedido
@@ -0,0 +1,247 @@
+import json
+import os
+import threading
+import time
+
+from .agendamentos import RepositorioAgendamentos
+from .modelos import Agendamento, Barbeiro, Cliente
+
+# Log de eventos só de acréscimo (JSONL, uma linha por mutação da Barbearia).
+# Os eventos ficam num buffer e vão para o disco em lote, com um único fsync.
+# De tempos em tempos a Barbearia grava um snapshot do estado inteiro e o log
+# é cortado, então a recuperação lê no máximo um snapshot e um log curto.
+#
+# Tipos de evento (chave "t"), todos com o número de sequência "n":
+#   barbeiro  - barbeiro entrou na barbearia (cpf, nome, salario, duracao_slot, cortes)
+#   mascara   - horários livres de um barbeiro num dia (cpf, dia, mascara em hexa)
+#   agendar   - novo agendamento (id e os dados do agendamento e do cliente)
+#   editar    - campos alterados de um agendamento (valores finais, não diferenças)
+#   remover   - agendamento excluído (id)
+# Todos são idempotentes: aplicar de novo um evento já refletido no snapshot
+# não muda nada.
+
+class RegistroEventos:
+    LOTE = 256
+    INTERVALO_FSYNC = 0.05
+    EVENTOS_POR_SNAPSHOT = 10000
+
+    def __init__(self, caminho, lote=LOTE, intervalo_fsync=INTERVALO_FSYNC, eventos_por_snapshot=EVENTOS_POR_SNAPSHOT):
+        self._caminho = caminho
+        self._caminho_snapshot = caminho + ".snapshot"
+        self._lote = lote
+        self._intervalo_fsync = intervalo_fsync
+        self._eventos_por_snapshot = eventos_por_snapshot
+        self._trava = threading.Lock()
+        self._pendentes = []
+        self._ultimo_fsync = time.monotonic()
+        self._sequencia = 0
+        self._desde_snapshot = 0
+        _cortar_linha_incompleta(caminho)
+        self._arquivo = open(caminho, "a", encoding="utf-8")
+
+    @property
+    def caminho(self):
+        return self._caminho
+
+    @property
+    def sequencia(self):
+        return self._sequencia
+
+    def vazio(self):
+        return not os.path.exists(self._caminho_snapshot) and os.path.getsize(self._caminho) == 0 and not self._pendentes
+
+    def gravar(self, evento):
+        with self._trava:
+            self._sequencia += 1
+            self._desde_snapshot += 1
+            evento["n"] = self._sequencia
+            self._pendentes.append(json.dumps(evento, ensure_ascii=False, separators=(",", ":")))
+            if len(self._pendentes) >= self._lote or time.monotonic() - self._ultimo_fsync >= self._intervalo_fsync:
+                self._descarregar()
+
+    def descarregar(self):
+        with self._trava:
+            self._descarregar()
+
+    def _descarregar(self):
+        if self._pendentes:
+            self._arquivo.write("\n".join(self._pendentes))
+            self._arquivo.write("\n")
+            self._pendentes.clear()
+            self._arquivo.flush()
+            os.fsync(self._arquivo.fileno())
+        self._ultimo_fsync = time.monotonic()
+
+    def barbeiro_adicionado(self, barbeiro):
+        self.gravar(evento_barbeiro(barbeiro))
+
+    def mascara_alterada(self, cpf, dia, mascara):
+        self.gravar({"t": "mascara", "cpf": cpf, "dia": dia, "mascara": format(mascara, "x")})
+
+    def agendamento_criado(self, agendamento):
+        self.gravar(evento_agendar(agendamento))
+
+    def agendamento_editado(self, id_agendamento, campos):
+        self.gravar({"t": "editar", "id": id_agendamento, "campos": campos})
+
+    def agendamento_removido(self, id_agendamento):
+        self.gravar({"t": "remover", "id": id_agendamento})
+
+    def precisa_snapshot(self, tamanho_estado=0):
+        # O intervalo cresce com o estado, para que o custo dos snapshots por
+        # evento continue constante; o log a reaplicar nunca passa desse tamanho.
+        return self._desde_snapshot >= max(self._eventos_por_snapshot, tamanho_estado)
+
+    def salvar_snapshot(self, barbeiros, agendamentos):
+        # A sequência e a posição no log são lidas antes do estado: um evento
+        # concorrente pode já estar no estado, mas como fica também no trecho
+        # do log que é mantido e é idempotente, nada se perde.
+        with self._trava:
+            self._descarregar()
+            sequencia = self._sequencia
+            posicao = os.fstat(self._arquivo.fileno()).st_size
+        estado = estado_barbearia(barbeiros, agendamentos)
+        estado["n"] = sequencia
+        with self._trava:
+            self._descarregar()
+            temporario = self._caminho_snapshot + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(estado, arquivo, ensure_ascii=False, separators=(",", ":"))
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+            os.replace(temporario, self._caminho_snapshot)
+            # Só os eventos depois do snapshot continuam no log.
+            self._arquivo.close()
+            temporario = self._caminho + ".tmp"
+            with open(self._caminho, "rb") as origem, open(temporario, "wb") as destino:
+                origem.seek(posicao)
+                destino.write(origem.read())
+                destino.flush()
+                os.fsync(destino.fileno())
+            os.replace(temporario, self._caminho)
+            self._arquivo = open(self._caminho, "a", encoding="utf-8")
+            self._desde_snapshot = self._sequencia - sequencia
+
+    def ler(self):
+        # (snapshot ou None, eventos posteriores a ele em ordem)
+        with self._trava:
+            self._descarregar()
+            snapshot = None
+            if os.path.exists(self._caminho_snapshot):
+                with open(self._caminho_snapshot, encoding="utf-8") as arquivo:
+                    snapshot = json.load(arquivo)
+            inicio = snapshot["n"] if snapshot else 0
+            eventos = []
+            for linha in _linhas_log(self._caminho):
+                evento = json.loads(linha)
+                if evento["n"] > inicio:
+                    eventos.append(evento)
+            self._sequencia = max(self._sequencia, eventos[-1]["n"] if eventos else inicio)
+            self._desde_snapshot = len(eventos)
+            return snapshot, eventos
+
+    def fechar(self):
+        with self._trava:
+            self._descarregar()
+            self._arquivo.close()
+
+def _cortar_linha_incompleta(caminho):
+    # Após uma queda no meio da escrita, o resto da última linha é descartado
+    # para que o próximo evento não seja emendado nele.
+    if not os.path.exists(caminho):
+        return
+    with open(caminho, "rb+") as arquivo:
+        tamanho = arquivo.seek(0, os.SEEK_END)
+        if tamanho == 0:
+            return
+        arquivo.seek(tamanho - 1)
+        if arquivo.read(1) == b"\n":
+            return
+        arquivo.seek(0)
+        conteudo = arquivo.read()
+        arquivo.truncate(conteudo.rfind(b"\n") + 1)
+
+def _linhas_log(caminho):
+    # Uma linha incompleta no fim (queda no meio da escrita) é ignorada.
+    with open(caminho, encoding="utf-8") as arquivo:
+        for linha in arquivo:
+            if linha.endswith("\n"):
+                yield linha[:-1]
+
+def evento_barbeiro(barbeiro):
+    calendario = barbeiro.calendario
+    return {
+        "t": "barbeiro", "cpf": barbeiro.cpf, "nome": barbeiro.nome, "salario": barbeiro.salario,
+        "duracao_slot": barbeiro.duracao_slot, "cortes": None if barbeiro.cortes is None else sorted(barbeiro.cortes),
+        "mascaras": {dia: format(calendario.mascara(dia), "x") for dia in calendario.dias},
+    }
+
+def evento_agendar(agendamento):
+    cliente = agendamento.cliente
+    return {
+        "t": "agendar", "id": agendamento.id_agendamento, "cpf_barbeiro": agendamento.cpf_barbeiro,
+        "corte_desejado": agendamento.corte_desejado, "valor": agendamento.valor,
+        "dia": agendamento.dia, "horario_desejado": agendamento.horario_desejado,
+        "cliente": [cliente.nome, cliente.cpf, cliente.corte_desejado, cliente.valor, cliente.dia, cliente.horario_desejado],
+    }
+
+def estado_barbearia(barbeiros, agendamentos):
+    return {
+        "barbeiros": [evento_barbeiro(barbeiro) for barbeiro in barbeiros],
+        "agendamentos": [evento_agendar(agendamento) for agendamento in agendamentos],
+        "proximo_id": agendamentos.proximo_id,
+    }
+
+class Reconstrucao:
+    # Estado montado a partir de snapshot + eventos, antes de virar Barbearia.
+    def __init__(self):
+        self.barbeiros = {}
+        self.clientes = {}
+        self.agendamentos = RepositorioAgendamentos()
+        # Só a última máscara de cada (barbeiro, dia) importa; são aplicadas no fim.
+        self._mascaras = {}
+
+    def aplicar(self, evento):
+        tipo = evento["t"]
+        if tipo == "mascara":
+            self._mascaras[evento["cpf"], evento["dia"]] = evento["mascara"]
+        elif tipo == "agendar":
+            if evento["id"] in self.agendamentos:
+                return
+            dados = evento["cliente"]
+            cliente = self.clientes.get(dados[1])
+            if cliente is None:
+                cliente = self.clientes[dados[1]] = Cliente(*dados)
+            agendamento = Agendamento(
+                cliente, evento["corte_desejado"], evento["valor"], evento["dia"],
+                evento["horario_desejado"], evento["cpf_barbeiro"],
+            )
+            self.agendamentos.adicionar(agendamento, evento["id"])
+        elif tipo == "editar":
+            if evento["id"] in self.agendamentos:
+                self.agendamentos.atualizar(evento["id"], **evento["campos"])
+        elif tipo == "remover":
+            if evento["id"] in self.agendamentos:
+                self.agendamentos.remover(evento["id"])
+        elif tipo == "barbeiro":
+            barbeiro = self.barbeiros.get(evento["cpf"])
+            if barbeiro is None:
+                barbeiro = self.barbeiros[evento["cpf"]] = Barbeiro(
+                    evento["nome"], evento["cpf"], evento["salario"], evento["duracao_slot"], evento["cortes"],
+                )
+            for dia, mascara in evento["mascaras"].items():
+                self._mascaras[evento["cpf"], dia] = mascara
+        else:
+            raise ValueError(f"Evento desconhecido: {tipo}.")
+
+    def carregar_snapshot(self, snapshot):
+        for dados in snapshot["barbeiros"]:
+            self.aplicar(dados)
+        for dados in snapshot["agendamentos"]:
+            self.aplicar(dados)
+        self.agendamentos.avancar_id(snapshot["proximo_id"])
+
+    def concluir(self):
+        for (cpf, dia), mascara in self._mascaras.items():
+            self.barbeiros[cpf].calendario.definir_mascara(dia, int(mascara, 16))
+        self._mascaras.clear()
@@ -0,0 +1,62 @@
+class RegistroFaturamento:
+    # Faturamento acumulado, atualizado a cada reserva, edição e exclusão.
+    def __init__(self):
+        self._total = 0
+        self._por_dia = {}
+        self._por_corte = {}
+        self._por_barbeiro = {}
+
+    @classmethod
+    def a_partir_de(cls, clientes, cpf_barbeiro):
+        faturamento = cls()
+        for cliente in clientes:
+            faturamento.registrar(cliente, cpf_barbeiro)
+        return faturamento
+
+    def _lancar(self, cliente, cpf_barbeiro, valor):
+        self._total += valor
+        dia, corte = cliente.dia, cliente.corte_desejado
+        self._por_dia[dia] = self._por_dia.get(dia, 0) + valor
+        self._por_corte[corte] = self._por_corte.get(corte, 0) + valor
+        self._por_barbeiro[cpf_barbeiro] = self._por_barbeiro.get(cpf_barbeiro, 0) + valor
+
+    def registrar(self, cliente, cpf_barbeiro=None):
+        self._lancar(cliente, cpf_barbeiro or cliente.cpf_barbeiro, cliente.valor)
+
+    def estornar(self, cliente, cpf_barbeiro=None):
+        self._lancar(cliente, cpf_barbeiro or cliente.cpf_barbeiro, -cliente.valor)
+
+    @property
+    def total(self):
+        return self._total
+
+    def total_dia(self, dia):
+        return self._por_dia.get(dia, 0)
+
+    def total_corte(self, corte):
+        return self._por_corte.get(corte, 0)
+
+    def total_barbeiro(self, cpf_barbeiro):
+        return self._por_barbeiro.get(cpf_barbeiro, 0)
+
+    def por_dia(self):
+        return dict(self._por_dia)
+
+    def por_corte(self):
+        return dict(self._por_corte)
+
+    def por_barbeiro(self):
+        return dict(self._por_barbeiro)
+
+class CalcularSalarioBarbeiro:
+    def __init__(self, barbeiro, faturamento):
+        self._barbeiro = barbeiro
+        if not isinstance(faturamento, RegistroFaturamento):
+            faturamento = RegistroFaturamento.a_partir_de(faturamento, barbeiro.cpf)
+        self._faturamento = faturamento
+
+    def calcular_lucro(self):
+        return self._faturamento.total_barbeiro(self._barbeiro.cpf)
+
+    def verificar_lucro(self):
+        return self.calcular_lucro() > self._barbeiro.salario
@@ -0,0 +1,222 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from itertools import islice
+
+from .agenda import DIAS_SEMANA, horario_para_minutos
+from .cpf import CPF, validar_lote
+from .modelos import Agendamento, Cliente
+
+# Carga e exportação em massa de clientes (com seus agendamentos) e de
+# horários de barbeiros, em CSV ou JSONL. Tudo é lido e escrito em fluxo,
+# de lote em lote, então a memória não cresce com o tamanho do arquivo.
+
+CAMPOS_CLIENTES = ("nome", "cpf", "corte_desejado", "valor", "dia", "horario_desejado", "cpf_barbeiro")
+CAMPOS_HORARIOS = ("cpf_barbeiro", "dia", "inicio", "fim")
+TAMANHO_LOTE = 1000
+
+class ResumoImportacao:
+    def __init__(self):
+        self.importados = 0
+        self.rejeitados = 0
+
+    def __repr__(self):
+        return f"ResumoImportacao(importados={self.importados}, rejeitados={self.rejeitados})"
+
+def formato_do_arquivo(caminho):
+    extensao = os.path.splitext(caminho)[1].lower()
+    if extensao == ".csv":
+        return "csv"
+    if extensao in (".jsonl", ".ndjson"):
+        return "jsonl"
+    raise ValueError("Formato não suportado; use .csv ou .jsonl.")
+
+def ler_csv(arquivo):
+    # A linha 1 é o cabeçalho; os registros começam na linha 2.
+    for numero, registro in enumerate(csv.DictReader(arquivo), 2):
+        yield numero, registro
+
+def ler_jsonl(arquivo):
+    for numero, linha in enumerate(arquivo, 1):
+        if not linha.strip():
+            continue
+        try:
+            registro = json.loads(linha)
+        except json.JSONDecodeError:
+            registro = None
+        yield numero, registro if isinstance(registro, dict) else None
+
+def ler_registros(arquivo, formato):
+    return ler_csv(arquivo) if formato == "csv" else ler_jsonl(arquivo)
+
+def escrever_registros(arquivo, formato, campos, registros):
+    if formato == "csv":
+        escritor = csv.DictWriter(arquivo, fieldnames=campos)
+        escritor.writeheader()
+        for registro in registros:
+            escritor.writerow(registro)
+    else:
+        for registro in registros:
+            arquivo.write(json.dumps(registro, ensure_ascii=False))
+            arquivo.write("\n")
+
+def _lotes(registros, tamanho):
+    registros = iter(registros)
+    while True:
+        lote = list(islice(registros, tamanho))
+        if not lote:
+            return
+        yield lote
+
+def _campo(registro, campo):
+    valor = registro.get(campo)
+    if valor is None or str(valor).strip() == "":
+        raise ValueError(f"Campo obrigatório ausente: {campo}.")
+    return str(valor).strip()
+
+def _validar_cliente(registro):
+    if registro is None:
+        raise ValueError("Registro mal formado.")
+    nome = _campo(registro, "nome")
+    cpf = _campo(registro, "cpf")
+    corte = _campo(registro, "corte_desejado")
+    texto_valor = _campo(registro, "valor")
+    try:
+        valor = float(texto_valor)
+    except ValueError:
+        raise ValueError("Valor inválido.") from None
+    dia = _campo(registro, "dia")
+    if dia not in DIAS_SEMANA:
+        raise ValueError("Dia inválido.")
+    horario = _campo(registro, "horario_desejado")
+    horario_para_minutos(horario)
+    cpf_barbeiro = (registro.get("cpf_barbeiro") or "").strip() or None
+    return nome, cpf, corte, int(valor) if valor.is_integer() else valor, dia, horario, cpf_barbeiro
+
+def importar_clientes(registros, cadastrar, barbearia=None, relatar=None, tamanho_lote=TAMANHO_LOTE, armazenamento=None):
+    # registros: pares (número da linha, dicionário). Cada linha inválida vai
+    # para relatar(numero, mensagem) e a carga continua.
+    resumo = ResumoImportacao()
+
+    def rejeitar(numero, mensagem):
+        resumo.rejeitados += 1
+        if relatar is not None:
+            relatar(numero, mensagem)
+
+    for lote in _lotes(registros, tamanho_lote):
+        formatados = []
+        for numero, registro in lote:
+            try:
+                formatados.append((numero, _validar_cliente(registro)))
+            except ValueError as erro:
+                rejeitar(numero, str(erro))
+        # Dígitos verificadores do lote inteiro de uma vez; o CPF segue na forma canônica, já conferido.
+        validos = []
+        for (numero, dados), chave in zip(formatados, validar_lote(dados[1] for _, dados in formatados)):
+            if chave is None:
+                rejeitar(numero, "CPF inválido.")
+                continue
+            validos.append((numero, (dados[0], CPF(f"{chave:011d}"), *dados[2:])))
+        ja_cadastrados = cadastrar.cpfs_cadastrados({dados[1] for _, dados in validos})
+        for numero, (nome, cpf, corte, valor, dia, horario, cpf_barbeiro) in validos:
+            novo = cpf not in ja_cadastrados
+            if novo:
+                cadastrar.cadastrar_cliente(nome, cpf, corte, valor, dia, horario)
+                ja_cadastrados.add(cpf)
+            elif barbearia is None:
+                rejeitar(numero, "CPF já cadastrado.")
+                continue
+            cliente = cadastrar.usuarios[cpf]
+            # Um CPF já cadastrado (no banco ou numa linha anterior) é mais um
+            # agendamento do mesmo cliente; barbeiro ou visitante não vira cliente.
+            if not isinstance(cliente, Cliente):
+                rejeitar(numero, "CPF já cadastrado.")
+                continue
+            if barbearia is not None:
+                if barbearia.agendar(Agendamento(cliente, corte, valor, dia, horario, cpf_barbeiro)) is None:
+                    if novo:
+                        cadastrar.remover_usuario(cpf)
+                        ja_cadastrados.discard(cpf)
+                    rejeitar(numero, "Horário indisponível.")
+                    continue
+            resumo.importados += 1
+        if armazenamento is not None:
+            armazenamento.confirmar()
+    return resumo
+
+def importar_horarios(registros, barbearia, relatar=None, armazenamento=None, tamanho_lote=TAMANHO_LOTE):
+    resumo = ResumoImportacao()
+    for lote in _lotes(registros, tamanho_lote):
+        for numero, registro in lote:
+            try:
+                if registro is None:
+                    raise ValueError("Registro mal formado.")
+                barbeiro = barbearia.obter_barbeiro(_campo(registro, "cpf_barbeiro"))
+                barbeiro.adicionar_intervalo_livre(_campo(registro, "dia"), _campo(registro, "inicio"), _campo(registro, "fim"))
+            except ValueError as erro:
+                resumo.rejeitados += 1
+                if relatar is not None:
+                    relatar(numero, str(erro))
+                continue
+            resumo.importados += 1
+        if armazenamento is not None:
+            armazenamento.confirmar()
+    return resumo
+
+def registros_clientes(barbearia):
+    for agendamento in barbearia.agendamentos:
+        yield {
+            "nome": agendamento.nome, "cpf": agendamento.cpf, "corte_desejado": agendamento.corte_desejado,
+            "valor": agendamento.valor, "dia": agendamento.dia, "horario_desejado": agendamento.horario_desejado,
+            "cpf_barbeiro": agendamento.cpf_barbeiro,
+        }
+
+def registros_horarios(barbearia):
+    # Um registro por trecho contínuo de horários livres, não por slot.
+    for barbeiro in barbearia.barbeiros:
+        for dia in barbeiro.calendario.dias:
+            for inicio, fim in barbeiro.calendario.intervalos(dia):
+                yield {"cpf_barbeiro": barbeiro.cpf, "dia": dia, "inicio": inicio, "fim": fim}
+
+def main():
+    parser = argparse.ArgumentParser(description="Importação e exportação em massa da barbearia.")
+    parser.add_argument("operacao", choices=("importar", "exportar"))
+    parser.add_argument("tipo", choices=("clientes", "horarios"))
+    parser.add_argument("arquivo", help="arquivo .csv ou .jsonl")
+    argumentos = parser.parse_args()
+
+    from .armazenamento import ArmazenamentoSQLite
+    from .barbearia import carregar_barbearia
+    from .cadastro import Cadastrar
+
+    formato = formato_do_arquivo(argumentos.arquivo)
+    armazenamento = ArmazenamentoSQLite(os.environ.get("BARBEARIA_DB", "barbearia.db"))
+    try:
+        cadastrar = Cadastrar(armazenamento)
+        barbearia = carregar_barbearia(armazenamento, cadastrar)
+        if barbearia is None and (argumentos.tipo == "horarios" or argumentos.operacao == "exportar"):
+            raise SystemExit("Nenhum barbeiro cadastrado no banco de dados.")
+        if argumentos.operacao == "exportar":
+            campos = CAMPOS_CLIENTES if argumentos.tipo == "clientes" else CAMPOS_HORARIOS
+            registros = registros_clientes(barbearia) if argumentos.tipo == "clientes" else registros_horarios(barbearia)
+            with open(argumentos.arquivo, "w", newline="", encoding="utf-8") as arquivo:
+                escrever_registros(arquivo, formato, campos, registros)
+            return
+
+        def relatar(numero, mensagem):
+            print(f"{argumentos.arquivo}:{numero}: {mensagem}", file=sys.stderr)
+
+        with open(argumentos.arquivo, newline="", encoding="utf-8") as arquivo:
+            registros = ler_registros(arquivo, formato)
+            if argumentos.tipo == "clientes":
+                resumo = importar_clientes(registros, cadastrar, barbearia, relatar, armazenamento=armazenamento)
+            else:
+                resumo = importar_horarios(registros, barbearia, relatar, armazenamento)
+        print(f"{resumo.importados} importados, {resumo.rejeitados} rejeitados.")
+    finally:
+        armazenamento.fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+from .agenda import DIAS_SEMANA
+from .recorrencia import ModeloDisponibilidade
+from .servicos import catalogo_padrao
+from .tela import Tela
+
+_tela = None
+
+def clear_screen():
+    # Começa um novo quadro; a Tela é instalada no primeiro uso.
+    global _tela
+    if _tela is None:
+        _tela = Tela.instalar()
+    _tela.novo_quadro()
+
+def pause():
+    input("\nPressione Enter para continuar...")
+
+class Menu:
+    @staticmethod
+    def adicionar_horarios_barbeiro(barbeiro, barbearia=None):
+        modelo = ModeloDisponibilidade(barbeiro.duracao_slot)
+        for dia in DIAS_SEMANA:
+            while True:
+                try:
+                    entrada = int(input(f"{dia} - Horário de entrada (0-23h): "))
+                    saida = int(input(f"{dia} - Horário de saída (0-23h): "))
+                    if 0 <= entrada <= 23 and 0 <= saida <= 23 and entrada <= saida:
+                        break
+                    else:
+                        print("Horário inválido. Por favor, insira um horário entre 0 e 23 e certifique-se de que a hora de entrada seja anterior ou igual à hora de saída.")
+                except ValueError:
+                    print("Entrada inválida. Por favor, insira um número.")
+            modelo.definir_horario(dia, f"{entrada}h", f"{saida + 1}h")
+        if barbearia is None:
+            barbeiro.definir_modelo(modelo)
+        else:
+            barbearia.definir_modelo(barbeiro.cpf, modelo)
+
+    @staticmethod
+    def menu_corte(catalogo=None):
+        if catalogo is None:
+            catalogo = catalogo_padrao()
+        servicos = list(catalogo.values())
+        clear_screen()
+        print("=" * 30)
+        print("   | ESCOLHA CORTE |")
+        print("=" * 30)
+        print("\nEscolha o tipo de corte:\n")
+        for idx, servico in enumerate(servicos, 1):
+            preco = f"{servico.preco:.2f}".replace(".", ",")
+            print(f"{idx} - {servico.nome:<10} | R$ {preco} | {servico.duracao} min")
+        print("=" * 30)
+        try:
+            opcao = int(input("Escolha uma opção: "))
+            if 1 <= opcao <= len(servicos):
+                return servicos[opcao - 1].nome, servicos[opcao - 1].preco
+            return ("Opção inválida", 0)
+        except ValueError:
+            return ("Opção inválida", 0)
+
+    @staticmethod
+    def menu_dia():
+        clear_screen()
+        print("=" * 30)
+        print("   📅 Escolha o Dia da Semana")
+        print("=" * 30)
+        print("\n1 - Segunda  | 🌞")
+        print("2 - Terça    | 🌞")
+        print("3 - Quarta   | 🌞")
+        print("4 - Quinta   | 🌞")
+        print("5 - Sexta    | 🌞")
+        print("6 - Sábado   | 🌟")
+        print("=" * 30)
+        try:
+            opcao = int(input("Escolha uma opção: "))
+            dias = {
+                1: "Segunda",
+                2: "Terça",
+                3: "Quarta",
+                4: "Quinta",
+                5: "Sexta",
+                6: "Sábado"
+            }
+            return dias.get(opcao, "Opção inválida")
+        except ValueError:
+            return "Opção inválida"
+
+    @staticmethod
+    def menu_hora(dia, barbeiro):
+        clear_screen()
+        horarios = barbeiro.horarios_livres.get(dia, [])
+        print(f"\nHorários disponíveis para {dia}: {', '.join(horarios)}")
+        horario = input("Escolha um horário: ")
+        if horario in horarios:
+            return horario
+        return "Horário inválido"
+
+    @staticmethod
+    def menu_principal():
+        clear_screen()
+        print("=" * 30)
+        print("  💈 Sistema de Agendamento de Barbearia 💈")
+        print("=" * 30)
+        print("\n1️⃣  - Login")
+        print("2️⃣  - Cadastrar")
+        print("0️⃣  - Sair")
+        print("=" * 30)
+        try:
+            return int(input("Escolha uma opção: "))
+        except ValueError:
+            return -1
+
+    @staticmethod
+    def menu_login():
+        clear_screen()
+        cpf = input("Digite seu CPF: ")
+        return cpf
+
+    @staticmethod
+    def menu_cadastrar():
+        print("=" * 30)
+        print("   🙍‍♂️ Escolha o Tipo de Usuário 🙍‍♀️")
+        print("=" * 30)
+        print("\n1️⃣  - Barbeiro ✂️")
+        print("2️⃣  - Cliente 👤")
+        print("3️⃣  - Visitante 👀")
+        print("=" * 30)
+        try:
+            return int(input("Escolha uma opção: "))
+        except ValueError:
+            return -1
+
+    @staticmethod
+    def menu_horario(horarios):
+        clear_screen()
+        print("\nEscolha o horário:")
+        for idx, horario in enumerate(horarios, 1):
+            print(f"{idx} - {horario}")
+        try:
+            opcao = int(input("Escolha uma opção: "))
+            if 1 <= opcao <= len(horarios):
+                return horarios[opcao - 1]
+            return "Opção inválida"
+        except ValueError:
+            return "Opção inválida"
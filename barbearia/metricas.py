@@ -0,0 +1,229 @@
+import functools
+import os
+import sys
+import threading
+from bisect import bisect_left
+from time import perf_counter
+
+# Instrumentação das operações de domínio: latência (histograma), chamadas e
+# erros por operação, exportados no formato texto do Prometheus. Desligada, a
+# classe fica com o método original e a medição não custa nada; ligada
+# (ativar() ou a variável de ambiente BARBEARIA_METRICAS), o método medido
+# entra no lugar dele na classe e cada chamada é cronometrada.
+
+# Limites dos baldes do histograma, em segundos.
+LIMITES = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+_ativas = bool(os.environ.get("BARBEARIA_METRICAS"))
+_operacoes = {}
+# {nome da operação: (função original, função medida)}, para trocar uma pela outra.
+_instrumentadas = {}
+
+class Histograma:
+    __slots__ = ("_contagens", "_soma", "_erros", "_trava")
+
+    def __init__(self):
+        self._contagens = [0] * (len(LIMITES) + 1)
+        self._soma = 0.0
+        self._erros = {}
+        self._trava = threading.Lock()
+
+    def registrar(self, segundos, erro=None):
+        with self._trava:
+            self._contagens[bisect_left(LIMITES, segundos)] += 1
+            self._soma += segundos
+            if erro is not None:
+                self._erros[erro] = self._erros.get(erro, 0) + 1
+
+    @property
+    def chamadas(self):
+        return sum(self._contagens)
+
+    @property
+    def soma(self):
+        return self._soma
+
+    @property
+    def erros(self):
+        return dict(self._erros)
+
+    def acumulados(self):
+        # (limite, chamadas com duração <= limite), como os baldes "le" do Prometheus.
+        with self._trava:
+            contagens = list(self._contagens)
+        total = 0
+        acumulados = []
+        for limite, contagem in zip(LIMITES + (float("inf"),), contagens):
+            total += contagem
+            acumulados.append((limite, total))
+        return acumulados
+
+    def quantil(self, fracao):
+        # Estimativa pelo limite superior do balde onde cai o quantil.
+        acumulados = self.acumulados()
+        alvo = fracao * acumulados[-1][1]
+        for limite, total in acumulados:
+            if total and total >= alvo:
+                return limite
+        return 0.0
+
+def _trocar(ligar):
+    # Põe na classe a versão medida (ligar) ou a original de cada operação
+    # instrumentada, também dentro de properties.
+    for nome, (original, medida) in _instrumentadas.items():
+        *caminho, atributo = nome.split(".")
+        dono = sys.modules[original.__module__]
+        for parte in caminho:
+            dono = getattr(dono, parte)
+        atual = dono.__dict__.get(atributo)
+        funcao = atual.fget if isinstance(atual, property) else atual
+        if funcao is not original and funcao is not medida:
+            continue
+        nova = medida if ligar else original
+        # Marcas postas depois do decorador (como a de @requer) vão junto.
+        for chave, valor in vars(funcao).items():
+            if chave != "__wrapped__":
+                setattr(nova, chave, valor)
+        setattr(dono, atributo, atual.getter(nova) if isinstance(atual, property) else nova)
+
+def ativar():
+    global _ativas
+    _ativas = True
+    _trocar(True)
+
+def desativar():
+    global _ativas
+    _ativas = False
+    _trocar(False)
+
+def ativas():
+    return _ativas
+
+def limpar():
+    for nome in _operacoes:
+        _operacoes[nome] = Histograma()
+
+def histograma(nome):
+    return _operacoes.setdefault(nome, Histograma())
+
+def operacoes():
+    return dict(_operacoes)
+
+def instrumentar(funcao):
+    # Decorador: mede cada chamada como a operação "Classe.metodo". Devolve a
+    # própria função enquanto as métricas estão desligadas; ativar() troca.
+    nome = funcao.__qualname__
+    histograma(nome)
+
+    @functools.wraps(funcao)
+    def medida(*args, **kwargs):
+        inicio = perf_counter()
+        try:
+            resultado = funcao(*args, **kwargs)
+        except Exception as erro:
+            _operacoes[nome].registrar(perf_counter() - inicio, type(erro).__name__)
+            raise
+        _operacoes[nome].registrar(perf_counter() - inicio)
+        return resultado
+
+    _instrumentadas[nome] = (funcao, medida)
+    return medida if _ativas else funcao
+
+class medir:
+    # Gerenciador de contexto para trechos que não são um método inteiro.
+    __slots__ = ("_nome", "_inicio")
+
+    def __init__(self, nome):
+        self._nome = nome
+        self._inicio = None
+
+    def __enter__(self):
+        if _ativas:
+            self._inicio = perf_counter()
+        return self
+
+    def __exit__(self, tipo, erro, rastro):
+        if self._inicio is not None:
+            histograma(self._nome).registrar(perf_counter() - self._inicio, tipo.__name__ if tipo is not None else None)
+        return False
+
+def _rotulo(valor):
+    return str(valor).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def texto_prometheus():
+    linhas = [
+        "# HELP barbearia_operacao_duracao_segundos Duração das operações de domínio.",
+        "# TYPE barbearia_operacao_duracao_segundos histogram",
+    ]
+    erros = []
+    for nome, medidas in sorted(_operacoes.items()):
+        operacao = _rotulo(nome)
+        acumulados = medidas.acumulados()
+        for limite, total in acumulados:
+            le = "+Inf" if limite == float("inf") else repr(limite)
+            linhas.append(f'barbearia_operacao_duracao_segundos_bucket{{operacao="{operacao}",le="{le}"}} {total}')
+        linhas.append(f'barbearia_operacao_duracao_segundos_sum{{operacao="{operacao}"}} {medidas.soma!r}')
+        linhas.append(f'barbearia_operacao_duracao_segundos_count{{operacao="{operacao}"}} {acumulados[-1][1]}')
+        for tipo, quantidade in sorted(medidas.erros.items()):
+            erros.append(f'barbearia_operacao_erros_total{{operacao="{operacao}",tipo="{_rotulo(tipo)}"}} {quantidade}')
+    linhas.append("# HELP barbearia_operacao_erros_total Operações que terminaram em exceção.")
+    linhas.append("# TYPE barbearia_operacao_erros_total counter")
+    linhas.extend(erros)
+    return "\n".join(linhas) + "\n"
+
+def gravar_prometheus(caminho):
+    # Para o textfile collector do node_exporter: grava ao lado e troca de uma vez.
+    temporario = f"{caminho}.tmp"
+    with open(temporario, "w", encoding="utf-8") as arquivo:
+        arquivo.write(texto_prometheus())
+    os.replace(temporario, caminho)
+
+def resumo():
+    # [(operação, chamadas, erros, p50, p99, média)] das operações já chamadas, da mais custosa à menos.
+    linhas = []
+    for nome, medidas in _operacoes.items():
+        chamadas = medidas.chamadas
+        if chamadas:
+            linhas.append((nome, chamadas, sum(medidas.erros.values()), medidas.quantil(0.5), medidas.quantil(0.99), medidas.soma / chamadas))
+    return sorted(linhas, key=lambda linha: -linha[1] * linha[5])
+
+class Captura:
+    # Perfil de CPU (cProfile) e de memória (tracemalloc) entre iniciar() e parar().
+    def __init__(self):
+        self._perfil = None
+
+    @property
+    def ativa(self):
+        return self._perfil is not None
+
+    def iniciar(self):
+        if self._perfil is not None:
+            raise ValueError("Captura já iniciada.")
+        import cProfile
+        import tracemalloc
+
+        tracemalloc.start()
+        self._perfil = cProfile.Profile()
+        self._perfil.enable()
+
+    def parar(self, caminho=None, linhas=15):
+        # Devolve o relatório em texto; com caminho, grava também o perfil (.prof, para o pstats/snakeviz).
+        if self._perfil is None:
+            raise ValueError("Nenhuma captura em andamento.")
+        import io
+        import pstats
+        import tracemalloc
+
+        perfil, self._perfil = self._perfil, None
+        perfil.disable()
+        memoria = tracemalloc.take_snapshot()
+        atual, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        if caminho is not None:
+            perfil.dump_stats(caminho)
+        saida = io.StringIO()
+        pstats.Stats(perfil, stream=saida).sort_stats("cumulative").print_stats(linhas)
+        saida.write(f"Memória: {atual / 1024:.1f} KiB em uso, pico de {pico / 1024:.1f} KiB\n")
+        for estatistica in memoria.statistics("lineno")[:linhas]:
+            saida.write(f"  {estatistica}\n")
+        return saida.getvalue()
@@ -0,0 +1,288 @@
+import abc
+
+from .agenda import CalendarioHorarios, HorariosLivres
+from .permissoes import Permissao, nomes_permissoes
+
+class Autenticavel(abc.ABC):
+    @abc.abstractmethod
+    def obter_permissoes(self):
+        pass
+
+    @classmethod
+    def __subclasshook__(cls, classe):
+        # Autenticável é todo papel com alguma permissão; Visitante não tem nenhuma.
+        if cls is Autenticavel:
+            return bool(getattr(classe, "mascara_permissoes", 0)) or NotImplemented
+        return NotImplemented
+
+class Pessoa:
+    __slots__ = ("_nome", "_cpf")
+    PERMISSOES = Permissao(0)
+    # Papel no cadastro (e a coluna "tipo" do banco): decide o índice em que o usuário entra.
+    PAPEL = None
+    mascara_permissoes = 0
+    autenticavel = False
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Calculado uma vez por papel: a máscara como int e os nomes das permissões.
+        cls.mascara_permissoes = int(cls.PERMISSOES)
+        cls._nomes_permissoes = nomes_permissoes(cls.mascara_permissoes)
+        cls.autenticavel = bool(cls.mascara_permissoes)
+
+    def __init__(self, nome, cpf):
+        self._nome = nome
+        self._cpf = cpf
+
+    @property
+    def nome(self):
+        return self._nome
+
+    @nome.setter
+    def nome(self, nome):
+        self._nome = nome
+
+    @property
+    def cpf(self):
+        return self._cpf
+
+class Barbeiro(Pessoa):
+    __slots__ = ("_calendario", "_salario", "_cortes", "_modelo", "_agenda")
+    PAPEL = "barbeiro"
+    PERMISSOES = (
+        Permissao.LISTAR_HORARIOS | Permissao.RESERVAR_HORARIO | Permissao.LISTAR_CLIENTES
+        | Permissao.EDITAR_CLIENTE | Permissao.EXCLUIR_CLIENTE | Permissao.CALCULAR_LUCRO
+    )
+
+    def __init__(self, nome, cpf, salario, duracao_slot=60, cortes=None):
+        super().__init__(nome, cpf)
+        self._calendario = CalendarioHorarios(duracao_slot=duracao_slot)
+        self._salario = salario
+        # None significa que o barbeiro faz todos os cortes.
+        self._cortes = None if cortes is None else frozenset(cortes)
+        # Regras de disponibilidade (ModeloDisponibilidade) e a agenda por data derivada delas.
+        self._modelo = None
+        self._agenda = None
+
+    @property
+    def horarios_livres(self):
+        return HorariosLivres(self._calendario)
+
+    @property
+    def calendario(self):
+        return self._calendario
+
+    @property
+    def duracao_slot(self):
+        return self._calendario.duracao_slot
+
+    @property
+    def salario(self):
+        return self._salario
+
+    @salario.setter
+    def salario(self, salario):
+        self._salario = salario
+
+    @property
+    def cortes(self):
+        return self._cortes
+
+    @property
+    def modelo(self):
+        return self._modelo
+
+    def definir_modelo(self, modelo, ocupados=None):
+        # A semana-padrão do modelo vira os horários livres de cada dia da semana.
+        # ocupados: {dia: máscara dos slots já reservados}, que continuam ocupados;
+        # com agendamentos, use Barbearia.definir_modelo, que monta essa máscara.
+        if modelo.duracao_slot != self.duracao_slot:
+            raise ValueError("Duração de slot inválida.")
+        self._modelo = modelo
+        self._agenda = None
+        ocupados = ocupados or {}
+        for dia in self._calendario.dias:
+            self._calendario.definir_mascara(dia, modelo.mascara_semanal(dia) & ~ocupados.get(dia, 0))
+
+    @property
+    def agenda(self):
+        # Criada só no primeiro uso; sem modelo não há agenda por data.
+        if self._agenda is None and self._modelo is not None:
+            from .recorrencia import AgendaDatada
+            self._agenda = AgendaDatada(self._modelo)
+        return self._agenda
+
+    def faz_corte(self, corte):
+        return self._cortes is None or corte in self._cortes
+
+    def slots_para(self, duracao):
+        # Slots seguidos que um serviço de 'duracao' minutos ocupa; None é um slot.
+        if duracao is None:
+            return 1
+        return max(1, -(-duracao // self.duracao_slot))
+
+    def adicionar_horario_livre(self, dia, horario, duracao=None):
+        self._calendario.liberar(dia, horario, self.slots_para(duracao))
+
+    def adicionar_intervalo_livre(self, dia, inicio, fim):
+        self._calendario.liberar_intervalo(dia, inicio, fim)
+
+    def remover_horario_livre(self, dia, horario):
+        try:
+            self._calendario.reservar(dia, horario)
+        except ValueError:
+            raise ValueError("Horário não encontrado para o dia especificado.") from None
+
+    def ocupar_horario_livre(self, dia, horario, duracao=None):
+        return self._calendario.reservar_se_livre(dia, horario, self.slots_para(duracao))
+
+    def horario_livre(self, dia, horario):
+        return self._calendario.esta_livre(dia, horario)
+
+    def cabe(self, dia, horario, duracao=None):
+        return self._calendario.cabe(dia, horario, self.slots_para(duracao))
+
+    def encaixes(self, dia, duracao=None):
+        return self._calendario.encaixes(dia, self.slots_para(duracao))
+
+    def proximo_horario_livre(self, dia, a_partir_de=None):
+        return self._calendario.proximo_livre(dia, a_partir_de)
+
+    def obter_permissoes(self):
+        return self._nomes_permissoes
+
+class Cliente(Pessoa):
+    __slots__ = ("_corte_desejado", "_valor", "_dia", "_horario_desejado")
+    PAPEL = "cliente"
+    PERMISSOES = Permissao.LISTAR_HORARIOS | Permissao.RESERVAR_HORARIO
+
+    def __init__(self, nome, cpf, corte_desejado, valor, dia, horario_desejado):
+        # Chamada direta, sem super(): criar o cliente está no caminho do cadastro.
+        Pessoa.__init__(self, nome, cpf)
+        self._corte_desejado = corte_desejado
+        self._valor = valor
+        self._dia = dia
+        self._horario_desejado = horario_desejado
+
+    @property
+    def corte_desejado(self):
+        return self._corte_desejado
+
+    @corte_desejado.setter
+    def corte_desejado(self, corte_desejado):
+        self._corte_desejado = corte_desejado
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @valor.setter
+    def valor(self, valor):
+        self._valor = valor
+
+    @property
+    def dia(self):
+        return self._dia
+
+    @dia.setter
+    def dia(self, dia):
+        self._dia = dia
+
+    @property
+    def horario_desejado(self):
+        return self._horario_desejado
+
+    @horario_desejado.setter
+    def horario_desejado(self, horario_desejado):
+        self._horario_desejado = horario_desejado
+
+    def obter_permissoes(self):
+        return self._nomes_permissoes
+
+class Visitante(Pessoa):
+    __slots__ = ()
+    PAPEL = "visitante"
+
+    def __init__(self, nome, cpf):
+        super().__init__(nome, cpf)
+
+class Agendamento:
+    # Uma reserva: só os dados do horário, apontando para o Cliente que a fez.
+    __slots__ = ("_id_agendamento", "_cliente", "_corte_desejado", "_valor", "_dia", "_horario_desejado", "_cpf_barbeiro")
+
+    def __init__(self, cliente, corte_desejado, valor, dia, horario_desejado, cpf_barbeiro=None):
+        self._id_agendamento = None
+        self._cliente = cliente
+        self._corte_desejado = corte_desejado
+        self._valor = valor
+        self._dia = dia
+        self._horario_desejado = horario_desejado
+        self._cpf_barbeiro = cpf_barbeiro
+
+    @classmethod
+    def do_cliente(cls, cliente, cpf_barbeiro=None):
+        return cls(cliente, cliente.corte_desejado, cliente.valor, cliente.dia, cliente.horario_desejado, cpf_barbeiro)
+
+    @property
+    def cliente(self):
+        return self._cliente
+
+    @property
+    def nome(self):
+        return self._cliente.nome
+
+    @nome.setter
+    def nome(self, nome):
+        self._cliente.nome = nome
+
+    @property
+    def cpf(self):
+        return self._cliente.cpf
+
+    @property
+    def id_agendamento(self):
+        return self._id_agendamento
+
+    @id_agendamento.setter
+    def id_agendamento(self, id_agendamento):
+        self._id_agendamento = id_agendamento
+
+    @property
+    def cpf_barbeiro(self):
+        return self._cpf_barbeiro
+
+    @cpf_barbeiro.setter
+    def cpf_barbeiro(self, cpf_barbeiro):
+        self._cpf_barbeiro = cpf_barbeiro
+
+    @property
+    def corte_desejado(self):
+        return self._corte_desejado
+
+    @corte_desejado.setter
+    def corte_desejado(self, corte_desejado):
+        self._corte_desejado = corte_desejado
+
+    @property
+    def valor(self):
+        return self._valor
+
+    @valor.setter
+    def valor(self, valor):
+        self._valor = valor
+
+    @property
+    def dia(self):
+        return self._dia
+
+    @dia.setter
+    def dia(self, dia):
+        self._dia = dia
+
+    @property
+    def horario_desejado(self):
+        return self._horario_desejado
+
+    @horario_desejado.setter
+    def horario_desejado(self, horario_desejado):
+        self._horario_desejado = horario_desejado
@@ -0,0 +1,223 @@
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+from .agenda import bits_ligados, horario_para_minutos, minutos_para_horario
+
+# Distribuição de um lote de pedidos pelos horários livres dos barbeiros,
+# maximizando a receita (e, em empate, os slots ocupados e a preferência dos
+# clientes). Cada tentativa é um guloso aleatorizado seguido de busca local
+# (encaixar um pedido de fora deslocando ou substituindo quem está no caminho);
+# as tentativas são independentes e rodam num pool de processos, então mais
+# núcleos significam mais tentativas no mesmo tempo.
+
+# Perturbação da ordem do guloso nas tentativas depois da primeira.
+RUIDO = 0.3
+PASSADAS_BUSCA = 5
+
+class Solicitacao:
+    # Um pedido do lote: o cliente, os (dia, horario) aceitos em ordem de
+    # preferência (horario None aceita qualquer horário do dia) e a duração
+    # em minutos (None: um slot do barbeiro).
+    __slots__ = ("_cliente", "_opcoes", "_duracao")
+
+    def __init__(self, cliente, opcoes=None, duracao=None):
+        self._cliente = cliente
+        self._opcoes = list(opcoes) if opcoes is not None else [(cliente.dia, cliente.horario_desejado)]
+        if not self._opcoes:
+            raise ValueError("Informe ao menos um dia.")
+        self._duracao = duracao
+
+    @property
+    def cliente(self):
+        return self._cliente
+
+    @property
+    def opcoes(self):
+        return list(self._opcoes)
+
+    @property
+    def duracao(self):
+        return self._duracao
+
+class Plano:
+    def __init__(self, alocacoes, pendentes, tentativas):
+        # alocacoes: [(solicitacao, barbeiro, dia, horario)]
+        self.alocacoes = alocacoes
+        self.pendentes = pendentes
+        self.tentativas = tentativas
+
+    @property
+    def receita(self):
+        return sum(solicitacao.cliente.valor for solicitacao, _, _, _ in self.alocacoes)
+
+def _candidatos(solicitacao, barbeiros, dias):
+    # ((barbeiro, dia), bits do bloco, posição da preferência, slots) de cada lugar onde o pedido cabe hoje.
+    cliente = solicitacao.cliente
+    candidatos = []
+    vistos = set()
+    for rank, (dia, horario) in enumerate(solicitacao.opcoes):
+        if dia not in dias:
+            raise ValueError("Dia inválido.")
+        for indice_barbeiro, barbeiro in enumerate(barbeiros):
+            if not barbeiro.faz_corte(cliente.corte_desejado):
+                continue
+            slots = barbeiro.slots_para(solicitacao.duracao)
+            bloco = (1 << slots) - 1
+            livres = barbeiro.calendario.mascara(dia)
+            if horario is None:
+                # Só os inícios onde o bloco inteiro cabe, direto da tabela de encaixes.
+                inicios = bits_ligados(barbeiro.calendario.encaixes(dia, slots))
+            else:
+                inicio, resto = divmod(horario_para_minutos(horario), barbeiro.duracao_slot)
+                inicios = () if resto else (inicio,)
+            for inicio in inicios:
+                bits = bloco << inicio
+                chave = (indice_barbeiro, dia, inicio)
+                if livres & bits == bits and chave not in vistos:
+                    vistos.add(chave)
+                    candidatos.append(((indice_barbeiro, dias[dia]), bits, rank, slots))
+    return candidatos
+
+# Problema da tentativa atual: no pool, preenchido uma vez por processo pelo initializer.
+_problema = None
+
+def _preparar(problema):
+    global _problema
+    _problema = problema
+
+def _tentativa(semente):
+    candidatos, valores, livres_iniciais = _problema
+    aleatorio = random.Random(semente)
+    ruido = RUIDO if semente else 0.0
+    livres = dict(livres_iniciais)
+    dono = {}
+    escolha = [None] * len(candidatos)
+
+    def cabe(candidato):
+        return livres[candidato[0]] & candidato[1] == candidato[1]
+
+    def primeiro_que_cabe(opcoes):
+        return next((candidato for candidato in opcoes if livres[candidato[0]] & candidato[1] == candidato[1]), None)
+
+    def ocupar(pedido, candidato):
+        chave, bits = candidato[0], candidato[1]
+        livres[chave] &= ~bits
+        for bit in bits_ligados(bits):
+            dono[chave, bit] = pedido
+        escolha[pedido] = candidato
+
+    def liberar(pedido):
+        chave, bits = escolha[pedido][0], escolha[pedido][1]
+        livres[chave] |= bits
+        for bit in bits_ligados(bits):
+            del dono[chave, bit]
+        escolha[pedido] = None
+
+    def ordem_candidatos(pedido):
+        if not ruido:
+            return candidatos[pedido]
+        return sorted(candidatos[pedido], key=lambda candidato: candidato[2] + aleatorio.random())
+
+    # Guloso: pedidos mais valiosos primeiro, cada um no primeiro lugar livre da sua preferência.
+    ordem = sorted(range(len(candidatos)), key=lambda pedido: -valores[pedido] * (1 + ruido * aleatorio.random()))
+    for pedido in ordem:
+        candidato = primeiro_que_cabe(ordem_candidatos(pedido))
+        if candidato is not None:
+            ocupar(pedido, candidato)
+
+    # Busca local: cada pedido de fora tenta entrar tirando do caminho um único pedido,
+    # que vai para outro lugar seu ou, se valer menos, sai do plano. sem_destino guarda
+    # quem não tem para onde ir; só vale enquanto o plano não muda.
+    sem_destino = set()
+    for _ in range(PASSADAS_BUSCA):
+        melhorou = False
+        for pedido in ordem:
+            if escolha[pedido] is not None:
+                continue
+            if melhorou:
+                sem_destino.clear()
+            for candidato in ordem_candidatos(pedido):
+                chave = candidato[0]
+                no_caminho = {dono[chave, bit] for bit in bits_ligados(candidato[1]) if (chave, bit) in dono}
+                if len(no_caminho) > 1:
+                    continue
+                if not no_caminho:
+                    if cabe(candidato):
+                        ocupar(pedido, candidato)
+                        melhorou = True
+                        break
+                    continue
+                outro = no_caminho.pop()
+                if outro in sem_destino and valores[pedido] <= valores[outro]:
+                    continue
+                anterior = escolha[outro]
+                liberar(outro)
+                if not cabe(candidato):
+                    ocupar(outro, anterior)
+                    continue
+                ocupar(pedido, candidato)
+                destino = primeiro_que_cabe(candidatos[outro])
+                if destino is not None:
+                    ocupar(outro, destino)
+                elif valores[pedido] <= valores[outro]:
+                    liberar(pedido)
+                    if primeiro_que_cabe(alternativa for alternativa in candidatos[outro] if alternativa is not anterior) is None:
+                        sem_destino.add(outro)
+                    ocupar(outro, anterior)
+                    continue
+                melhorou = True
+                break
+        if not melhorou:
+            break
+
+    alocados = [candidato for candidato in escolha if candidato is not None]
+    pontuacao = (
+        sum(valores[pedido] for pedido, candidato in enumerate(escolha) if candidato is not None),
+        sum(candidato[3] for candidato in alocados),
+        -sum(candidato[2] for candidato in alocados),
+    )
+    return pontuacao, escolha
+
+def otimizar(solicitacoes, barbeiros, processos=None, tentativas=None, semente=0):
+    # processos=None usa todos os núcleos; com 1 processo (ou 1 núcleo) tudo roda aqui mesmo.
+    barbeiros = list(barbeiros)
+    if not barbeiros:
+        raise ValueError("Nenhum barbeiro disponível.")
+    dias = {dia: indice for indice, dia in enumerate(barbeiros[0].calendario.dias)}
+    solicitacoes = list(solicitacoes)
+    candidatos = [_candidatos(solicitacao, barbeiros, dias) for solicitacao in solicitacoes]
+    valores = [solicitacao.cliente.valor for solicitacao in solicitacoes]
+    livres = {
+        (indice_barbeiro, indice_dia): barbeiro.calendario.mascara(dia)
+        for indice_barbeiro, barbeiro in enumerate(barbeiros) for dia, indice_dia in dias.items()
+    }
+    problema = (candidatos, valores, livres)
+    if processos is None:
+        processos = os.cpu_count() or 1
+    if tentativas is None:
+        tentativas = 4 * processos
+    sementes = range(semente, semente + tentativas)
+    if processos <= 1:
+        _preparar(problema)
+        try:
+            resultados = [_tentativa(semente) for semente in sementes]
+        finally:
+            _preparar(None)
+    else:
+        with ProcessPoolExecutor(processos, initializer=_preparar, initargs=(problema,)) as pool:
+            resultados = list(pool.map(_tentativa, sementes, chunksize=max(1, tentativas // (4 * processos))))
+    _, escolha = max(resultados, key=lambda resultado: resultado[0])
+
+    nomes_dias = list(dias)
+    alocacoes = []
+    pendentes = []
+    for solicitacao, candidato in zip(solicitacoes, escolha):
+        if candidato is None:
+            pendentes.append(solicitacao)
+            continue
+        (indice_barbeiro, indice_dia), bits, _, _ = candidato
+        barbeiro = barbeiros[indice_barbeiro]
+        inicio = (bits & -bits).bit_length() - 1
+        alocacoes.append((solicitacao, barbeiro, nomes_dias[indice_dia], minutos_para_horario(inicio * barbeiro.duracao_slot)))
+    return Plano(alocacoes, pendentes, tentativas)
@@ -0,0 +1,71 @@
+import enum
+import functools
+
+# Cada permissão é um bit. O papel (Barbeiro, Cliente, ...) guarda a máscara
+# com todas as suas permissões, calculada uma única vez na definição da classe,
+# e a autorização é um AND entre essa máscara e a permissão exigida.
+
+class Permissao(enum.IntFlag):
+    LISTAR_HORARIOS = enum.auto()
+    RESERVAR_HORARIO = enum.auto()
+    LISTAR_CLIENTES = enum.auto()
+    EDITAR_CLIENTE = enum.auto()
+    EXCLUIR_CLIENTE = enum.auto()
+    CALCULAR_LUCRO = enum.auto()
+
+# Para membros somente leitura que qualquer papel pode ver.
+LIVRE = Permissao(0)
+
+class PermissaoNegada(ValueError):
+    def __init__(self, mensagem="Usuário não tem permissão."):
+        super().__init__(mensagem)
+
+@functools.lru_cache(maxsize=None)
+def nomes_permissoes(mascara):
+    # Os nomes antigos ("listar_horarios", ...), um frozenset por máscara.
+    return frozenset(permissao.name.lower() for permissao in Permissao if permissao & mascara)
+
+def mascara_de(usuario):
+    return getattr(usuario, "mascara_permissoes", 0)
+
+def autorizado(usuario, permissao):
+    # Com uma permissão só, basta o AND dar diferente de zero.
+    return mascara_de(usuario) & permissao == permissao
+
+def exigir(usuario, permissao):
+    if mascara_de(usuario) & permissao != permissao:
+        raise PermissaoNegada()
+
+def requer(permissao):
+    # Marca o método com a permissão exigida; a chamada direta não muda,
+    # quem verifica é o AcessoAutorizado. requer(LIVRE) libera para todos.
+    def marcar(funcao):
+        funcao.permissao_exigida = int(permissao)
+        return funcao
+    return marcar
+
+@functools.lru_cache(maxsize=None)
+def permissao_exigida(classe, nome):
+    # None para o que não foi marcado com @requer.
+    atributo = next((base.__dict__[nome] for base in classe.__mro__ if nome in base.__dict__), None)
+    if isinstance(atributo, property):
+        atributo = atributo.fget
+    return getattr(atributo, "permissao_exigida", None)
+
+class AcessoAutorizado:
+    # Visão de um objeto (em geral a Barbearia) em nome de um usuário: só os
+    # atributos marcados com @requer existem nela, e cada um só é entregue se
+    # o usuário tiver a permissão. Nomes com _ e membros sem marca são negados.
+    __slots__ = ("_objeto", "_mascara")
+
+    def __init__(self, objeto, usuario):
+        self._objeto = objeto
+        self._mascara = mascara_de(usuario)
+
+    def __getattr__(self, nome):
+        if nome.startswith("_"):
+            raise PermissaoNegada()
+        exigida = permissao_exigida(type(self._objeto), nome)
+        if exigida is None or self._mascara & exigida != exigida:
+            raise PermissaoNegada()
+        return getattr(self._objeto, nome)
@@ -0,0 +1,239 @@
+from .agenda import DIAS_SEMANA, horario_para_minutos
+from .relatorios import HORAS, SEM_MES, Codigos, HistoricoAgendamentos, _contar, numpy
+
+# Previsão de ocupação e de faltas por (dia, hora, corte), aprendida do
+# histórico por suavização exponencial: cada período (um mês do histórico)
+# entra com peso ALFA e os anteriores decaem por (1 - ALFA). O resultado fica
+# materializado em tabelas (listas por célula); um agendamento novo, removido
+# ou remarcado só recalcula as células dele, então a consulta é um acesso a lista.
+#
+# As células vão em blocos de 6 x 24, len(DIAS_SEMANA) x HORAS (dia * 24 + hora):
+# o bloco 0 junta todos os cortes e o bloco c + 1 é o do corte de código c.
+
+ALFA = 0.3
+# Campos de um agendamento que decidem as células dele.
+CAMPOS_DA_CELULA = frozenset(("dia", "horario_desejado", "corte_desejado"))
+CELULAS_DIA_HORA = len(DIAS_SEMANA) * HORAS
+
+def _contagens(historico, ordem_por_codigo, celulas):
+    # Agendamentos e faltas por (período, célula), numa lista plana período * celulas + célula.
+    dia_hora = historico._dia_hora()
+    if numpy is not None:
+        periodo = numpy.array(ordem_por_codigo, dtype=numpy.intp)[numpy.frombuffer(historico._mes, dtype=historico._mes.typecode)]
+        corte = numpy.frombuffer(historico._corte, dtype=historico._corte.typecode).astype(numpy.intp)
+        todos = periodo * celulas + dia_hora
+        chaves = numpy.concatenate((todos, todos + (corte + 1) * CELULAS_DIA_HORA))
+        faltas = numpy.tile(numpy.frombuffer(historico._compareceu, dtype=numpy.uint8) == 0, 2)
+        chaves_faltas = chaves[faltas]
+    else:
+        todos = [ordem_por_codigo[mes] * celulas + celula for mes, celula in zip(historico._mes, dia_hora)]
+        chaves = todos + [chave + (corte + 1) * CELULAS_DIA_HORA for chave, corte in zip(todos, historico._corte)]
+        faltas = [not veio for veio in historico._compareceu] * 2
+        chaves_faltas = [chave for chave, faltou in zip(chaves, faltas) if faltou]
+    total = len(ordem_por_codigo) * celulas
+    return _contar(chaves, total), _contar(chaves_faltas, total)
+
+class PrevisaoOcupacao:
+    def __init__(self, alfa=ALFA):
+        if not 0 < alfa <= 1:
+            raise ValueError("Fator de suavização inválido.")
+        self._alfa = alfa
+        self.cortes = Codigos()
+        self._indice_dia = {dia: indice for indice, dia in enumerate(DIAS_SEMANA)}
+        self._horas = {}
+        # Mês do período aberto (None antes do primeiro agendamento) e soma dos pesos dos fechados.
+        self._periodo = None
+        self._peso = 0.0
+        # Períodos fechados, já suavizados: agendamentos, períodos com algum agendamento e faltas.
+        self._agendados = [0.0] * CELULAS_DIA_HORA
+        self._preenchidos = [0.0] * CELULAS_DIA_HORA
+        self._faltas = [0.0] * CELULAS_DIA_HORA
+        # Contagens do período aberto.
+        self._abertos = [0] * CELULAS_DIA_HORA
+        self._faltas_abertas = [0] * CELULAS_DIA_HORA
+        # Tabelas materializadas, lidas pelas consultas.
+        self._esperado = [0.0] * CELULAS_DIA_HORA
+        self._probabilidade = [0.0] * CELULAS_DIA_HORA
+        self._taxa_faltas = [0.0] * CELULAS_DIA_HORA
+
+    @classmethod
+    def de_historico(cls, historico, alfa=ALFA):
+        # Todos os meses menos o último entram como fechados; o último fica aberto
+        # e continua recebendo os agendamentos que chegarem.
+        previsao = cls(alfa)
+        for corte in historico.cortes.nomes:
+            previsao._codigo_corte(corte)
+        periodos = sorted(historico.meses.nomes)
+        if not periodos:
+            return previsao
+        ordem = {mes: indice for indice, mes in enumerate(periodos)}
+        celulas = len(previsao._esperado)
+        agendados, faltas = _contagens(historico, [ordem[mes] for mes in historico.meses.nomes], celulas)
+        for indice in range(len(periodos)):
+            if indice:
+                previsao._fechar_periodo()
+            previsao._abertos = [int(total) for total in agendados[indice * celulas:(indice + 1) * celulas]]
+            previsao._faltas_abertas = [int(total) for total in faltas[indice * celulas:(indice + 1) * celulas]]
+        previsao._periodo = periodos[-1]
+        previsao._materializar_tudo()
+        return previsao
+
+    @classmethod
+    def da_barbearia(cls, barbearia, alfa=ALFA):
+        # Parte dos agendamentos atuais e acompanha os novos; chamada com a trava
+        # da barbearia (Barbearia.previsao) para não perder nenhum no meio.
+        previsao = cls.de_historico(HistoricoAgendamentos.da_barbearia(barbearia), alfa)
+        previsao.acompanhar(barbearia)
+        return previsao
+
+    def acompanhar(self, barbearia):
+        agendamentos = barbearia.agendamentos
+        agendamentos.observar(self._agendamento_criado)
+        agendamentos.observar_remocao(self._agendamento_removido)
+        agendamentos.observar_edicao(self._agendamento_editado)
+
+    def _agendamento_criado(self, agendamento):
+        self.registrar(agendamento.dia, agendamento.horario_desejado, agendamento.corte_desejado)
+
+    def _agendamento_removido(self, agendamento):
+        self.desfazer(agendamento.dia, agendamento.horario_desejado, agendamento.corte_desejado)
+
+    def _agendamento_editado(self, agendamento, antes):
+        # Remarcado ou com outro corte: sai das células antigas e entra nas novas.
+        if CAMPOS_DA_CELULA.isdisjoint(antes):
+            return
+        self.desfazer(
+            antes.get("dia", agendamento.dia), antes.get("horario_desejado", agendamento.horario_desejado),
+            antes.get("corte_desejado", agendamento.corte_desejado),
+        )
+        self._agendamento_criado(agendamento)
+
+    @property
+    def periodo(self):
+        return self._periodo
+
+    def _codigo_corte(self, corte):
+        codigo = self.cortes.codigo(corte)
+        # Corte novo: mais um bloco de células, todas ainda sem histórico.
+        while len(self._esperado) < (codigo + 2) * CELULAS_DIA_HORA:
+            for tabela in (self._agendados, self._preenchidos, self._faltas, self._esperado, self._probabilidade, self._taxa_faltas):
+                tabela.extend([0.0] * CELULAS_DIA_HORA)
+            for tabela in (self._abertos, self._faltas_abertas):
+                tabela.extend([0] * CELULAS_DIA_HORA)
+        return codigo
+
+    def _dia_hora(self, dia, horario):
+        try:
+            indice_dia = self._indice_dia[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+        hora = self._horas.get(horario)
+        if hora is None:
+            hora = horario_para_minutos(horario) // 60
+            if not 0 <= hora < HORAS:
+                raise ValueError("Horário inválido.")
+            self._horas[horario] = hora
+        return indice_dia * HORAS + hora
+
+    def _celula(self, dia, horario, corte):
+        # None para um corte que nunca apareceu: nada a prever.
+        celula = self._dia_hora(dia, horario)
+        if corte is None:
+            return celula
+        codigo = self.cortes.buscar(corte)
+        return None if codigo is None else celula + (codigo + 1) * CELULAS_DIA_HORA
+
+    def _materializar(self, celula):
+        alfa = self._alfa
+        base = 1 - alfa
+        peso = base * self._peso + alfa
+        agendados = self._abertos[celula]
+        esperado = (base * self._agendados[celula] + alfa * agendados) / peso
+        faltas = (base * self._faltas[celula] + alfa * self._faltas_abertas[celula]) / peso
+        self._esperado[celula] = esperado
+        self._probabilidade[celula] = (base * self._preenchidos[celula] + (alfa if agendados else 0.0)) / peso
+        self._taxa_faltas[celula] = faltas / esperado if esperado else 0.0
+
+    def _materializar_tudo(self):
+        for celula in range(len(self._esperado)):
+            self._materializar(celula)
+
+    def _fechar_periodo(self):
+        alfa = self._alfa
+        base = 1 - alfa
+        self._agendados = [base * anterior + alfa * total for anterior, total in zip(self._agendados, self._abertos)]
+        self._preenchidos = [base * anterior + (alfa if total else 0.0) for anterior, total in zip(self._preenchidos, self._abertos)]
+        self._faltas = [base * anterior + alfa * total for anterior, total in zip(self._faltas, self._faltas_abertas)]
+        self._peso = base * self._peso + alfa
+        self._abertos = [0] * len(self._abertos)
+        self._faltas_abertas = [0] * len(self._faltas_abertas)
+
+    def novo_periodo(self, mes):
+        # Fecha o período aberto e começa outro; aqui a tabela inteira é recalculada.
+        if self._periodo is not None and mes <= self._periodo:
+            raise ValueError("Mês anterior ao período atual.")
+        if self._periodo is not None:
+            self._fechar_periodo()
+        self._periodo = mes
+        self._materializar_tudo()
+
+    def registrar(self, dia, horario, corte, mes=SEM_MES, compareceu=True):
+        # Sem mês, o agendamento conta no período aberto.
+        dia_hora = self._dia_hora(dia, horario)
+        if self._periodo is None or (mes != SEM_MES and mes != self._periodo):
+            self.novo_periodo(mes)
+        for celula in (dia_hora, dia_hora + (self._codigo_corte(corte) + 1) * CELULAS_DIA_HORA):
+            self._abertos[celula] += 1
+            if not compareceu:
+                self._faltas_abertas[celula] += 1
+            self._materializar(celula)
+
+    def desfazer(self, dia, horario, corte, compareceu=True):
+        # Tira um agendamento do período aberto. Um que foi contado num período já
+        # fechado segue só na média suavizada: a célula aberta não fica negativa.
+        dia_hora = self._dia_hora(dia, horario)
+        codigo = self.cortes.buscar(corte)
+        celulas = (dia_hora,) if codigo is None else (dia_hora, dia_hora + (codigo + 1) * CELULAS_DIA_HORA)
+        for celula in celulas:
+            if self._abertos[celula]:
+                self._abertos[celula] -= 1
+                if not compareceu and self._faltas_abertas[celula]:
+                    self._faltas_abertas[celula] -= 1
+                self._materializar(celula)
+
+    def ocupacao_esperada(self, dia, horario, corte=None):
+        # Agendamentos esperados por período naquela hora.
+        celula = self._celula(dia, horario, corte)
+        return 0.0 if celula is None else self._esperado[celula]
+
+    def probabilidade_preenchimento(self, dia, horario, corte=None):
+        # Chance de a hora receber ao menos um agendamento no período.
+        celula = self._celula(dia, horario, corte)
+        return 0.0 if celula is None else self._probabilidade[celula]
+
+    def taxa_faltas(self, dia, horario, corte=None):
+        celula = self._celula(dia, horario, corte)
+        return 0.0 if celula is None else self._taxa_faltas[celula]
+
+    def ociosos(self, dia, horarios, limite=0.5):
+        # Dos horários (livres) dados, os com chance de preenchimento abaixo do limite, como (horário, chance).
+        ociosos = []
+        for horario in horarios:
+            chance = self._probabilidade[self._dia_hora(dia, horario)]
+            if chance < limite:
+                ociosos.append((horario, chance))
+        return ociosos
+
+    def tabela(self, corte=None):
+        # {dia: [ocupação esperada às 0h, 1h, ..., 23h]}, no formato de HistoricoAgendamentos.ocupacao.
+        if corte is None:
+            inicio = 0
+        else:
+            codigo = self.cortes.buscar(corte)
+            if codigo is None:
+                return {dia: [0.0] * HORAS for dia in DIAS_SEMANA}
+            inicio = (codigo + 1) * CELULAS_DIA_HORA
+        return {
+            dia: self._esperado[inicio + indice * HORAS:inicio + (indice + 1) * HORAS]
+            for indice, dia in enumerate(DIAS_SEMANA)
+        }
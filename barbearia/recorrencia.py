@@ -0,0 +1,166 @@
+import threading
+from collections import OrderedDict
+from datetime import timedelta
+
+from .agenda import DIAS_SEMANA, MINUTOS_DIA, CalendarioHorarios, bits_ligados, horario_para_minutos, minutos_para_horario
+
+# Disponibilidade por regras em vez de slots gravados um a um: o horário de
+# cada dia da semana, as pausas (almoço etc.) e exceções por data (feriados,
+# folgas, horário especial). Os slots de uma data concreta só são calculados
+# quando alguém consulta aquela semana, e as semanas calculadas ficam em cache.
+
+class ModeloDisponibilidade:
+    def __init__(self, duracao_slot=60):
+        self._horarios = CalendarioHorarios(duracao_slot=duracao_slot)
+        self._pausas = CalendarioHorarios(duracao_slot=duracao_slot)
+        self._excecoes = {}
+        # Muda a cada alteração das regras; as agendas usam para descartar o cache.
+        self._versao = 0
+
+    @property
+    def duracao_slot(self):
+        return self._horarios.duracao_slot
+
+    @property
+    def versao(self):
+        return self._versao
+
+    def _bits(self, inicio, fim):
+        minutos_fim = horario_para_minutos(fim)
+        primeiro, resto_inicio = divmod(horario_para_minutos(inicio), self.duracao_slot)
+        ultimo, resto_fim = divmod(minutos_fim, self.duracao_slot)
+        if resto_inicio or resto_fim or minutos_fim > MINUTOS_DIA or ultimo <= primeiro:
+            raise ValueError("Intervalo inválido.")
+        return ((1 << (ultimo - primeiro)) - 1) << primeiro
+
+    def definir_horario(self, dia, inicio, fim):
+        # Expediente semanal do dia; fim exclusivo, como em liberar_intervalo.
+        self._horarios.definir_mascara(dia, self._bits(inicio, fim))
+        self._versao += 1
+
+    def adicionar_pausa(self, dia, inicio, fim):
+        dias = DIAS_SEMANA if dia is None else [dia]
+        bits = self._bits(inicio, fim)
+        for dia in dias:
+            self._pausas.definir_mascara(dia, self._pausas.mascara(dia) | bits)
+        self._versao += 1
+
+    def adicionar_excecao(self, data, intervalos=()):
+        # Sem intervalos a data fica fechada (feriado, folga); com eles, substituem o expediente.
+        mascara = 0
+        for inicio, fim in intervalos:
+            mascara |= self._bits(inicio, fim)
+        self._excecoes[data] = mascara
+        self._versao += 1
+
+    def remover_excecao(self, data):
+        if self._excecoes.pop(data, None) is not None:
+            self._versao += 1
+
+    def mascara_semanal(self, dia):
+        return self._horarios.mascara(dia) & ~self._pausas.mascara(dia)
+
+    def mascara_data(self, data):
+        if data in self._excecoes:
+            return self._excecoes[data]
+        dia_semana = data.weekday()
+        if dia_semana >= len(DIAS_SEMANA):
+            return 0  # domingo
+        return self.mascara_semanal(DIAS_SEMANA[dia_semana])
+
+class AgendaDatada:
+    # Slots livres por data a partir de um ModeloDisponibilidade. As reservas
+    # ficam guardadas de forma esparsa (só as datas com reserva); uma semana só
+    # é materializada quando consultada, e as últimas semanas consultadas ficam
+    # em cache.
+    MAXIMO_SEMANAS = 104
+
+    def __init__(self, modelo, maximo_semanas=MAXIMO_SEMANAS):
+        self._modelo = modelo
+        self._maximo_semanas = maximo_semanas
+        self._reservados = {}
+        self._semanas = OrderedDict()
+        self._versao = modelo.versao
+        self._trava = threading.Lock()
+
+    @property
+    def modelo(self):
+        return self._modelo
+
+    @property
+    def semanas_materializadas(self):
+        return len(self._semanas)
+
+    def _bit(self, horario):
+        indice, resto = divmod(horario_para_minutos(horario), self._modelo.duracao_slot)
+        if resto:
+            raise ValueError("Horário inválido.")
+        return 1 << indice
+
+    def _conferir_versao(self):
+        # Chamado com self._trava: regras alteradas invalidam todas as semanas calculadas.
+        if self._versao != self._modelo.versao:
+            self._semanas.clear()
+            self._versao = self._modelo.versao
+
+    def _semana(self, segunda):
+        self._conferir_versao()
+        semana = self._semanas.get(segunda)
+        if semana is None:
+            semana = []
+            for deslocamento in range(7):
+                data = segunda + timedelta(days=deslocamento)
+                semana.append(self._modelo.mascara_data(data) & ~self._reservados.get(data, 0))
+            self._semanas[segunda] = semana
+            if len(self._semanas) > self._maximo_semanas:
+                self._semanas.popitem(last=False)
+        else:
+            self._semanas.move_to_end(segunda)
+        return semana
+
+    def mascara(self, data):
+        with self._trava:
+            return self._semana(data - timedelta(days=data.weekday()))[data.weekday()]
+
+    def horarios(self, data):
+        duracao = self._modelo.duracao_slot
+        return [minutos_para_horario(indice * duracao) for indice in bits_ligados(self.mascara(data))]
+
+    def esta_livre(self, data, horario):
+        return bool(self.mascara(data) & self._bit(horario))
+
+    def reservar_se_livre(self, data, horario):
+        # Não materializa a semana: confere direto nas regras e nas reservas da data.
+        bit = self._bit(horario)
+        with self._trava:
+            self._conferir_versao()
+            reservados = self._reservados.get(data, 0)
+            if not self._modelo.mascara_data(data) & ~reservados & bit:
+                return False
+            self._reservados[data] = reservados | bit
+            semana = self._semanas.get(data - timedelta(days=data.weekday()))
+            if semana is not None:
+                semana[data.weekday()] &= ~bit
+            return True
+
+    def liberar(self, data, horario):
+        bit = self._bit(horario)
+        with self._trava:
+            self._conferir_versao()
+            reservados = self._reservados.get(data, 0) & ~bit
+            if reservados:
+                self._reservados[data] = reservados
+            else:
+                self._reservados.pop(data, None)
+            semana = self._semanas.get(data - timedelta(days=data.weekday()))
+            if semana is not None:
+                semana[data.weekday()] |= bit & self._modelo.mascara_data(data)
+
+    def livres(self, inicio, fim):
+        # Gera (data, horários livres) de inicio até fim (inclusive), semana a semana, só quando consumido.
+        data = inicio
+        while data <= fim:
+            horarios = self.horarios(data)
+            if horarios:
+                yield data, horarios
+            data += timedelta(days=1)
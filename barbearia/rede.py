@@ -0,0 +1,48 @@
+from .agenda import horario_para_minutos
+
+class RedeBarbearias:
+    # Várias unidades, cada uma com sua própria Barbearia e seus barbeiros.
+    def __init__(self):
+        self._barbearias = {}
+
+    @property
+    def barbearias(self):
+        return list(self._barbearias.values())
+
+    def adicionar_barbearia(self, barbearia):
+        if barbearia.nome is None or barbearia.nome in self._barbearias:
+            raise ValueError("Nome de barbearia inválido ou já cadastrado.")
+        self._barbearias[barbearia.nome] = barbearia
+
+    def obter_barbearia(self, nome):
+        try:
+            return self._barbearias[nome]
+        except KeyError:
+            raise ValueError("Barbearia não encontrada.") from None
+
+    def barbeiros_livres(self, dia, horario, corte=None):
+        livres = []
+        for barbearia in self._barbearias.values():
+            barbeiro = barbearia.barbeiro_livre(dia, horario, corte)
+            if barbeiro is not None:
+                livres.append((barbearia, barbeiro))
+        return livres
+
+    def primeiro_horario_livre(self, dia, corte=None, a_partir_de=None):
+        melhor = None
+        for barbearia in self._barbearias.values():
+            encontrado = barbearia.primeiro_horario_livre(dia, corte, a_partir_de)
+            if encontrado is None:
+                continue
+            horario, barbeiro = encontrado
+            if melhor is None or horario_para_minutos(horario) < horario_para_minutos(melhor[0]):
+                melhor = (horario, barbearia, barbeiro)
+        return melhor
+
+    def reservar_horario(self, cliente, nome_barbearia=None):
+        if nome_barbearia is not None:
+            return self.obter_barbearia(nome_barbearia).reservar_horario(cliente)
+        for barbearia in sorted(self._barbearias.values(), key=lambda barbearia: len(barbearia.agendamentos)):
+            if barbearia.reservar_horario(cliente):
+                return barbearia
+        return None
@@ -0,0 +1,242 @@
+import argparse
+import os
+import sys
+from array import array
+
+from .agenda import DIAS_SEMANA, horario_para_minutos
+
+try:
+    import numpy
+except ImportError:  # O NumPy é opcional: sem ele os mesmos relatórios saem de laços em Python puro.
+    numpy = None
+
+# Relatórios gerenciais sobre o histórico de agendamentos. Os agendamentos são
+# guardados em colunas (array.array: um byte para o dia, um para a hora, um
+# double para o valor e códigos inteiros para corte, barbeiro e mês), e cada
+# relatório é um "group by" feito com numpy.bincount sobre essas colunas, que
+# o NumPy lê sem cópia.
+
+HORAS = 24
+SEM_MES = ""
+
+def _contar(codigos, quantidade, pesos=None):
+    # Soma de pesos (ou contagem) por código, de 0 a quantidade - 1.
+    if numpy is not None:
+        codigos = numpy.frombuffer(codigos, dtype=codigos.typecode) if isinstance(codigos, array) else codigos
+        if pesos is not None and isinstance(pesos, array):
+            pesos = numpy.frombuffer(pesos, dtype=pesos.typecode)
+        return numpy.bincount(codigos, weights=pesos, minlength=quantidade)[:quantidade].tolist()
+    totais = [0] * quantidade
+    if pesos is None:
+        for codigo in codigos:
+            totais[codigo] += 1
+    else:
+        for codigo, peso in zip(codigos, pesos):
+            totais[codigo] += peso
+    return totais
+
+class Codigos:
+    # Interna nomes (cortes, barbeiros, meses) como inteiros 0, 1, 2...
+    def __init__(self):
+        self._codigos = {}
+        self.nomes = []
+
+    def codigo(self, nome):
+        codigo = self._codigos.get(nome)
+        if codigo is None:
+            codigo = self._codigos[nome] = len(self.nomes)
+            self.nomes.append(nome)
+        return codigo
+
+    def buscar(self, nome):
+        # Código de um nome já visto, ou None (sem cadastrar).
+        return self._codigos.get(nome)
+
+    def __len__(self):
+        return len(self.nomes)
+
+class HistoricoAgendamentos:
+    def __init__(self):
+        self._dia = array("B")
+        self._hora = array("B")
+        self._valor = array("d")
+        self._corte = array("I")
+        self._barbeiro = array("I")
+        self._mes = array("I")
+        self._compareceu = array("B")
+        self.cortes = Codigos()
+        self.barbeiros = Codigos()
+        self.meses = Codigos()
+        self._indice_dia = {dia: indice for indice, dia in enumerate(DIAS_SEMANA)}
+        # Poucos horários distintos se repetem milhões de vezes; cada um é convertido uma vez.
+        self._horas = {}
+
+    def __len__(self):
+        return len(self._dia)
+
+    def adicionar(self, dia, horario, valor, corte, cpf_barbeiro, mes=SEM_MES, compareceu=True):
+        try:
+            indice_dia = self._indice_dia[dia]
+        except KeyError:
+            raise ValueError("Dia inválido.") from None
+        hora = self._horas.get(horario)
+        if hora is None:
+            hora = self._horas[horario] = horario_para_minutos(horario) // 60
+        self._dia.append(indice_dia)
+        self._hora.append(hora)
+        self._valor.append(valor)
+        self._corte.append(self.cortes.codigo(corte))
+        self._barbeiro.append(self.barbeiros.codigo(cpf_barbeiro))
+        self._mes.append(self.meses.codigo(mes))
+        self._compareceu.append(1 if compareceu else 0)
+
+    @classmethod
+    def da_barbearia(cls, barbearia):
+        historico = cls()
+        for agendamento in barbearia.agendamentos:
+            historico.adicionar(
+                agendamento.dia, agendamento.horario_desejado, agendamento.valor,
+                agendamento.corte_desejado, agendamento.cpf_barbeiro,
+            )
+        return historico
+
+    @classmethod
+    def de_registros(cls, registros, relatar=None):
+        # registros: pares (número da linha, dicionário) como os de importacao.ler_registros,
+        # com os campos de CAMPOS_CLIENTES e, opcionalmente, "mes" (AAAA-MM) e "compareceu".
+        historico = cls()
+        for numero, registro in registros:
+            try:
+                if registro is None:
+                    raise ValueError("Registro mal formado.")
+                faltando = [campo for campo in ("dia", "horario_desejado", "valor", "corte_desejado") if not registro.get(campo)]
+                if faltando:
+                    raise ValueError(f"Campo obrigatório ausente: {faltando[0]}.")
+                try:
+                    valor = float(registro["valor"])
+                except ValueError:
+                    raise ValueError("Valor inválido.") from None
+                compareceu = str(registro.get("compareceu", "1")).strip().lower() not in ("0", "false", "nao", "não")
+                historico.adicionar(
+                    registro["dia"], registro["horario_desejado"], valor, registro["corte_desejado"],
+                    registro.get("cpf_barbeiro") or "", registro.get("mes") or SEM_MES, compareceu,
+                )
+            except ValueError as erro:
+                if relatar is not None:
+                    relatar(numero, str(erro))
+        return historico
+
+    def _dia_hora(self):
+        if numpy is not None:
+            dia = numpy.frombuffer(self._dia, dtype=numpy.uint8).astype(numpy.intp)
+            return dia * HORAS + numpy.frombuffer(self._hora, dtype=numpy.uint8)
+        return [dia * HORAS + hora for dia, hora in zip(self._dia, self._hora)]
+
+    def ocupacao(self):
+        # {dia: [agendamentos às 0h, 1h, ..., 23h]}
+        contagem = _contar(self._dia_hora(), len(DIAS_SEMANA) * HORAS)
+        return {dia: [int(total) for total in contagem[indice * HORAS:(indice + 1) * HORAS]] for indice, dia in enumerate(DIAS_SEMANA)}
+
+    def horarios_de_pico(self, quantidade=5):
+        ocupacao = self.ocupacao()
+        celulas = [(total, dia, f"{hora}h") for dia, horas in ocupacao.items() for hora, total in enumerate(horas) if total]
+        return [(dia, horario, total) for total, dia, horario in sorted(celulas, key=lambda celula: -celula[0])[:quantidade]]
+
+    def receita_por_corte(self):
+        receita = _contar(self._corte, len(self.cortes), self._valor)
+        return dict(zip(self.cortes.nomes, receita))
+
+    def agendamentos_por_barbeiro(self):
+        return dict(zip(self.barbeiros.nomes, (int(total) for total in _contar(self._barbeiro, len(self.barbeiros)))))
+
+    def _barbeiro_corte(self):
+        cortes = len(self.cortes)
+        if numpy is not None:
+            barbeiro = numpy.frombuffer(self._barbeiro, dtype=self._barbeiro.typecode).astype(numpy.intp)
+            return barbeiro * cortes + numpy.frombuffer(self._corte, dtype=self._corte.typecode)
+        return [barbeiro * cortes + corte for barbeiro, corte in zip(self._barbeiro, self._corte)]
+
+    def utilizacao_barbeiros(self, barbearia):
+        # Fração dos slots oferecidos por cada barbeiro que foi agendada. Cada agendamento
+        # ocupa os slots seguidos que a duração do corte no catálogo pede na agenda do
+        # barbeiro, como na reserva: um corte de 90 minutos são dois slots de 60.
+        cortes = len(self.cortes)
+        contagem = _contar(self._barbeiro_corte(), len(self.barbeiros) * cortes)
+        duracoes = [barbearia.catalogo.duracao(corte) for corte in self.cortes.nomes]
+        utilizacao = {}
+        for barbeiro in barbearia.barbeiros:
+            codigo = self.barbeiros.buscar(barbeiro.cpf)
+            ocupados = 0
+            if codigo is not None:
+                por_corte = contagem[codigo * cortes:(codigo + 1) * cortes]
+                ocupados = int(sum(total * barbeiro.slots_para(duracao) for total, duracao in zip(por_corte, duracoes)))
+            livres = sum(barbeiro.calendario.quantidade_livres(dia) for dia in barbeiro.calendario.dias)
+            utilizacao[barbeiro.cpf] = ocupados / (ocupados + livres) if ocupados + livres else 0.0
+        return utilizacao
+
+    def faltas_por_mes(self):
+        # {mes: (agendamentos, faltas, taxa de faltas)}, em ordem de mês.
+        total = _contar(self._mes, len(self.meses))
+        if numpy is not None:
+            faltas_mascara = numpy.frombuffer(self._compareceu, dtype=numpy.uint8) == 0
+            faltas = _contar(numpy.frombuffer(self._mes, dtype=self._mes.typecode)[faltas_mascara], len(self.meses))
+        else:
+            faltas = _contar((mes for mes, veio in zip(self._mes, self._compareceu) if not veio), len(self.meses))
+        return {
+            mes: (int(total[codigo]), int(faltas[codigo]), faltas[codigo] / total[codigo] if total[codigo] else 0.0)
+            for mes, codigo in sorted((mes, codigo) for codigo, mes in enumerate(self.meses.nomes))
+        }
+
+def imprimir_relatorio(historico, barbearia=None, saida=sys.stdout):
+    print(f"{len(historico)} agendamentos ({'NumPy' if numpy is not None else 'Python puro'})", file=saida)
+    print("\nOcupação por dia e hora:", file=saida)
+    for dia, horas in historico.ocupacao().items():
+        ocupadas = ", ".join(f"{hora}h: {total}" for hora, total in enumerate(horas) if total)
+        print(f"  {dia}: {ocupadas or '-'}", file=saida)
+    print("\nHorários de pico:", file=saida)
+    for dia, horario, total in historico.horarios_de_pico():
+        print(f"  {dia} {horario}: {total}", file=saida)
+    print("\nReceita por corte:", file=saida)
+    for corte, receita in sorted(historico.receita_por_corte().items(), key=lambda item: -item[1]):
+        print(f"  {corte}: {receita:g} reais", file=saida)
+    if barbearia is not None:
+        print("\nUtilização por barbeiro:", file=saida)
+        for cpf, fracao in historico.utilizacao_barbeiros(barbearia).items():
+            print(f"  {barbearia.obter_barbeiro(cpf).nome}: {fracao:.0%}", file=saida)
+    faltas = historico.faltas_por_mes()
+    if any(mes != SEM_MES for mes in faltas):
+        print("\nFaltas por mês:", file=saida)
+        for mes, (agendamentos, quantidade, taxa) in faltas.items():
+            print(f"  {mes or '(sem mês)'}: {quantidade} de {agendamentos} ({taxa:.1%})", file=saida)
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatórios de ocupação, receita e faltas da barbearia.")
+    parser.add_argument("--historico", metavar="ARQUIVO",
+                        help="arquivo .csv ou .jsonl com o histórico; sem ele, usa os agendamentos do banco")
+    argumentos = parser.parse_args()
+    if argumentos.historico:
+        from .importacao import formato_do_arquivo, ler_registros
+
+        def relatar(numero, mensagem):
+            print(f"{argumentos.historico}:{numero}: {mensagem}", file=sys.stderr)
+
+        with open(argumentos.historico, newline="", encoding="utf-8") as arquivo:
+            historico = HistoricoAgendamentos.de_registros(ler_registros(arquivo, formato_do_arquivo(argumentos.historico)), relatar)
+        imprimir_relatorio(historico)
+        return
+
+    from .armazenamento import ArmazenamentoSQLite
+    from .barbearia import carregar_barbearia
+    from .cadastro import Cadastrar
+
+    armazenamento = ArmazenamentoSQLite(os.environ.get("BARBEARIA_DB", "barbearia.db"))
+    try:
+        barbearia = carregar_barbearia(armazenamento, Cadastrar(armazenamento))
+        if barbearia is None:
+            raise SystemExit("Nenhum barbeiro cadastrado no banco de dados.")
+        imprimir_relatorio(HistoricoAgendamentos.da_barbearia(barbearia), barbearia)
+    finally:
+        armazenamento.fechar()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import os
+from collections.abc import Mapping
+
+# Cortes oferecidos: nome, preço e duração em minutos. O catálogo padrão é
+# montado uma vez por processo (do arquivo em BARBEARIA_CATALOGO, se houver).
+SERVICOS_PADRAO = (
+    ("Americano", 15, 40),
+    ("Mullet", 15, 45),
+    ("Low Fade", 18, 75),
+    ("Social", 12, 30),
+)
+
+class Servico:
+    __slots__ = ("_nome", "_preco", "_duracao")
+
+    def __init__(self, nome, preco, duracao):
+        if duracao <= 0:
+            raise ValueError("Duração inválida.")
+        self._nome = nome
+        self._preco = preco
+        self._duracao = duracao
+
+    @property
+    def nome(self):
+        return self._nome
+
+    @property
+    def preco(self):
+        return self._preco
+
+    @property
+    def duracao(self):
+        return self._duracao
+
+    def __repr__(self):
+        return f"Servico({self._nome!r}, {self._preco!r}, {self._duracao!r})"
+
+class CatalogoServicos(Mapping):
+    # nome -> Servico, na ordem em que foram adicionados (a ordem do menu).
+    def __init__(self, servicos=()):
+        self._servicos = {}
+        for nome, preco, duracao in servicos:
+            self.adicionar(nome, preco, duracao)
+
+    @classmethod
+    def de_arquivo(cls, caminho):
+        # JSON: [{"nome": "Social", "preco": 12, "duracao": 30}, ...]
+        import json
+
+        with open(caminho, encoding="utf-8") as arquivo:
+            dados = json.load(arquivo)
+        try:
+            return cls((item["nome"], item["preco"], item["duracao"]) for item in dados)
+        except (KeyError, TypeError):
+            raise ValueError("Catálogo inválido.") from None
+
+    def adicionar(self, nome, preco, duracao):
+        if nome in self._servicos:
+            raise ValueError("Corte já cadastrado.")
+        servico = Servico(nome, preco, duracao)
+        self._servicos[nome] = servico
+        return servico
+
+    def obter(self, nome):
+        try:
+            return self._servicos[nome]
+        except KeyError:
+            raise ValueError("Corte não encontrado.") from None
+
+    def duracao(self, nome):
+        # None para cortes fora do catálogo: ocupam um slot do barbeiro, como antes.
+        servico = self._servicos.get(nome)
+        return None if servico is None else servico.duracao
+
+    def __getitem__(self, nome):
+        return self._servicos[nome]
+
+    def __iter__(self):
+        return iter(self._servicos)
+
+    def __len__(self):
+        return len(self._servicos)
+
+_padrao = None
+
+def catalogo_padrao():
+    global _padrao
+    if _padrao is None:
+        caminho = os.environ.get("BARBEARIA_CATALOGO")
+        _padrao = CatalogoServicos.de_arquivo(caminho) if caminho else CatalogoServicos(SERVICOS_PADRAO)
+    return _padrao
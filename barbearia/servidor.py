@@ -0,0 +1,421 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+from http import HTTPStatus
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .agenda import DIAS_SEMANA
+from .barbearia import Barbearia, carregar_barbearia, carregar_eventos
+from .cadastro import Cadastrar
+from .cpf import completar_cpf, validar_cpf
+from .eventos import RegistroEventos
+from . import metricas
+from .faturamento import CalcularSalarioBarbeiro
+from .modelos import Agendamento, Cliente
+from .permissoes import Permissao, PermissaoNegada, autorizado
+from .sessoes import Sessoes
+
+# Serviço HTTP/JSON sobre asyncio. As operações da Barbearia são rápidas e em
+# memória, então rodam direto no laço de eventos; só a gravação em disco é
+# agrupada e feita periodicamente.
+
+_registro = logging.getLogger(__name__)
+
+def _token(cabecalhos):
+    # O token de "Authorization: Bearer <token>", ou None.
+    esquema, _, token = (cabecalhos or {}).get("authorization", "").partition(" ")
+    return token.strip() if esquema.lower() == "bearer" else None
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem, detalhes=None):
+        super().__init__(mensagem)
+        self.status = status
+        self.detalhes = detalhes or {}
+
+class ServidorBarbearia:
+    INTERVALO_GRAVACAO = 0.05
+
+    def __init__(self, barbearia, cadastrar, armazenamento=None, eventos=None):
+        self._barbearia = barbearia
+        self._cadastrar = cadastrar
+        self._sessoes = Sessoes(cadastrar)
+        self._armazenamento = armazenamento
+        self._eventos = eventos
+        # Cada rota com a permissão exigida; None é rota livre, atendida sem sessão.
+        self._rotas = {
+            ("GET", "horarios"): (self._listar_horarios, Permissao.LISTAR_HORARIOS),
+            ("GET", "proximos"): (self._horarios_mais_proximos, Permissao.LISTAR_HORARIOS),
+            ("GET", "servicos"): (self._listar_servicos, None),
+            ("POST", "reservas"): (self._reservar_horario, Permissao.RESERVAR_HORARIO),
+            ("POST", "espera"): (self._entrar_na_espera, Permissao.RESERVAR_HORARIO),
+            ("DELETE", "espera"): (self._sair_da_espera, Permissao.RESERVAR_HORARIO),
+            ("PATCH", "clientes"): (self._editar_cliente, Permissao.EDITAR_CLIENTE),
+            ("DELETE", "clientes"): (self._excluir_cliente, Permissao.EXCLUIR_CLIENTE),
+            ("POST", "login"): (self._autenticar, None),
+            ("DELETE", "login"): (self._sair, None),
+            ("GET", "sessoes"): (self._estatisticas_sessoes, None),
+            ("GET", "faturamento"): (self._calcular_faturamento, Permissao.CALCULAR_LUCRO),
+            ("GET", "previsao"): (self._prever_ocupacao, Permissao.CALCULAR_LUCRO),
+            ("GET", "metricas"): (self._metricas, None),
+        }
+
+    async def iniciar(self, host="127.0.0.1", porta=8080):
+        servidor = await asyncio.start_server(self._atender, host, porta, backlog=4096)
+        if self._armazenamento is not None or self._eventos is not None:
+            asyncio.create_task(self._gravar_periodicamente())
+        return servidor
+
+    async def _gravar_periodicamente(self):
+        while True:
+            await asyncio.sleep(self.INTERVALO_GRAVACAO)
+            if self._armazenamento is not None:
+                self._armazenamento.confirmar()
+            if self._eventos is not None:
+                self._eventos.descarregar()
+
+    async def _atender(self, leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                metodo, alvo, versao = linha.decode("utf-8").split()
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b"\r\n", b"\n", b""):
+                        break
+                    nome, _, valor = linha.decode("latin-1").partition(":")
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+                tamanho = int(cabecalhos.get("content-length", 0))
+                corpo = await leitor.readexactly(tamanho) if tamanho else b""
+                status, resposta = self.despachar(metodo, alvo, corpo, cabecalhos)
+                manter = versao == "HTTP/1.1" and cabecalhos.get("connection", "").lower() != "close"
+                self._responder(escritor, status, resposta, manter)
+                await escritor.drain()
+                if not manter:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        except Exception:
+            _registro.exception("Erro ao atender a conexão")
+            try:
+                self._responder(escritor, HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": "Erro interno do servidor."}, False)
+                await escritor.drain()
+            except ConnectionError:
+                pass
+        finally:
+            escritor.close()
+
+    @staticmethod
+    def _responder(escritor, status, resposta, manter):
+        if isinstance(resposta, str):
+            # Texto puro: o formato de exposição do Prometheus.
+            tipo, dados = "text/plain; version=0.0.4", resposta.encode()
+        else:
+            tipo, dados = "application/json", json.dumps(resposta, ensure_ascii=False).encode()
+        escritor.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {tipo}; charset=utf-8\r\n"
+            f"Content-Length: {len(dados)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n".encode("latin-1") + dados
+        )
+
+    def despachar(self, metodo, alvo, corpo, cabecalhos=None):
+        partes = urlsplit(alvo)
+        caminho = [unquote(parte) for parte in partes.path.strip("/").split("/") if parte]
+        consulta = {nome: valores[-1] for nome, valores in parse_qs(partes.query).items()}
+        try:
+            rota, permissao = self._rotas.get((metodo, caminho[0] if caminho else ""), (None, None))
+            if rota is None:
+                raise ErroHTTP(HTTPStatus.NOT_FOUND, "Rota não encontrada.")
+            try:
+                dados = json.loads(corpo) if corpo else {}
+            except json.JSONDecodeError:
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, "JSON inválido.") from None
+            if not isinstance(dados, dict):
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, "O corpo deve ser um objeto JSON.")
+            token = _token(cabecalhos)
+            if permissao is None:
+                return rota(self._barbearia, caminho[1:], consulta, dados, None, token)
+            # Rotas protegidas: a sessão do cabeçalho Authorization decide o usuário,
+            # e a barbearia só é vista através das permissões dele.
+            usuario = self._sessoes.usuario(token)
+            if usuario is None:
+                raise ErroHTTP(HTTPStatus.UNAUTHORIZED, "Sessão inválida ou expirada.")
+            if not autorizado(usuario, permissao):
+                raise ErroHTTP(HTTPStatus.FORBIDDEN, "Usuário não tem permissão.")
+            try:
+                return rota(self._barbearia.como(usuario), caminho[1:], consulta, dados, usuario, token)
+            except PermissaoNegada as erro:
+                raise ErroHTTP(HTTPStatus.FORBIDDEN, str(erro)) from None
+        except ErroHTTP as erro:
+            return erro.status, {"erro": str(erro), **erro.detalhes}
+        except Exception:
+            # Falha inesperada numa rota: fica no log e o cliente recebe 500 em vez de ver a conexão cair.
+            _registro.exception("Erro ao atender %s %s", metodo, alvo)
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"erro": "Erro interno do servidor."}
+
+    def _listar_horarios(self, barbearia, caminho, consulta, dados, usuario, token):
+        dia = consulta.get("dia")
+        corte = consulta.get("corte")
+        try:
+            if corte is None:
+                horarios = barbearia.listar_horarios_disponiveis(dia)
+            else:
+                # Só os inícios em que a duração inteira do corte cabe.
+                horarios = barbearia.horarios_para_corte(dia, corte)
+            # Paginação opcional: ?inicio=0&quantidade=50; sem quantidade vem o dia todo.
+            inicio = int(consulta.get("inicio", 0))
+            quantidade = consulta.get("quantidade")
+            pagina = list(horarios) if quantidade is None else horarios.pagina(inicio, int(quantidade))
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+        return HTTPStatus.OK, {"dia": dia, "horarios": pagina, "total": len(horarios), "versao": horarios.versao}
+
+    def _listar_servicos(self, barbearia, caminho, consulta, dados, usuario, token):
+        servicos = [
+            {"nome": servico.nome, "preco": servico.preco, "duracao": servico.duracao}
+            for servico in barbearia.catalogo.values()
+        ]
+        return HTTPStatus.OK, {"servicos": servicos}
+
+    def _sugestoes(self, barbearia, dia, horario, quantidade=5, corte=None):
+        return [
+            {"dia": outro_dia, "horario": outro_horario, "cpf_barbeiro": barbeiro.cpf}
+            for outro_dia, outro_horario, barbeiro in barbearia.horarios_mais_proximos(dia, horario, quantidade, corte)
+        ]
+
+    def _horarios_mais_proximos(self, barbearia, caminho, consulta, dados, usuario, token):
+        try:
+            quantidade = int(consulta.get("k", 5))
+            sugestoes = self._sugestoes(barbearia, consulta.get("dia"), consulta.get("horario", ""), quantidade, consulta.get("corte"))
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+        return HTTPStatus.OK, {"sugestoes": sugestoes}
+
+    @staticmethod
+    def _texto(dados, campo, obrigatorio=True):
+        if campo not in dados:
+            if obrigatorio:
+                raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Campo obrigatório ausente: {campo}.")
+            return None
+        if not isinstance(dados[campo], str):
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, f"Campo inválido: {campo}.")
+        return dados[campo]
+
+    def _preco(self, corte):
+        try:
+            return self._barbearia.catalogo.obter(corte).preco
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+
+    @staticmethod
+    def _cpf(texto):
+        try:
+            return validar_cpf(texto)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+
+    def _agendamento(self, dados, usuario, cpf_barbeiro=None):
+        # O preço é o do catálogo; um "valor" enviado pelo cliente é ignorado.
+        # Numa sessão de cliente, quem reserva é o próprio usuário da sessão:
+        # o "cpf" do corpo, se vier, tem de ser o dele.
+        corte, dia, horario = (self._texto(dados, campo) for campo in ("corte_desejado", "dia", "horario_desejado"))
+        preco = self._preco(corte)
+        if usuario.PAPEL == Cliente.PAPEL:
+            cpf = self._texto(dados, "cpf", obrigatorio=False)
+            if cpf is not None and self._cpf(cpf) != usuario.cpf:
+                raise ErroHTTP(HTTPStatus.FORBIDDEN, "Usuário não tem permissão.")
+            return Agendamento(usuario, corte, preco, dia, horario, cpf_barbeiro)
+        cliente = Cliente(self._texto(dados, "nome"), self._cpf(self._texto(dados, "cpf")), corte, preco, dia, horario)
+        return Agendamento.do_cliente(cliente, cpf_barbeiro)
+
+    def _reservar_horario(self, barbearia, caminho, consulta, dados, usuario, token):
+        cpf_barbeiro = self._texto(dados, "cpf_barbeiro", obrigatorio=False)
+        agendamento = self._agendamento(dados, usuario, None if cpf_barbeiro is None else self._cpf(cpf_barbeiro))
+        dia, horario, corte = agendamento.dia, agendamento.horario_desejado, agendamento.corte_desejado
+        try:
+            agendamento = barbearia.agendar(agendamento)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+        if agendamento is None:
+            try:
+                sugestoes = self._sugestoes(barbearia, dia, horario, corte=corte)
+            except ValueError:
+                sugestoes = []
+            raise ErroHTTP(HTTPStatus.CONFLICT, "Horário indisponível.", {"sugestoes": sugestoes})
+        return HTTPStatus.CREATED, {"id_agendamento": agendamento.id_agendamento, "cpf_barbeiro": agendamento.cpf_barbeiro}
+
+    def _entrar_na_espera(self, barbearia, caminho, consulta, dados, usuario, token):
+        try:
+            pedido = barbearia.entrar_na_espera(self._agendamento(dados, usuario))
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+        agendamento = pedido.agendamento
+        if pedido.ativo:
+            return HTTPStatus.ACCEPTED, {"id_pedido": pedido.id_pedido, "na_fila": len(self._barbearia.lista_espera)}
+        return HTTPStatus.CREATED, {"id_agendamento": agendamento.id_agendamento, "cpf_barbeiro": agendamento.cpf_barbeiro}
+
+    def _sair_da_espera(self, barbearia, caminho, consulta, dados, usuario, token):
+        if len(caminho) != 1:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, "Rota não encontrada.")
+        try:
+            id_pedido = int(caminho[0])
+            # Um cliente só tira da fila os próprios pedidos.
+            pedido = self._barbearia.lista_espera.obter(id_pedido)
+            if pedido is not None and usuario.PAPEL == Cliente.PAPEL and pedido.agendamento.cpf != usuario.cpf:
+                raise ErroHTTP(HTTPStatus.FORBIDDEN, "Usuário não tem permissão.")
+            barbearia.sair_da_espera(id_pedido)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, str(erro)) from None
+        return HTTPStatus.OK, {"id_pedido": id_pedido}
+
+    def _editar_cliente(self, barbearia, caminho, consulta, dados, usuario, token):
+        if len(caminho) != 1:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, "Rota não encontrada.")
+        cpf = self._cpf(caminho[0])
+        campos = {campo: self._texto(dados, campo) for campo in ("nome", "corte_desejado") if campo in dados}
+        if "corte_desejado" in campos:
+            campos["valor"] = self._preco(campos["corte_desejado"])
+        try:
+            barbearia.editar_cliente(cpf, **campos)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, str(erro)) from None
+        return HTTPStatus.OK, {"cpf": cpf}
+
+    def _excluir_cliente(self, barbearia, caminho, consulta, dados, usuario, token):
+        if len(caminho) != 1:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, "Rota não encontrada.")
+        cpf = self._cpf(caminho[0])
+        try:
+            barbearia.excluir_cliente(cpf)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, str(erro)) from None
+        return HTTPStatus.OK, {"cpf": cpf}
+
+    def _autenticar(self, barbearia, caminho, consulta, dados, usuario, token):
+        usuario = self._sessoes.autenticar(self._cpf(self._texto(dados, "cpf")))
+        if not usuario:
+            raise ErroHTTP(HTTPStatus.UNAUTHORIZED, "CPF não encontrado.")
+        if not usuario.autenticavel:
+            raise ErroHTTP(HTTPStatus.FORBIDDEN, "Usuário não tem permissão.")
+        return HTTPStatus.OK, {
+            "nome": usuario.nome, "tipo": usuario.PAPEL, "permissoes": sorted(usuario.obter_permissoes()),
+            "token": self._sessoes.entrar(usuario.cpf), "expira_em_segundos": self._sessoes.ttl,
+        }
+
+    def _sair(self, barbearia, caminho, consulta, dados, usuario, token):
+        # O token vem do cabeçalho Authorization, como nas rotas protegidas.
+        if self._sessoes.usuario(token) is None:
+            raise ErroHTTP(HTTPStatus.UNAUTHORIZED, "Sessão inválida ou expirada.")
+        self._sessoes.sair(token)
+        return HTTPStatus.OK, {}
+
+    def _estatisticas_sessoes(self, barbearia, caminho, consulta, dados, usuario, token):
+        return HTTPStatus.OK, self._sessoes.estatisticas()
+
+    def _calcular_faturamento(self, barbearia, caminho, consulta, dados, usuario, token):
+        # Cada barbeiro vê só o próprio faturamento.
+        cpf_barbeiro = consulta.get("cpf_barbeiro")
+        if cpf_barbeiro is not None and self._cpf(cpf_barbeiro) != usuario.cpf:
+            raise ErroHTTP(HTTPStatus.FORBIDDEN, "Usuário não tem permissão.")
+        try:
+            barbeiro = self._barbearia.obter_barbeiro(usuario.cpf)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.NOT_FOUND, str(erro)) from None
+        lucro = CalcularSalarioBarbeiro(barbeiro, barbearia.faturamento)
+        return HTTPStatus.OK, {
+            "cpf_barbeiro": barbeiro.cpf,
+            "lucro": lucro.calcular_lucro(),
+            "atingiu_salario": lucro.verificar_lucro(),
+            "total_barbearia": barbearia.faturamento.total,
+        }
+
+    def _prever_ocupacao(self, barbearia, caminho, consulta, dados, usuario, token):
+        # Ocupação esperada por hora do dia e, dos horários ainda livres, os que devem ficar ociosos.
+        dia = consulta.get("dia")
+        corte = consulta.get("corte")
+        previsao = barbearia.previsao
+        try:
+            limite = float(consulta.get("limite", 0.5))
+            livres = barbearia.listar_horarios_disponiveis(dia)
+            ociosos = previsao.ociosos(dia, livres, limite)
+        except ValueError as erro:
+            raise ErroHTTP(HTTPStatus.BAD_REQUEST, str(erro)) from None
+        return HTTPStatus.OK, {
+            "dia": dia,
+            "periodo": previsao.periodo,
+            "ocupacao": previsao.tabela(corte)[dia],
+            "ociosos": [{"horario": horario, "probabilidade": chance} for horario, chance in ociosos],
+        }
+
+    def _metricas(self, barbearia, caminho, consulta, dados, usuario, token):
+        return HTTPStatus.OK, metricas.texto_prometheus()
+
+def barbearia_demonstracao(barbeiros):
+    # Barbearia só em memória, com todos os barbeiros livres das 8h às 20h.
+    cadastrar = Cadastrar()
+    barbearia = None
+    for numero in range(barbeiros):
+        cpf = completar_cpf(f"{numero + 1:09d}")
+        cadastrar.cadastrar_barbeiro(f"Barbeiro {numero}", cpf, 1000)
+        barbeiro = cadastrar.usuarios[cpf]
+        for dia in DIAS_SEMANA:
+            barbeiro.adicionar_intervalo_livre(dia, "8h", "20h")
+        if barbearia is None:
+            barbearia = Barbearia(barbeiro, cadastrar=cadastrar)
+        else:
+            barbearia.adicionar_barbeiro(barbeiro)
+    return barbearia, cadastrar
+
+async def servir(servidor, host, porta):
+    async with await servidor.iniciar(host, porta) as tcp:
+        print(f"Servindo em http://{host}:{porta}", flush=True)
+        await tcp.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serviço HTTP/JSON da barbearia.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8080)
+    parser.add_argument("--demonstracao", type=int, metavar="BARBEIROS",
+                        help="usa uma barbearia em memória com esse número de barbeiros")
+    parser.add_argument("--eventos", metavar="ARQUIVO",
+                        help="com --demonstracao, registra as mutações nesse log e o recupera ao reiniciar")
+    parser.add_argument("--metricas", action="store_true",
+                        help="mede as operações da barbearia e as expõe em GET /metricas")
+    argumentos = parser.parse_args()
+    if argumentos.metricas:
+        metricas.ativar()
+    armazenamento = None
+    eventos = None
+    if argumentos.demonstracao and argumentos.eventos:
+        eventos = RegistroEventos(argumentos.eventos)
+        cadastrar = Cadastrar()
+        barbearia = carregar_eventos(eventos, cadastrar)
+        if barbearia is None:
+            barbearia, cadastrar = barbearia_demonstracao(argumentos.demonstracao)
+            barbearia.registrar_eventos(eventos)
+    elif argumentos.demonstracao:
+        barbearia, cadastrar = barbearia_demonstracao(argumentos.demonstracao)
+    else:
+        from .armazenamento import ArmazenamentoSQLite
+        armazenamento = ArmazenamentoSQLite(os.environ.get("BARBEARIA_DB", "barbearia.db"))
+        cadastrar = Cadastrar(armazenamento)
+        barbearia = carregar_barbearia(armazenamento, cadastrar)
+        if barbearia is None:
+            raise SystemExit("Nenhum barbeiro cadastrado no banco de dados.")
+    try:
+        asyncio.run(servir(ServidorBarbearia(barbearia, cadastrar, armazenamento, eventos), argumentos.host, argumentos.porta))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if armazenamento is not None:
+            armazenamento.fechar()
+        if eventos is not None:
+            eventos.fechar()
+
+if __name__ == "__main__":
+    main()
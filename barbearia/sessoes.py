@@ -0,0 +1,153 @@
+import secrets
+import time
+from collections import OrderedDict
+
+from .cpf import texto_cpf
+
+# Sessões por token sobre o cadastro. Os usuários autenticados ficam num cache
+# LRU de tamanho fixo, para que cada requisição não volte ao banco; as sessões
+# expiram pelo TTL e também são limitadas em quantidade.
+
+class CacheLRU:
+    def __init__(self, capacidade, ao_descartar=None):
+        if capacidade <= 0:
+            raise ValueError("A capacidade deve ser positiva.")
+        self._capacidade = capacidade
+        self._itens = OrderedDict()
+        self._ao_descartar = ao_descartar
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.invalidacoes = 0
+
+    @property
+    def capacidade(self):
+        return self._capacidade
+
+    def obter(self, chave):
+        try:
+            valor = self._itens[chave]
+        except KeyError:
+            self.falhas += 1
+            return None
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return valor
+
+    def guardar(self, chave, valor):
+        self._itens[chave] = valor
+        self._itens.move_to_end(chave)
+        if len(self._itens) > self._capacidade:
+            chave_antiga, valor_antigo = self._itens.popitem(last=False)
+            self.descartes += 1
+            if self._ao_descartar is not None:
+                self._ao_descartar(chave_antiga, valor_antigo)
+
+    def invalidar(self, chave):
+        valor = self._itens.pop(chave, None)
+        if valor is not None:
+            self.invalidacoes += 1
+        return valor
+
+    def estatisticas(self):
+        return {
+            "itens": len(self._itens), "capacidade": self._capacidade, "acertos": self.acertos,
+            "falhas": self.falhas, "descartes": self.descartes, "invalidacoes": self.invalidacoes,
+        }
+
+    def __len__(self):
+        return len(self._itens)
+
+    def __contains__(self, chave):
+        return chave in self._itens
+
+class Sessao:
+    __slots__ = ("_token", "_cpf", "_expira_em")
+
+    def __init__(self, token, cpf, expira_em):
+        self._token = token
+        self._cpf = cpf
+        self._expira_em = expira_em
+
+    @property
+    def token(self):
+        return self._token
+
+    @property
+    def cpf(self):
+        return self._cpf
+
+    @property
+    def expira_em(self):
+        return self._expira_em
+
+class Sessoes:
+    TTL = 30 * 60
+
+    def __init__(self, cadastrar, ttl=TTL, capacidade_usuarios=1024, capacidade_sessoes=4096, relogio=time.monotonic):
+        self._usuarios = cadastrar.usuarios
+        self._ttl = ttl
+        self._relogio = relogio
+        self._cache = CacheLRU(capacidade_usuarios)
+        self._sessoes = CacheLRU(capacidade_sessoes, self._sessao_descartada)
+        # cpf -> tokens abertos, para derrubar as sessões de um CPF sem varrer tudo.
+        self._tokens_por_cpf = {}
+        cadastrar.observar_remocao(self.invalidar)
+
+    @property
+    def ttl(self):
+        return self._ttl
+
+    def autenticar(self, cpf):
+        # Mesmo contrato de Login.autenticar, mas servido pelo cache (pelo texto canônico do CPF).
+        chave = texto_cpf(cpf)
+        usuario = self._cache.obter(chave)
+        if usuario is None:
+            usuario = self._usuarios.get(cpf)
+            if usuario is not None:
+                self._cache.guardar(chave, usuario)
+        return usuario
+
+    def entrar(self, cpf):
+        if self.autenticar(cpf) is None:
+            return None
+        token = secrets.token_hex(16)
+        chave = texto_cpf(cpf)
+        self._sessoes.guardar(token, Sessao(token, chave, self._relogio() + self._ttl))
+        self._tokens_por_cpf.setdefault(chave, set()).add(token)
+        return token
+
+    def usuario(self, token):
+        # O usuário da sessão, ou None se o token não existe, expirou ou o usuário do CPF foi removido ou substituído.
+        sessao = self._sessoes.obter(token)
+        if sessao is None:
+            return None
+        if sessao.expira_em <= self._relogio():
+            self.sair(token)
+            return None
+        return self.autenticar(sessao.cpf)
+
+    def sair(self, token):
+        sessao = self._sessoes.invalidar(token)
+        if sessao is not None:
+            self._esquecer_token(sessao.cpf, token)
+
+    def invalidar(self, cpf):
+        # Tira o usuário do cache e encerra só as sessões dele.
+        chave = texto_cpf(cpf)
+        self._cache.invalidar(chave)
+        for token in self._tokens_por_cpf.pop(chave, ()):
+            self._sessoes.invalidar(token)
+
+    def _sessao_descartada(self, token, sessao):
+        self._esquecer_token(sessao.cpf, token)
+
+    def _esquecer_token(self, cpf, token):
+        tokens = self._tokens_por_cpf.get(cpf)
+        if tokens is not None:
+            tokens.discard(token)
+            if not tokens:
+                del self._tokens_por_cpf[cpf]
+
+    def estatisticas(self):
+        return {"usuarios": self._cache.estatisticas(), "sessoes": self._sessoes.estatisticas()}
@@ -0,0 +1,109 @@
+import os
+import sys
+
+# Desenho das telas da CLI com sequências ANSI, sem chamar "clear" num shell a
+# cada menu. Tudo o que é impresso entre um novo_quadro() e a próxima leitura
+# do teclado (input() chama flush) forma um quadro; na hora de mostrar, só as
+# linhas diferentes do quadro anterior são reescritas. Isso depende de cada
+# linha do quadro ocupar uma linha da janela: quadro mais alto que a janela ou
+# linha mais larga que ela é desenhado inteiro, do topo, e rola como texto comum.
+
+ESC = "\x1b["
+
+class Tela:
+    def __init__(self, saida, terminal=None):
+        self._saida = saida
+        self._terminal = saida.isatty() if terminal is None else terminal
+        self._quadro = []
+        # Linhas hoje na tela (None: tela ainda não desenhada) e as linhas de
+        # prompt, onde o eco do que foi digitado fica fora do nosso controle.
+        self._na_tela = None
+        self._prompts = []
+        self.quadros = 0
+        self.linhas_reescritas = 0
+
+    @classmethod
+    def instalar(cls):
+        # Num terminal passa a ser o sys.stdout; fora dele (arquivo, pipe) a saída segue sem ANSI.
+        tela = cls(sys.stdout)
+        if tela.terminal:
+            sys.stdout = tela
+        return tela
+
+    @property
+    def terminal(self):
+        return self._terminal
+
+    @property
+    def encoding(self):
+        return getattr(self._saida, "encoding", "utf-8")
+
+    def isatty(self):
+        return self._terminal
+
+    def novo_quadro(self):
+        if self._terminal:
+            self._quadro = []
+            # No quadro seguinte as linhas de prompt precisam ser redesenhadas.
+            if self._na_tela is not None:
+                for numero in self._prompts:
+                    self._na_tela[numero] = None
+            self._prompts = []
+
+    def write(self, texto):
+        if not self._terminal:
+            return self._saida.write(texto)
+        self._quadro.append(texto)
+        return len(texto)
+
+    def flush(self):
+        if self._terminal:
+            self.apresentar()
+        self._saida.flush()
+
+    def _cabe(self, linhas):
+        # Sem tamanho conhecido (saída que não é um terminal de verdade), vale o desenho por posição.
+        try:
+            colunas, altura = os.get_terminal_size(self._saida.fileno())
+        except (AttributeError, ValueError, OSError):
+            return True
+        return len(linhas) <= altura and all(len(linha) <= colunas for linha in linhas)
+
+    def apresentar(self):
+        linhas = "".join(self._quadro).split("\n")
+        if not self._cabe(linhas):
+            # As posições absolutas sairiam erradas depois da rolagem: limpa e escreve
+            # o quadro como texto, e o próximo quadro também começa do zero.
+            self._saida.write(f"{ESC}H{ESC}2J" + "\n".join(linhas))
+            self.linhas_reescritas += len(linhas)
+            self._na_tela = None
+            self._prompts = []
+            self._concluir(linhas)
+            return
+        partes = []
+        if self._na_tela is None:
+            partes.append(f"{ESC}H{ESC}2J")
+            self._na_tela = []
+        anteriores = self._na_tela
+        # A última linha é sempre reescrita: é ela que deixa o cursor no lugar certo.
+        for numero, linha in enumerate(linhas[:-1]):
+            if numero >= len(anteriores) or anteriores[numero] != linha:
+                partes.append(f"{ESC}{numero + 1};1H{linha}{ESC}K")
+                self.linhas_reescritas += 1
+        if len(anteriores) > len(linhas):
+            partes.append(f"{ESC}{len(linhas) + 1};1H{ESC}J")
+        partes.append(f"{ESC}{len(linhas)};1H{linhas[-1]}{ESC}K")
+        self.linhas_reescritas += 1
+        self._saida.write("".join(partes))
+        self._na_tela = linhas
+        if linhas[-1]:
+            self._prompts.append(len(linhas) - 1)
+        self._concluir(linhas)
+
+    def _concluir(self, linhas):
+        self.quadros += 1
+        texto = "".join(self._quadro)
+        if linhas[-1]:
+            # Terminou num prompt: o Enter do usuário leva o cursor para a linha seguinte.
+            texto += "\n"
+        self._quadro = [texto]
@@ -0,0 +1,122 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from barbearia.cpf import completar_cpf
+
+DIAS = ["Segunda", "Terça", "Quarta", "Quinta", "Sexta", "Sábado"]
+HORARIOS = [f"{hora}h" for hora in range(8, 20)]
+
+# Gerador de carga para barbearia.servidor: muitas conexões keep-alive
+# simultâneas, misturando consultas de horários, reservas e faturamento. Cada
+# conexão entra como o primeiro barbeiro da demonstração e usa o token dele.
+
+BARBEIRO = completar_cpf(f"{1:09d}")
+
+async def requisitar(leitor, escritor, metodo, alvo, corpo=None, token=None):
+    dados = b"" if corpo is None else json.dumps(corpo).encode()
+    autorizacao = "" if token is None else f"Authorization: Bearer {token}\r\n"
+    escritor.write(
+        f"{metodo} {alvo} HTTP/1.1\r\nHost: localhost\r\n{autorizacao}Content-Length: {len(dados)}\r\n\r\n".encode() + dados
+    )
+    status = int((await leitor.readline()).split()[1])
+    tamanho = 0
+    while True:
+        linha = await leitor.readline()
+        if linha == b"\r\n":
+            break
+        nome, _, valor = linha.decode("latin-1").partition(":")
+        if nome.lower() == "content-length":
+            tamanho = int(valor)
+    return status, await leitor.readexactly(tamanho)
+
+async def cliente(numero, host, porta, fim, latencias, contagem):
+    aleatorio = random.Random(numero)
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    sequencia = 0
+    _, resposta = await requisitar(leitor, escritor, "POST", "/login", {"cpf": BARBEIRO})
+    token = json.loads(resposta)["token"]
+    try:
+        while time.perf_counter() < fim:
+            sorteio = aleatorio.random()
+            inicio = time.perf_counter()
+            if sorteio < 0.6:
+                status, _ = await requisitar(leitor, escritor, "GET", f"/horarios?dia={quote(aleatorio.choice(DIAS))}", token=token)
+            elif sorteio < 0.95:
+                sequencia += 1
+                status, _ = await requisitar(leitor, escritor, "POST", "/reservas", {
+                    "nome": "Carga", "cpf": completar_cpf(f"{numero:03d}{sequencia % 10 ** 6:06d}"), "corte_desejado": "Social", "valor": 12,
+                    "dia": aleatorio.choice(DIAS), "horario_desejado": aleatorio.choice(HORARIOS),
+                }, token)
+            else:
+                status, _ = await requisitar(leitor, escritor, "GET", "/faturamento", token=token)
+            latencias.append(time.perf_counter() - inicio)
+            contagem[status] = contagem.get(status, 0) + 1
+    finally:
+        escritor.close()
+
+async def gerar_carga(host, porta, conexoes, segundos):
+    latencias = []
+    contagem = {}
+    fim = time.perf_counter() + segundos
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(numero, host, porta, fim, latencias, contagem) for numero in range(conexoes)))
+    return latencias, contagem, time.perf_counter() - inicio
+
+async def esperar_porta(host, porta, limite=10):
+    prazo = time.perf_counter() + limite
+    while True:
+        try:
+            _, escritor = await asyncio.open_connection(host, porta)
+            escritor.close()
+            return
+        except OSError:
+            if time.perf_counter() > prazo:
+                raise
+            await asyncio.sleep(0.05)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--conexoes", type=int, default=1000)
+    parser.add_argument("--segundos", type=float, default=5)
+    parser.add_argument("--barbeiros", type=int, default=50)
+    parser.add_argument("--externo", action="store_true", help="não inicia o servidor; usa um já em execução")
+    argumentos = parser.parse_args()
+
+    processo = None
+    if not argumentos.externo:
+        processo = subprocess.Popen(
+            [sys.executable, "-m", "barbearia.servidor", "--host", argumentos.host,
+             "--porta", str(argumentos.porta), "--demonstracao", str(argumentos.barbeiros)],
+            cwd=RAIZ, stdout=subprocess.DEVNULL,
+        )
+    try:
+        asyncio.run(esperar_porta(argumentos.host, argumentos.porta))
+        latencias, contagem, duracao = asyncio.run(
+            gerar_carga(argumentos.host, argumentos.porta, argumentos.conexoes, argumentos.segundos)
+        )
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+    latencias.sort()
+    percentil = lambda p: latencias[min(len(latencias) - 1, int(p * len(latencias)))] * 1000
+    print(f"{argumentos.conexoes} conexões, {len(latencias)} requisições em {duracao:.1f} s: {len(latencias) / duracao:.0f} req/s")
+    print(f"latência: mediana {statistics.median(latencias) * 1000:.1f} ms, p95 {percentil(0.95):.1f} ms, p99 {percentil(0.99):.1f} ms")
+    print("respostas por status:", dict(sorted(contagem.items())))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA, Barbearia, Barbeiro, Cliente, horario_para_minutos, minutos_para_horario
+
+# Vários terminais disputando os mesmos slots: mede vazão por número de
+# threads e confere que nenhum slot foi reservado duas vezes.
+
+def montar_barbearia(barbeiros, duracao_slot):
+    barbearia = None
+    for numero in range(barbeiros):
+        barbeiro = Barbeiro(f"Barbeiro {numero}", f"b{numero}", 1000, duracao_slot)
+        for dia in DIAS_SEMANA:
+            barbeiro.adicionar_intervalo_livre(dia, "8h", "20h")
+        if barbearia is None:
+            barbearia = Barbearia(barbeiro)
+        else:
+            barbearia.adicionar_barbeiro(barbeiro)
+    return barbearia
+
+def total_livres(barbearia):
+    return sum(barbeiro.calendario.quantidade_livres(dia) for barbeiro in barbearia.barbeiros for dia in DIAS_SEMANA)
+
+def rodar(threads, barbeiros, duracao_slot, tentativas, semente):
+    barbearia = montar_barbearia(barbeiros, duracao_slot)
+    livres_iniciais = total_livres(barbearia)
+    horarios = list(barbearia.barbeiro.horarios_livres["Segunda"])
+    sucessos = [0] * threads
+    cancelados = [0] * threads
+    largada = threading.Barrier(threads)
+
+    def trabalhador(numero):
+        aleatorio = random.Random(semente + numero)
+        largada.wait()
+        for tentativa in range(tentativas):
+            cpf = f"{numero}-{tentativa}"
+            cliente = Cliente("Cliente", cpf, "Social", 12, aleatorio.choice(DIAS_SEMANA), aleatorio.choice(horarios))
+            if barbearia.reservar_horario(cliente):
+                sucessos[numero] += 1
+                if aleatorio.random() < 0.2:
+                    barbearia.excluir_cliente(cpf)
+                    cancelados[numero] += 1
+
+    trabalhadores = [threading.Thread(target=trabalhador, args=(numero,)) for numero in range(threads)]
+    inicio = time.perf_counter()
+    for trabalhador_ in trabalhadores:
+        trabalhador_.start()
+    for trabalhador_ in trabalhadores:
+        trabalhador_.join()
+    duracao = time.perf_counter() - inicio
+
+    agendamentos = barbearia.listar_clientes()
+    # Cada agendamento ocupa o bloco de slots da duração do corte no catálogo.
+    slots = set()
+    ocupados = 0
+    for cliente in agendamentos:
+        barbeiro = barbearia.obter_barbeiro(cliente.cpf_barbeiro)
+        inicio = horario_para_minutos(cliente.horario_desejado)
+        for indice in range(barbeiro.slots_para(barbearia.catalogo.duracao(cliente.corte_desejado))):
+            slots.add((cliente.cpf_barbeiro, cliente.dia, minutos_para_horario(inicio + indice * barbeiro.duracao_slot)))
+            ocupados += 1
+    if len(slots) != ocupados:
+        raise AssertionError("Slot reservado mais de uma vez.")
+    if len(agendamentos) != sum(sucessos) - sum(cancelados):
+        raise AssertionError("Quantidade de agendamentos não confere com as reservas.")
+    if total_livres(barbearia) + ocupados != livres_iniciais:
+        raise AssertionError("Slots livres e agendamentos não somam o total inicial.")
+    for cpf_barbeiro, dia, horario in slots:
+        if barbearia.obter_barbeiro(cpf_barbeiro).horario_livre(dia, horario):
+            raise AssertionError("Slot agendado continua livre.")
+    return threads * tentativas / duracao, len(agendamentos)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--barbeiros", type=int, default=8)
+    parser.add_argument("--duracao-slot", type=int, default=15)
+    parser.add_argument("--tentativas", type=int, default=5000)
+    parser.add_argument("--semente", type=int, default=42)
+    argumentos = parser.parse_args()
+    for threads in argumentos.threads:
+        vazao, agendados = rodar(threads, argumentos.barbeiros, argumentos.duracao_slot, argumentos.tentativas, argumentos.semente)
+        print(f"{threads:3d} threads: {vazao:10.0f} tentativas/s, {agendados} agendamentos, nenhum slot duplicado")
+
+if __name__ == "__main__":
+    main()
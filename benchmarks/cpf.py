@@ -0,0 +1,52 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia.cpf import _numpy, completar_cpf, formatar_cpf, texto_cpf, validar_cpf, validar_lote
+
+# Validação de CPFs em massa (um por um contra o lote, que usa o NumPy quando
+# instalado) e o custo de consultar o índice pelo texto canônico, com e sem
+# passar o texto recebido por texto_cpf.
+
+def cronometrar(rotulo, funcao, registros):
+    inicio = time.perf_counter()
+    funcao()
+    segundos = time.perf_counter() - inicio
+    print(f"  {rotulo:<36} {segundos / registros * 1e9:8.0f} ns/registro   ({segundos:.2f} s)")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--registros", type=int, default=1_000_000)
+    argumentos = parser.parse_args()
+    aleatorio = random.Random(7)
+    cpfs = [completar_cpf(f"{aleatorio.randrange(10 ** 9):09d}") for _ in range(argumentos.registros)]
+    # Um terço com pontuação e 1% com dígito verificador errado, como numa planilha real.
+    for indice in range(0, len(cpfs), 3):
+        cpfs[indice] = formatar_cpf(cpfs[indice])
+    for indice in range(0, len(cpfs), 100):
+        cpfs[indice] = cpfs[indice][:-1] + str((int(cpfs[indice][-1]) + 1) % 10)
+
+    def um_por_um():
+        for cpf in cpfs:
+            try:
+                validar_cpf(cpf)
+            except ValueError:
+                pass
+
+    print(f"{len(cpfs)} CPFs ({'com' if _numpy() is not None else 'sem'} NumPy):")
+    cronometrar("validar_cpf um por um", um_por_um, len(cpfs))
+    cronometrar("validar_lote", lambda: validar_lote(cpfs), len(cpfs))
+
+    textos = [f"{chave:011d}" for chave in validar_lote(cpfs) if chave is not None]
+    por_texto = dict.fromkeys(textos)
+    consultas = [aleatorio.randrange(len(textos)) for _ in range(len(textos))]
+    # Textos novos a cada consulta, como chegam da CLI ou do HTTP (sem hash em cache).
+    cronometrar("índice (texto recebido)", lambda: [por_texto["".join(textos[i])] for i in consultas], len(consultas))
+    cronometrar("índice (texto_cpf do texto recebido)", lambda: [por_texto[texto_cpf("".join(textos[i]))] for i in consultas], len(consultas))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA, Barbearia, Barbeiro, horario_para_minutos, minutos_para_horario
+
+# Onde cabe um serviço de N minutos: consulta às tabelas de encaixe dos
+# barbeiros contra a varredura dos horários livres conferindo cada bloco, e o
+# custo de manter as tabelas a cada reserva e liberação.
+
+DURACAO_SLOT = 15
+
+def montar(barbeiros, ocupacao, semente):
+    aleatorio = random.Random(semente)
+    barbearia = None
+    for numero in range(barbeiros):
+        barbeiro = Barbeiro(f"Barbeiro {numero}", f"b{numero}", 1000, DURACAO_SLOT)
+        for dia in DIAS_SEMANA:
+            barbeiro.adicionar_intervalo_livre(dia, "8h", "20h")
+            for minuto in range(8 * 60, 20 * 60, DURACAO_SLOT):
+                if aleatorio.random() < ocupacao:
+                    barbeiro.remover_horario_livre(dia, minutos_para_horario(minuto))
+        if barbearia is None:
+            barbearia = Barbearia(barbeiro)
+        else:
+            barbearia.adicionar_barbeiro(barbeiro)
+    return barbearia
+
+def varrendo(barbearia, dia, corte):
+    duracao = barbearia.catalogo.duracao(corte)
+    inicios = set()
+    for barbeiro in barbearia.barbeiros:
+        if not barbeiro.faz_corte(corte):
+            continue
+        livres = barbeiro.horarios_livres[dia]
+        slots = barbeiro.slots_para(duracao)
+        for horario in livres:
+            minuto = horario_para_minutos(horario)
+            if all(minutos_para_horario(minuto + indice * DURACAO_SLOT) in livres for indice in range(1, slots)):
+                inicios.add(minuto)
+    return [minutos_para_horario(minuto) for minuto in sorted(inicios)]
+
+def cronometrar(rotulo, funcao, vezes):
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        funcao()
+    segundos = time.perf_counter() - inicio
+    print(f"  {rotulo:<40} {segundos / vezes * 1e6:9.1f} µs")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--barbeiros", type=int, default=20)
+    parser.add_argument("--ocupacao", type=float, default=0.6)
+    argumentos = parser.parse_args()
+    barbearia = montar(argumentos.barbeiros, argumentos.ocupacao, 7)
+    cortes = list(barbearia.catalogo)
+    consultas = [(dia, corte) for dia in DIAS_SEMANA for corte in cortes]
+    for dia, corte in consultas:
+        if barbearia.horarios_para_corte(dia, corte) != varrendo(barbearia, dia, corte):
+            raise AssertionError("Tabela de encaixes diverge da varredura.")
+
+    print(f"{argumentos.barbeiros} barbeiros, slots de {DURACAO_SLOT} min, {argumentos.ocupacao:.0%} ocupados:")
+    indice = iter(range(10**9))
+    cronometrar("onde cabe o corte (tabela de encaixes)", lambda: barbearia.horarios_para_corte(*consultas[next(indice) % len(consultas)]), 2000)
+    cronometrar("onde cabe o corte (varredura)", lambda: varrendo(barbearia, *consultas[next(indice) % len(consultas)]), 100)
+
+    # Reserva e liberação de um slot com as tabelas das quatro durações já montadas.
+    barbeiro = barbearia.barbeiro
+    livres = [(dia, horario) for dia in DIAS_SEMANA for horario in barbeiro.horarios_livres[dia]]
+
+    def reservar_e_liberar():
+        dia, horario = livres[next(indice) % len(livres)]
+        barbeiro.ocupar_horario_livre(dia, horario)
+        barbeiro.adicionar_horario_livre(dia, horario)
+
+    cronometrar("reservar + liberar (mantendo as tabelas)", reservar_e_liberar, 20000)
+
+if __name__ == "__main__":
+    main()
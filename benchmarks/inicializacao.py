@@ -0,0 +1,42 @@
+import os
+import statistics
+import subprocess
+import sys
+
+# Mede o custo de "import barbearia" (uso como biblioteca) em processos novos.
+ORCAMENTO_MS = 50
+REPETICOES = 15
+PROIBIDOS = ("barbearia.cli", "barbearia.menu", "sqlite3")
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODIGO = """
+import sys, time
+inicio = time.perf_counter()
+import barbearia
+fim = time.perf_counter()
+print((fim - inicio) * 1000)
+print(",".join(nome for nome in {proibidos!r} if nome in sys.modules))
+""".format(proibidos=PROIBIDOS)
+
+def medir():
+    saida = subprocess.run(
+        [sys.executable, "-c", CODIGO], cwd=RAIZ, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+    carregados = saida[1] if len(saida) > 1 else ""
+    return float(saida[0]), carregados
+
+def main():
+    tempos = []
+    for _ in range(REPETICOES):
+        tempo, carregados = medir()
+        if carregados:
+            print(f"Módulos que deveriam ser preguiçosos foram importados: {carregados}")
+            return 1
+        tempos.append(tempo)
+    mediana = statistics.median(tempos)
+    print(f"import barbearia: mediana {mediana:.2f} ms, mínimo {min(tempos):.2f} ms (orçamento {ORCAMENTO_MS} ms)")
+    return 0 if mediana <= ORCAMENTO_MS else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA, Agendamento, Barbearia, Barbeiro, Cliente
+
+# Bytes por reserva: a representação antiga (um Cliente com __dict__ copiado a
+# cada reserva) contra a atual (Agendamento com __slots__ apontando para o Cliente).
+
+class ClienteComDict:
+    # Réplica do Cliente antigo, sem __slots__.
+    def __init__(self, nome, cpf, corte_desejado, valor, dia, horario_desejado):
+        self._nome = nome
+        self._cpf = cpf
+        self._corte_desejado = corte_desejado
+        self._valor = valor
+        self._dia = dia
+        self._horario_desejado = horario_desejado
+        self._id_agendamento = None
+        self._cpf_barbeiro = None
+
+HORARIOS = [f"{hora}h" for hora in range(24)]
+
+def reservas(quantidade, clientes):
+    for numero in range(quantidade):
+        yield numero % clientes, DIAS_SEMANA[numero // 24 % len(DIAS_SEMANA)], HORARIOS[numero % 24]
+
+def medir(construir):
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    objetos = construir()
+    fim = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return fim - inicio, objetos
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reservas", type=int, default=200_000)
+    parser.add_argument("--clientes", type=int, default=20_000)
+    argumentos = parser.parse_args()
+    total, quantidade_clientes = argumentos.reservas, argumentos.clientes
+    nomes = [(f"Cliente {numero}", f"{numero:011d}") for numero in range(quantidade_clientes)]
+
+    def antigo():
+        return [ClienteComDict(*nomes[numero], "Social", 12, dia, horario) for numero, dia, horario in reservas(total, quantidade_clientes)]
+
+    def atual():
+        clientes = [Cliente(nome, cpf, "Social", 12, "Segunda", "8h") for nome, cpf in nomes]
+        return clientes, [Agendamento(clientes[numero], "Social", 12, dia, horario) for numero, dia, horario in reservas(total, quantidade_clientes)]
+
+    def barbearia_completa():
+        barbeiros = []
+        for numero in range(total // (24 * len(DIAS_SEMANA)) + 1):
+            barbeiro = Barbeiro(f"Barbeiro {numero}", f"b{numero}", 1000)
+            for dia in DIAS_SEMANA:
+                barbeiro.adicionar_intervalo_livre(dia, "0h", "24h")
+            barbeiros.append(barbeiro)
+        barbearia = Barbearia(barbeiros[0])
+        for barbeiro in barbeiros[1:]:
+            barbearia.adicionar_barbeiro(barbeiro)
+        clientes = [Cliente(nome, cpf, "Social", 12, "Segunda", "8h") for nome, cpf in nomes]
+        for numero, dia, horario in reservas(total, quantidade_clientes):
+            barbearia.reservar_horario(Agendamento(clientes[numero], "Social", 12, dia, horario))
+        return barbearia
+
+    bytes_antigo, _ = medir(antigo)
+    bytes_atual, _ = medir(atual)
+    bytes_barbearia, barbearia = medir(barbearia_completa)
+    print(f"{total} reservas de {quantidade_clientes} clientes")
+    print(f"Cliente com __dict__ por reserva:      {bytes_antigo / total:7.1f} bytes/reserva")
+    print(f"Agendamento com __slots__ + Cliente:   {bytes_atual / total:7.1f} bytes/reserva")
+    print(f"Barbearia completa (com índices):      {bytes_barbearia / total:7.1f} bytes/reserva ({len(barbearia.agendamentos)} reservas)")
+
+if __name__ == "__main__":
+    main()
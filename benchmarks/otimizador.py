@@ -0,0 +1,86 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA, Barbeiro, Cliente, horario_para_minutos
+from barbearia.otimizador import Solicitacao, otimizar
+
+# Receita e ocupação de um lote de pedidos distribuído pelo otimizador, contra
+# a ordem de chegada (cada cliente fica com o primeiro horário preferido que
+# ainda estiver livre, como na reserva manual), variando tentativas e processos.
+
+CORTES = [("Social", 30, 30), ("Degradê", 35, 45), ("Barba", 20, 15), ("Navalhado", 50, 60)]
+
+def montar(barbeiros, pedidos, semente):
+    aleatorio = random.Random(semente)
+    equipe = []
+    for numero in range(barbeiros):
+        cortes = None if numero % 3 else ["Social", "Barba"]
+        barbeiro = Barbeiro(f"Barbeiro {numero}", f"b{numero}", 1000, 15, cortes)
+        for dia in DIAS_SEMANA:
+            barbeiro.adicionar_intervalo_livre(dia, "8h", "12h")
+            barbeiro.adicionar_intervalo_livre(dia, "13h", "18h")
+        equipe.append(barbeiro)
+    solicitacoes = []
+    for numero in range(pedidos):
+        corte, valor, duracao = aleatorio.choice(CORTES)
+        opcoes = []
+        for _ in range(aleatorio.randint(1, 3)):
+            dia = aleatorio.choice(DIAS_SEMANA)
+            opcoes.append((dia, f"{aleatorio.randrange(8, 18)}h{aleatorio.choice(['', '15', '30', '45'])}"))
+        if aleatorio.random() < 0.3:
+            opcoes.append((aleatorio.choice(DIAS_SEMANA), None))
+        cliente = Cliente(f"Cliente {numero}", f"c{numero}", corte, valor, opcoes[0][0], opcoes[0][1])
+        solicitacoes.append(Solicitacao(cliente, opcoes, duracao))
+    return equipe, solicitacoes
+
+def por_ordem_de_chegada(equipe, solicitacoes):
+    ocupados = {}
+    receita = 0
+    for solicitacao in solicitacoes:
+        for dia, horario in solicitacao.opcoes:
+            if horario is None:
+                continue
+            inicio = horario_para_minutos(horario) // 15
+            slots = -(-solicitacao.duracao // 15)
+            bloco = ((1 << slots) - 1) << inicio
+            barbeiro = next((barbeiro for barbeiro in equipe if barbeiro.faz_corte(solicitacao.cliente.corte_desejado)
+                             and barbeiro.calendario.mascara(dia) & ~ocupados.get((barbeiro.cpf, dia), 0) & bloco == bloco), None)
+            if barbeiro is not None:
+                ocupados[barbeiro.cpf, dia] = ocupados.get((barbeiro.cpf, dia), 0) | bloco
+                receita += solicitacao.cliente.valor
+                break
+    return receita, sum(bin(mascara).count("1") for mascara in ocupados.values())
+
+def ocupacao(plano):
+    return sum(-(-solicitacao.duracao // barbeiro.duracao_slot) for solicitacao, barbeiro, _, _ in plano.alocacoes)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--barbeiros", type=int, default=10)
+    parser.add_argument("--pedidos", type=int, default=2500)
+    parser.add_argument("--tentativas", type=int, default=8)
+    argumentos = parser.parse_args()
+    equipe, solicitacoes = montar(argumentos.barbeiros, argumentos.pedidos, 7)
+    capacidade = sum(barbeiro.calendario.quantidade_livres(dia) for barbeiro in equipe for dia in DIAS_SEMANA)
+    print(f"{len(solicitacoes)} pedidos, {len(equipe)} barbeiros, {capacidade} slots de 15 min livres")
+
+    receita, slots = por_ordem_de_chegada(equipe, solicitacoes)
+    print(f"  {'ordem de chegada':<34} receita {receita:7d}   ocupação {slots / capacidade:6.1%}")
+    nucleos = os.cpu_count() or 1
+    configuracoes = [(1, 1), (1, argumentos.tentativas)]
+    if nucleos > 1:
+        configuracoes.append((nucleos, argumentos.tentativas * nucleos))
+    for processos, tentativas in configuracoes:
+        inicio = time.perf_counter()
+        plano = otimizar(solicitacoes, equipe, processos=processos, tentativas=tentativas)
+        segundos = time.perf_counter() - inicio
+        rotulo = f"otimizador {tentativas} tentativas, {processos} proc."
+        print(f"  {rotulo:<34} receita {plano.receita:7d}   ocupação {ocupacao(plano) / capacidade:6.1%}   {segundos:6.2f} s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA
+from barbearia import relatorios
+from barbearia.previsao import PrevisaoOcupacao
+from barbearia.relatorios import HistoricoAgendamentos
+
+# Previsão de ocupação: montagem da tabela a partir do histórico em colunas,
+# atualização a cada agendamento novo e consulta, contra recalcular a
+# ocupação do histórico inteiro a cada consulta.
+
+CORTES = [("Social", 12), ("Degradê", 15), ("Low Fade", 18), ("Barba", 10), ("Navalhado", 20)]
+
+def cronometrar(rotulo, funcao, vezes=1):
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        resultado = funcao()
+    segundos = (time.perf_counter() - inicio) / vezes
+    print(f"  {rotulo:<40} {segundos * 1e6:12.2f} µs")
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agendamentos", type=int, default=1_000_000)
+    argumentos = parser.parse_args()
+    aleatorio = random.Random(7)
+    horarios = [f"{hora}h" for hora in range(8, 20)]
+    meses = [f"2024-{mes:02d}" for mes in range(1, 13)]
+    historico = HistoricoAgendamentos()
+    for _ in range(argumentos.agendamentos):
+        corte, valor = aleatorio.choice(CORTES)
+        historico.adicionar(
+            aleatorio.choice(DIAS_SEMANA), aleatorio.choice(horarios), valor, corte,
+            "b", aleatorio.choice(meses), aleatorio.random() > 0.08,
+        )
+
+    print(f"{argumentos.agendamentos} agendamentos em {len(meses)} meses, {'NumPy' if relatorios.numpy is not None else 'Python puro (NumPy ausente)'}")
+    previsao = cronometrar("montar a tabela do histórico", lambda: PrevisaoOcupacao.de_historico(historico))
+    consultas = [(aleatorio.choice(DIAS_SEMANA), aleatorio.choice(horarios), aleatorio.choice(CORTES)[0]) for _ in range(1000)]
+    proxima = iter(range(10 ** 9))
+
+    def registrar():
+        dia, horario, corte = consultas[next(proxima) % len(consultas)]
+        previsao.registrar(dia, horario, corte)
+
+    def consultar():
+        dia, horario, corte = consultas[next(proxima) % len(consultas)]
+        return previsao.ocupacao_esperada(dia, horario, corte)
+
+    cronometrar("registrar um agendamento novo", registrar, 100_000)
+    cronometrar("consultar ocupação esperada (tabela)", consultar, 100_000)
+    cronometrar("ociosos de um dia (12 horários livres)", lambda: previsao.ociosos("Segunda", horarios), 10_000)
+    cronometrar("ocupação recalculada do histórico", historico.ocupacao, 3)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA, horario_para_minutos
+from barbearia.servidor import barbearia_demonstracao
+
+# Busca dos horários livres mais próximos e atendimento da lista de espera,
+# contra a varredura de todos os slots e de todos os pedidos.
+
+def mais_proximos_varrendo(barbearia, dia, horario, quantidade):
+    alvo = DIAS_SEMANA.index(dia) * 1440 + horario_para_minutos(horario)
+    livres = [
+        (abs(indice * 1440 + horario_para_minutos(outro) - alvo), outro_dia, outro)
+        for indice, outro_dia in enumerate(DIAS_SEMANA)
+        for outro in barbearia.listar_horarios_disponiveis(outro_dia)
+    ]
+    return sorted(livres)[:quantidade]
+
+def cronometrar(rotulo, funcao, vezes):
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        funcao()
+    segundos = time.perf_counter() - inicio
+    print(f"  {rotulo:<34} {segundos / vezes * 1e6:9.1f} µs")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--barbeiros", type=int, default=50)
+    parser.add_argument("--pedidos", type=int, default=100_000)
+    argumentos = parser.parse_args()
+    aleatorio = random.Random(7)
+    barbearia, _ = barbearia_demonstracao(argumentos.barbeiros)
+    # Semana quase cheia: só alguns slots espalhados continuam livres.
+    for barbeiro in barbearia.barbeiros:
+        for dia in DIAS_SEMANA:
+            for hora in range(8, 20):
+                if aleatorio.random() < 0.97:
+                    barbeiro.remover_horario_livre(dia, f"{hora}h")
+
+    print(f"{argumentos.barbeiros} barbeiros, semana 97% ocupada:")
+    consultas = [(aleatorio.choice(DIAS_SEMANA), f"{aleatorio.randrange(8, 20)}h") for _ in range(200)]
+    indice = iter(range(10**9))
+    cronometrar("5 mais próximos (heap por dia)", lambda: barbearia.horarios_mais_proximos(*consultas[next(indice) % 200], 5), 2000)
+    cronometrar("5 mais próximos (varredura)", lambda: mais_proximos_varrendo(barbearia, *consultas[next(indice) % 200], 5), 200)
+
+    espera = barbearia.lista_espera
+    from barbearia.modelos import Agendamento, Cliente
+    for numero in range(argumentos.pedidos):
+        dia, horario = aleatorio.choice(DIAS_SEMANA), f"{aleatorio.randrange(8, 20)}h"
+        espera.adicionar(Agendamento.do_cliente(Cliente(f"C{numero}", f"c{numero}", "Corte", 30, dia, horario)))
+    pedidos = list(espera)
+    print(f"\n{len(espera)} pedidos na lista de espera:")
+    cronometrar("atender slot liberado (heap)", lambda: espera.devolver(espera.retirar(*consultas[next(indice) % 200])), 20000)
+
+    def varrer():
+        dia, horario = consultas[next(indice) % 200]
+        return min((pedido for pedido in pedidos if pedido.agendamento.dia == dia and pedido.agendamento.horario_desejado == horario),
+                   key=lambda pedido: pedido.id_pedido, default=None)
+
+    cronometrar("atender slot liberado (varredura)", varrer, 50)
+
+if __name__ == "__main__":
+    main()
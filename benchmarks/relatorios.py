@@ -0,0 +1,50 @@
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA
+from barbearia import relatorios
+from barbearia.relatorios import HistoricoAgendamentos
+
+# Tempo de carga do histórico em colunas e de cada relatório sobre ele.
+
+CORTES = [("Social", 12), ("Degradê", 15), ("Low Fade", 18), ("Barba", 10), ("Navalhado", 20)]
+
+def cronometrar(rotulo, funcao):
+    inicio = time.perf_counter()
+    resultado = funcao()
+    print(f"  {rotulo:<26} {(time.perf_counter() - inicio) * 1000:9.1f} ms")
+    return resultado
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agendamentos", type=int, default=1_000_000)
+    parser.add_argument("--barbeiros", type=int, default=50)
+    argumentos = parser.parse_args()
+    aleatorio = random.Random(7)
+    horarios = [f"{hora}h" for hora in range(8, 20)]
+    meses = [f"2024-{mes:02d}" for mes in range(1, 13)]
+
+    def carregar():
+        historico = HistoricoAgendamentos()
+        for _ in range(argumentos.agendamentos):
+            corte, valor = aleatorio.choice(CORTES)
+            historico.adicionar(
+                aleatorio.choice(DIAS_SEMANA), aleatorio.choice(horarios), valor, corte,
+                f"b{aleatorio.randrange(argumentos.barbeiros)}", aleatorio.choice(meses), aleatorio.random() > 0.08,
+            )
+        return historico
+
+    print(f"{argumentos.agendamentos} agendamentos, {'NumPy' if relatorios.numpy is not None else 'Python puro (NumPy ausente)'}")
+    historico = cronometrar("carga em colunas", carregar)
+    cronometrar("ocupação dia x hora", historico.ocupacao)
+    cronometrar("receita por corte", historico.receita_por_corte)
+    cronometrar("agendamentos por barbeiro", historico.agendamentos_por_barbeiro)
+    cronometrar("faltas por mês", historico.faltas_por_mes)
+
+if __name__ == "__main__":
+    main()
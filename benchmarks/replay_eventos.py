@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import DIAS_SEMANA, RegistroEventos
+from barbearia.barbearia import carregar_eventos
+from barbearia.cpf import completar_cpf
+from barbearia.servidor import barbearia_demonstracao
+
+# Velocidade de replay do log de eventos (eventos/s) e tempo de recuperação
+# com e sem snapshots periódicos. Cada reserva gera dois eventos (máscara e
+# agendamento); uma em cada dez é excluída em seguida, gerando mais dois.
+
+HORARIOS = [f"{hora}h" for hora in range(8, 20)]
+
+def gerar_log(caminho, reservas, eventos_por_snapshot):
+    barbeiros = reservas // (len(HORARIOS) * len(DIAS_SEMANA)) + 1
+    barbearia, cadastrar = barbearia_demonstracao(barbeiros)
+    registro = RegistroEventos(caminho, eventos_por_snapshot=eventos_por_snapshot)
+    barbearia.registrar_eventos(registro)
+    equipe = barbearia.barbeiros
+    inicio = time.perf_counter()
+    for numero in range(reservas):
+        dia = DIAS_SEMANA[numero // len(HORARIOS) % len(DIAS_SEMANA)]
+        # Faixa separada da dos barbeiros da demonstração, que começam em 000000001.
+        cpf = completar_cpf(f"{numero + 10 ** 8:09d}")
+        cadastrar.cadastrar_cliente(f"Cliente {numero}", cpf, "Social", 12, dia, HORARIOS[numero % len(HORARIOS)])
+        # Barbeiro explícito: o benchmark mede o log, não a escolha do barbeiro.
+        barbearia.agendar(cadastrar.usuarios[cpf], equipe[numero // (len(HORARIOS) * len(DIAS_SEMANA))].cpf)
+        if numero % 10 == 9:
+            barbearia.excluir_cliente(cpf)
+    registro.fechar()
+    return registro.sequencia, time.perf_counter() - inicio
+
+def recuperar(caminho):
+    inicio = time.perf_counter()
+    registro = RegistroEventos(caminho)
+    barbearia = carregar_eventos(registro)
+    registro.fechar()
+    return time.perf_counter() - inicio, len(barbearia.agendamentos)
+
+def eventos_no_log(caminho):
+    with open(caminho, encoding="utf-8") as arquivo:
+        return sum(1 for _ in arquivo)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--reservas", type=int, default=100_000)
+    parser.add_argument("--eventos-por-snapshot", type=int, default=RegistroEventos.EVENTOS_POR_SNAPSHOT)
+    argumentos = parser.parse_args()
+    with tempfile.TemporaryDirectory() as pasta:
+        for rotulo, intervalo in (("sem snapshot", 10 ** 12), ("com snapshot", argumentos.eventos_por_snapshot)):
+            caminho = os.path.join(pasta, rotulo.replace(" ", "_") + ".log")
+            total, segundos_gravacao = gerar_log(caminho, argumentos.reservas, intervalo)
+            replay = eventos_no_log(caminho)
+            segundos, agendamentos = recuperar(caminho)
+            print(f"{rotulo}: {total} eventos gravados em {segundos_gravacao:.2f} s ({total / segundos_gravacao:,.0f} eventos/s)")
+            print(f"  log com {os.path.getsize(caminho) / 1024:,.0f} KiB e {replay} eventos após o último snapshot")
+            print(f"  recuperação em {segundos * 1000:.0f} ms, {agendamentos} agendamentos")
+            if intervalo > total:
+                print(f"  replay: {replay / segundos:,.0f} eventos/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,240 @@
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import (
+    DIAS_SEMANA, Barbearia, Barbeiro, Cadastrar, CalcularSalarioBarbeiro, CatalogoServicos, Cliente, minutos_para_horario,
+)
+from barbearia.cpf import completar_cpf
+
+# Suíte reprodutível dos caminhos quentes da agenda, em barbearias sintéticas
+# de 10 a 1 milhão de agendamentos. Cada operação é cronometrada em lotes,
+# com o estado restaurado fora do tempo medido; o resultado vai para um JSON
+# e é comparado com a linha de base gravada (falha se alguma operação ficou
+# mais lenta que a tolerância).
+
+PASTA = os.path.dirname(os.path.abspath(__file__))
+LINHA_BASE = os.path.join(PASTA, "linha_base.json")
+RESULTADOS = os.path.join(PASTA, "resultados.json")
+TAMANHOS = (10, 100, 1_000, 10_000, 100_000, 1_000_000)
+
+DURACAO_SLOT = 15
+INICIO, FIM = 8 * 60, 20 * 60
+SLOTS_DIA = (FIM - INICIO) // DURACAO_SLOT
+# Fração dos slots deixada livre para as reservas medidas.
+FOLGA = 0.25
+CORTES = (("Social", 30), ("Degradê", 35), ("Barba", 20))
+# Diferenças abaixo disso são ruído de medição, mesmo quando grandes em proporção.
+MARGEM_US = 0.5
+
+class Loja:
+    # Uma barbearia sintética: barbeiros com a semana das 8h às 20h e
+    # 'agendamentos' clientes espalhados por eles, com slots de sobra.
+    def __init__(self, agendamentos, semente=7):
+        self.aleatorio = random.Random(semente)
+        por_barbeiro = len(DIAS_SEMANA) * SLOTS_DIA
+        quantidade = max(1, -(-int(agendamentos * (1 + FOLGA)) // por_barbeiro))
+        self.cadastrar = Cadastrar()
+        self.barbearia = None
+        for numero in range(quantidade):
+            barbeiro = Barbeiro(f"Barbeiro {numero}", f"b{numero}", 1000, DURACAO_SLOT)
+            self.cadastrar.usuarios[barbeiro.cpf] = barbeiro
+            for dia in DIAS_SEMANA:
+                barbeiro.adicionar_intervalo_livre(dia, minutos_para_horario(INICIO), minutos_para_horario(FIM))
+            if self.barbearia is None:
+                # Catálogo vazio: cada reserva ocupa um slot, como na linha de base.
+                self.barbearia = Barbearia(barbeiro, cadastrar=self.cadastrar, catalogo=CatalogoServicos())
+            else:
+                self.barbearia.adicionar_barbeiro(barbeiro)
+        self.clientes = 0
+        slots = [
+            (barbeiro.cpf, dia, minutos_para_horario(INICIO + indice * DURACAO_SLOT))
+            for barbeiro in self.barbearia.barbeiros for dia in DIAS_SEMANA for indice in range(SLOTS_DIA)
+        ]
+        self.aleatorio.shuffle(slots)
+        for cpf_barbeiro, dia, horario in slots[:agendamentos]:
+            self.agendar(dia, horario, cpf_barbeiro)
+        self.livres = slots[agendamentos:]
+
+    def novo_cliente(self, dia, horario):
+        self.clientes += 1
+        corte, valor = CORTES[self.clientes % len(CORTES)]
+        return Cliente(f"Cliente {self.clientes}", f"c{self.clientes}", corte, valor, dia, horario)
+
+    def agendar(self, dia, horario, cpf_barbeiro=None):
+        cliente = self.novo_cliente(dia, horario)
+        self.cadastrar.usuarios[cliente.cpf] = cliente
+        return self.barbearia.agendar(cliente, cpf_barbeiro)
+
+    def cpfs_agendados(self, quantidade):
+        agendamentos = list(self.barbearia.agendamentos)
+        return [agendamento.cpf for agendamento in self.aleatorio.sample(agendamentos, min(quantidade, len(agendamentos)))]
+
+def cronometrar(operacao, preparar, restaurar, lote, repeticoes):
+    # Tempo por chamada (µs) de cada repetição; preparar() e restaurar() ficam fora da medição.
+    tempos = []
+    for _ in range(repeticoes):
+        argumentos = preparar(lote)
+        gc.disable()
+        inicio = time.perf_counter()
+        for argumento in argumentos:
+            operacao(*argumento)
+        segundos = time.perf_counter() - inicio
+        gc.enable()
+        restaurar(argumentos)
+        tempos.append(segundos / len(argumentos) * 1e6)
+    return {"mediana_us": statistics.median(tempos), "minimo_us": min(tempos), "chamadas": len(argumentos)}
+
+def medir_loja(loja, lote, repeticoes):
+    barbearia, cadastrar = loja.barbearia, loja.cadastrar
+    resultados = {}
+
+    def reservas(quantidade):
+        clientes = []
+        for _ in range(min(quantidade, len(loja.livres))):
+            _, dia, horario = loja.livres.pop()
+            cliente = loja.novo_cliente(dia, horario)
+            cadastrar.usuarios[cliente.cpf] = cliente
+            clientes.append((cliente,))
+        return clientes
+
+    def desfazer_reservas(argumentos):
+        for (cliente,) in argumentos:
+            agendamento = barbearia.agendamentos.primeiro_por_cpf(cliente.cpf)
+            barbearia.excluir_cliente(cliente.cpf)
+            loja.livres.append((agendamento.cpf_barbeiro, agendamento.dia, agendamento.horario_desejado))
+
+    resultados["reservar_horario"] = cronometrar(barbearia.reservar_horario, reservas, desfazer_reservas, lote, repeticoes)
+
+    def dias(quantidade):
+        return [(DIAS_SEMANA[indice % len(DIAS_SEMANA)],) for indice in range(quantidade)]
+
+    resultados["listar_horarios_disponiveis"] = cronometrar(
+        lambda dia: list(barbearia.listar_horarios_disponiveis(dia)), dias, lambda argumentos: None, lote, repeticoes,
+    )
+
+    def edicoes(quantidade):
+        return [(cpf, loja.aleatorio.choice(CORTES)[1]) for cpf in loja.cpfs_agendados(quantidade)]
+
+    resultados["editar_cliente"] = cronometrar(
+        lambda cpf, valor: barbearia.editar_cliente(cpf, valor=valor), edicoes, lambda argumentos: None, lote, repeticoes,
+    )
+
+    def exclusoes(quantidade):
+        escolhidos = []
+        for cpf in loja.cpfs_agendados(quantidade):
+            agendamento = barbearia.agendamentos.primeiro_por_cpf(cpf)
+            escolhidos.append((cpf, agendamento.dia, agendamento.horario_desejado, agendamento.cpf_barbeiro))
+        return escolhidos
+
+    def reagendar(argumentos):
+        for _, dia, horario, cpf_barbeiro in argumentos:
+            loja.agendar(dia, horario, cpf_barbeiro)
+
+    resultados["excluir_cliente"] = cronometrar(
+        lambda cpf, dia, horario, cpf_barbeiro: barbearia.excluir_cliente(cpf), exclusoes, reagendar, lote, repeticoes,
+    )
+
+    def cadastros(quantidade):
+        return [
+            (f"Novo {numero}", completar_cpf(f"{numero + 1:09d}"), "Social", 30, "Segunda", "8h")
+            for numero in range(quantidade)
+        ]
+
+    def descadastrar(argumentos):
+        for argumento in argumentos:
+            cadastrar.remover_usuario(argumento[1])
+
+    resultados["cadastrar_cliente"] = cronometrar(cadastrar.cadastrar_cliente, cadastros, descadastrar, lote, repeticoes)
+    resultados["existe_barbeiro_cadastrado"] = cronometrar(
+        cadastrar.existe_barbeiro_cadastrado, lambda quantidade: [()] * quantidade, lambda argumentos: None, lote, repeticoes,
+    )
+
+    def lucros(quantidade):
+        barbeiros = barbearia.barbeiros
+        return [(CalcularSalarioBarbeiro(loja.aleatorio.choice(barbeiros), barbearia.faturamento),) for _ in range(quantidade)]
+
+    resultados["calcular_lucro"] = cronometrar(
+        lambda calculo: calculo.calcular_lucro(), lucros, lambda argumentos: None, lote, repeticoes,
+    )
+    return resultados
+
+def rodar(tamanhos, lote, repeticoes):
+    resultados = {}
+    for tamanho in tamanhos:
+        inicio = time.perf_counter()
+        loja = Loja(tamanho)
+        montagem = time.perf_counter() - inicio
+        print(f"{tamanho:>9} agendamentos, {len(loja.barbearia.barbeiros)} barbeiros (montagem {montagem:.1f} s)")
+        for operacao, medida in medir_loja(loja, lote, repeticoes).items():
+            resultados.setdefault(operacao, {})[str(tamanho)] = medida
+            print(f"  {operacao:<28} mediana {medida['mediana_us']:10.2f} µs   mínimo {medida['minimo_us']:10.2f} µs")
+        del loja
+        gc.collect()
+    return resultados
+
+def comparar(resultados, linha_base, tolerancia):
+    # Regressões: operações cujo mínimo passou do mínimo da linha de base em mais que a tolerância (e que MARGEM_US).
+    regressoes = []
+    for operacao, por_tamanho in resultados.items():
+        for tamanho, medida in por_tamanho.items():
+            base = linha_base.get(operacao, {}).get(tamanho)
+            if base is None:
+                continue
+            razao = medida["minimo_us"] / base["minimo_us"] if base["minimo_us"] else 1.0
+            if razao > 1 + tolerancia and medida["minimo_us"] - base["minimo_us"] > MARGEM_US:
+                regressoes.append((operacao, tamanho, base["minimo_us"], medida["minimo_us"], razao))
+    return regressoes
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks dos caminhos quentes da agenda.")
+    parser.add_argument("--tamanhos", default=",".join(map(str, TAMANHOS)),
+                        help="quantidades de agendamentos das barbearias sintéticas, separadas por vírgula")
+    parser.add_argument("--lote", type=int, default=200, help="chamadas por repetição")
+    parser.add_argument("--repeticoes", type=int, default=7)
+    parser.add_argument("--saida", default=RESULTADOS, help="arquivo JSON com os resultados desta execução")
+    parser.add_argument("--linha-base", default=LINHA_BASE)
+    parser.add_argument("--gravar-linha-base", action="store_true", help="grava os resultados como nova linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.5,
+                        help="aumento relativo tolerado sobre a linha de base (0.5 = 50%% mais lento)")
+    argumentos = parser.parse_args()
+
+    tamanhos = [int(tamanho) for tamanho in argumentos.tamanhos.split(",")]
+    documento = {
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "lote": argumentos.lote,
+        "repeticoes": argumentos.repeticoes,
+        "resultados": rodar(tamanhos, argumentos.lote, argumentos.repeticoes),
+    }
+    with open(argumentos.saida, "w", encoding="utf-8") as arquivo:
+        json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+    print(f"\nResultados gravados em {argumentos.saida}")
+
+    if argumentos.gravar_linha_base:
+        with open(argumentos.linha_base, "w", encoding="utf-8") as arquivo:
+            json.dump(documento, arquivo, ensure_ascii=False, indent=2)
+        print(f"Linha de base gravada em {argumentos.linha_base}")
+        return 0
+    if not os.path.exists(argumentos.linha_base):
+        print("Sem linha de base para comparar (use --gravar-linha-base).")
+        return 0
+    with open(argumentos.linha_base, encoding="utf-8") as arquivo:
+        linha_base = json.load(arquivo)["resultados"]
+    regressoes = comparar(documento["resultados"], linha_base, argumentos.tolerancia)
+    for operacao, tamanho, antes, depois, razao in regressoes:
+        print(f"REGRESSÃO {operacao} com {tamanho} agendamentos: {antes:.2f} µs -> {depois:.2f} µs ({razao:.2f}x)")
+    if not regressoes:
+        print(f"Nenhuma regressão acima de {argumentos.tolerancia:.0%} em relação à linha de base.")
+    return 1 if regressoes else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
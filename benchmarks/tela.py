@@ -0,0 +1,87 @@
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import menu
+from barbearia.cpf import completar_cpf
+from barbearia.tela import Tela
+
+# Quadros por segundo e processos criados numa sessão roteirizada da CLI: a
+# Tela (ANSI, só as linhas alteradas) contra o clear_screen antigo, que
+# chamava os.system("clear") a cada menu.
+
+# Cadastra um barbeiro e uma cliente, entra como barbeiro, navega e sai.
+BARBEIRO = completar_cpf("000000100")
+CLIENTE = completar_cpf("000000200")
+ROTEIRO = (
+    ["1", "Joao", BARBEIRO, "500"] + ["8", "18"] * 6 + [""]
+    + ["2", "Ana", CLIENTE, "3", "1", "2", ""]
+    + ["3", BARBEIRO] + ["1", "1", "", "3", "", "6", ""] * 20 + ["7"]
+    + ["4"]
+)
+
+class Terminal(io.StringIO):
+    def isatty(self):
+        return True
+
+def processos_criados():
+    contador = [0]
+
+    def auditar(evento, argumentos):
+        if evento in ("os.system", "subprocess.Popen", "os.posix_spawn", "os.fork", "os.exec"):
+            contador[0] += 1
+
+    sys.addaudithook(auditar)
+    return contador
+
+def sessao(contador):
+    from barbearia.cli import main
+
+    quadros_iniciados = [0]
+    novo_quadro = Tela.novo_quadro
+
+    def contar(tela):
+        quadros_iniciados[0] += 1
+        novo_quadro(tela)
+
+    Tela.novo_quadro = contar
+    terminal = Terminal()
+    entrada, saida = sys.stdin, sys.stdout
+    with tempfile.TemporaryDirectory() as pasta:
+        os.environ["BARBEARIA_DB"] = os.path.join(pasta, "sessao.db")
+        sys.stdin, sys.stdout = io.StringIO("\n".join(ROTEIRO) + "\n"), terminal
+        antes = contador[0]
+        inicio = time.perf_counter()
+        try:
+            main()
+        finally:
+            segundos = time.perf_counter() - inicio
+            sys.stdin, sys.stdout = entrada, saida
+            Tela.novo_quadro = novo_quadro
+    return menu._tela, quadros_iniciados[0], segundos, contador[0] - antes, len(terminal.getvalue().encode())
+
+def clear_antigo(vezes):
+    # O custo do clear_screen antigo, com a saída descartada.
+    ambiente = dict(os.environ, TERM=os.environ.get("TERM", "xterm"))
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        subprocess.run(["sh", "-c", "clear"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, env=ambiente)
+    return (time.perf_counter() - inicio) / vezes
+
+def main():
+    contador = processos_criados()
+    tela, quadros, segundos, processos, tamanho = sessao(contador)
+    por_clear = clear_antigo(50)
+    print(f"Sessão roteirizada: {quadros} telas, {tela.quadros} apresentações, {segundos * 1000:.0f} ms")
+    print(f"  Tela ANSI:      {quadros / segundos:9,.0f} quadros/s, {processos} processos criados, "
+          f"{tamanho / max(tela.quadros, 1):,.0f} bytes/apresentação, {tela.linhas_reescritas} linhas reescritas")
+    print(f"  os.system(clear): {por_clear * 1000:.2f} ms por tela -> no máximo {1 / por_clear:,.0f} quadros/s, "
+          f"{quadros} processos por sessão")
+
+if __name__ == "__main__":
+    main()
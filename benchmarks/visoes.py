@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from barbearia import Barbearia, Barbeiro, CatalogoServicos, Cliente, minutos_para_horario
+
+# Um dia com milhares de agendamentos: pegar a visão e a primeira página
+# contra copiar a lista inteira (e juntar tudo numa string, como a CLI fazia).
+
+def montar(agendamentos):
+    barbearia = None
+    por_barbeiro = 24 * 60
+    for numero in range(-(-agendamentos // por_barbeiro)):
+        barbeiro = Barbeiro(f"Barbeiro {numero}", f"b{numero}", 1000, 1)
+        barbeiro.adicionar_intervalo_livre("Segunda", "0h", "24h")
+        if barbearia is None:
+            barbearia = Barbearia(barbeiro, catalogo=CatalogoServicos())
+        else:
+            barbearia.adicionar_barbeiro(barbeiro)
+    for numero in range(agendamentos):
+        barbeiro = barbearia.barbeiros[numero // por_barbeiro]
+        horario = minutos_para_horario(numero % por_barbeiro)
+        barbearia.agendar(Cliente("Cliente", f"c{numero}", "Social", 12, "Segunda", horario), barbeiro.cpf)
+    return barbearia
+
+def cronometrar(rotulo, funcao, vezes):
+    inicio = time.perf_counter()
+    for _ in range(vezes):
+        funcao()
+    segundos = time.perf_counter() - inicio
+    print(f"  {rotulo:<40} {segundos / vezes * 1e6:9.1f} µs")
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--agendamentos", type=int, default=10_000)
+    argumentos = parser.parse_args()
+    barbearia = montar(argumentos.agendamentos)
+    repositorio = barbearia.agendamentos
+    print(f"{len(repositorio)} agendamentos na Segunda:")
+    cronometrar("cópia da lista (antes)", lambda: list(repositorio.buscar_por_dia("Segunda")), 200)
+    cronometrar("cópia + string com todos (antes)",
+                lambda: ", ".join(agendamento.nome for agendamento in repositorio.buscar_por_dia("Segunda")), 100)
+    cronometrar("visão + primeira página de 20", lambda: barbearia.listar_clientes("Segunda").pagina(0, 20), 20000)
+
+    print(f"\n{len(barbearia.listar_horarios_disponiveis('Segunda'))} horários livres na Segunda:")
+    cronometrar("retrato do dia + primeira página de 12", lambda: barbearia.listar_horarios_disponiveis("Segunda").pagina(0, 12), 20000)
+    cronometrar("lista completa", lambda: list(barbearia.listar_horarios_disponiveis("Segunda")), 200)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import io
+import unittest
+
+from barbearia import Agendamento, Barbearia, Cadastrar, Cliente
+from barbearia.cpf import completar_cpf
+from barbearia.importacao import CAMPOS_CLIENTES, escrever_registros, importar_clientes, ler_registros, registros_clientes
+
+CPF_BARBEIRO = completar_cpf("111444777")
+CPF_ANA = completar_cpf("222555888")
+CPF_BRUNO = completar_cpf("333666999")
+AGENDAMENTOS = (
+    ("Ana", CPF_ANA, "Social", 30, "Segunda", "9h"),
+    ("Ana", CPF_ANA, "Barba", 20, "Quarta", "10h"),
+    ("Bruno", CPF_BRUNO, "Degradê", 35, "Segunda", "11h"),
+    ("Ana", CPF_ANA, "Social", 30, "Sexta", "14h"),
+)
+
+def nova_barbearia():
+    cadastrar = Cadastrar()
+    cadastrar.cadastrar_barbeiro("Carlos", CPF_BARBEIRO, 2000)
+    barbeiro = cadastrar.usuarios[CPF_BARBEIRO]
+    for dia in ("Segunda", "Quarta", "Sexta"):
+        barbeiro.adicionar_intervalo_livre(dia, "8h", "18h")
+    return cadastrar, Barbearia(barbeiro, cadastrar=cadastrar)
+
+class ExportarEImportarClientes(unittest.TestCase):
+    def setUp(self):
+        self.cadastrar, self.barbearia = nova_barbearia()
+        for nome, cpf, corte, valor, dia, horario in AGENDAMENTOS:
+            if cpf not in self.cadastrar.usuarios:
+                self.cadastrar.cadastrar_cliente(nome, cpf, corte, valor, dia, horario)
+            cliente = self.cadastrar.usuarios[cpf]
+            self.assertIsNotNone(self.barbearia.agendar(Agendamento(cliente, corte, valor, dia, horario)))
+
+    def ida_e_volta(self, formato):
+        arquivo = io.StringIO(newline="")
+        escrever_registros(arquivo, formato, CAMPOS_CLIENTES, registros_clientes(self.barbearia))
+        arquivo.seek(0)
+        cadastrar, barbearia = nova_barbearia()
+        rejeicoes = []
+        resumo = importar_clientes(
+            ler_registros(arquivo, formato), cadastrar, barbearia, lambda numero, mensagem: rejeicoes.append((numero, mensagem)),
+        )
+        return cadastrar, barbearia, resumo, rejeicoes
+
+    def conferir(self, formato):
+        cadastrar, barbearia, resumo, rejeicoes = self.ida_e_volta(formato)
+        self.assertEqual(rejeicoes, [])
+        self.assertEqual((resumo.importados, resumo.rejeitados), (len(AGENDAMENTOS), 0))
+        self.assertEqual(cadastrar.quantidade(Cliente.PAPEL), 2)
+        reservas = barbearia.agendamentos.buscar_por_cpf(CPF_ANA)
+        self.assertEqual(
+            sorted((agendamento.dia, agendamento.horario_desejado, agendamento.corte_desejado) for agendamento in reservas),
+            [("Quarta", "10h", "Barba"), ("Segunda", "9h", "Social"), ("Sexta", "14h", "Social")],
+        )
+        # Todos os agendamentos apontam para o mesmo cliente cadastrado.
+        self.assertTrue(all(agendamento.cliente is cadastrar.usuarios[CPF_ANA] for agendamento in reservas))
+        self.assertEqual(barbearia.faturamento.total, self.barbearia.faturamento.total)
+
+    def test_csv(self):
+        self.conferir("csv")
+
+    def test_jsonl(self):
+        self.conferir("jsonl")
+
+    def test_cliente_ja_cadastrado_ganha_o_agendamento(self):
+        cadastrar, barbearia = nova_barbearia()
+        cadastrar.cadastrar_cliente("Ana", CPF_ANA, "Social", 30, "Segunda", "9h")
+        registros = enumerate([
+            {"nome": "Ana", "cpf": CPF_ANA, "corte_desejado": "Social", "valor": 30, "dia": "Segunda", "horario_desejado": "9h"},
+            {"nome": "Ana", "cpf": CPF_ANA, "corte_desejado": "Social", "valor": 30, "dia": "Segunda", "horario_desejado": "9h"},
+            {"nome": "Carlos", "cpf": CPF_BARBEIRO, "corte_desejado": "Social", "valor": 30, "dia": "Quarta", "horario_desejado": "9h"},
+        ], 1)
+        rejeicoes = []
+        resumo = importar_clientes(registros, cadastrar, barbearia, lambda numero, mensagem: rejeicoes.append((numero, mensagem)))
+        self.assertEqual((resumo.importados, resumo.rejeitados), (1, 2))
+        self.assertEqual(rejeicoes, [(2, "Horário indisponível."), (3, "CPF já cadastrado.")])
+        # A Ana continua cadastrada mesmo com a segunda linha rejeitada.
+        self.assertIn(CPF_ANA, cadastrar.usuarios)
+        self.assertEqual(len(barbearia.agendamentos), 1)
+
+if __name__ == "__main__":
+    unittest.main()